@@ -0,0 +1,222 @@
+"""
+Benchmark of the generation pipeline against a simulated toolchain.
+
+Usage: python benchmarks/bench_generation.py [--profile fast|realistic|FILE] [--jobs N] [--limit N]
+                                             [--save-baseline FILE] [--baseline FILE] [--tolerance FRACTION]
+                                             [--js-workspace]
+
+Puts the simulated npx, npm, mvn, cargo, pip, composer, flutter, dotnet...
+of fake_toolchain.py first on PATH, then generates one project per round over
+install_commands.json, so every (module, language, framework) is installed at
+least once. Each project is generated in its own process, which reports:
+
+- wall: duration of create_project_structure
+- cpu: user + system time of the generator and every command it ran
+- peak RSS: largest resident set of the generator or of one of its commands
+- files/s: files in the generated project per second of wall time
+
+Latencies are simulated, so the numbers measure the generator's own overhead
+and scheduling, not the package indexes. --save-baseline writes the results to
+a JSON file; --baseline compares a run with one and exits with status 1 when a
+project's wall or CPU time regressed by more than the tolerance. --js-workspace
+generates the projects with their JavaScript modules in a workspace.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import resource
+import tempfile
+import subprocess
+from itertools import zip_longest
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_toolchain
+from monostack.config.config_manager import ConfigManager
+from monostack.utils.venv_backends import VenvBackend, select_backend
+
+MODULES = ["backend", "frontend-web", "frontend-mobile", "frontend-desktop"]
+
+class SimulatedPipBackend(VenvBackend):
+    """
+    Creates real virtual environments with the fastest backend, and installs
+    their requirements with the simulated pip.
+    """
+    name = "simulated"
+    
+    def __init__(self, bin_dir: str):
+        super().__init__()
+        self.bin_dir = bin_dir
+        self.creator = select_backend()
+        
+    def is_available(self) -> bool:
+        return True
+        
+    def create(self, venv_path: str) -> Dict[str, float]:
+        return self.creator.create(venv_path)
+        
+    def install_command(self, venv_path: str, packages: List[str]) -> List[str]:
+        return [os.path.join(self.bin_dir, "pip"), "install", "--prefix", venv_path, *packages]
+
+def build_projects() -> List[Dict[str, Any]]:
+    """Choose one project per round, so every technology of every module is installed once."""
+    catalog = ConfigManager().load_catalog()
+    technologies = {
+        module: [{"language": language, "framework": framework}
+                 for language in catalog.languages(module) for framework in catalog.frameworks(module, language)]
+        for module in MODULES
+    }
+    return [{module: choice for module, choice in zip(MODULES, round_choices) if choice}
+            for round_choices in zip_longest(*technologies.values())]
+
+def project_label(choices: Dict[str, Any]) -> str:
+    """Return the key identifying a project in the results and baselines."""
+    return " ".join(f"{module}={choice['framework']}" for module, choice in choices.items())
+
+def count_files(directory: str) -> int:
+    """Count the files of a generated project."""
+    return sum(len(files) for _, _, files in os.walk(directory))
+
+def run_project(project_dir: str, choices: Dict[str, Any], jobs: int, bin_dir: str,
+                js_workspace: bool = False) -> Dict[str, Any]:
+    """Generate a project in this process and measure it. Runs in the worker process."""
+    from monostack.core.project_generator import ProjectGenerator
+    from monostack.utils.command_runner import CommandRunner
+    from monostack.utils.run_history import RunHistory
+    from monostack.utils.venv_manager import VenvManager
+    
+    generator = ProjectGenerator(
+        command_runner=CommandRunner(quiet=True),
+        venv_manager=VenvManager(backend=SimulatedPipBackend(bin_dir)),
+        run_history=RunHistory(),
+        js_workspace=js_workspace
+    )
+    before = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    start = time.perf_counter()
+    success = generator.create_project_structure(project_dir, choices, jobs=jobs)
+    wall = time.perf_counter() - start
+    after = [resource.getrusage(who) for who in (resource.RUSAGE_SELF, resource.RUSAGE_CHILDREN)]
+    
+    cpu = sum((end.ru_utime + end.ru_stime) - (begin.ru_utime + begin.ru_stime) for begin, end in zip(before, after))
+    files = count_files(project_dir)
+    return {
+        "success": success,
+        "failed_modules": sorted(module for module, result in generator.module_results.items()
+                                 if not result["success"]),
+        "wall": wall,
+        "cpu": cpu,
+        # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+        "peak_rss_mb": max(usage.ru_maxrss for usage in after) / (1024 * 1024 if sys.platform == "darwin" else 1024),
+        "files": files,
+        "files_per_second": files / wall if wall else 0.0,
+    }
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Return a description of every wall or CPU time regression against a baseline."""
+    regressions = []
+    rows = dict(results["projects"], total=results["total"])
+    baseline_rows = dict(baseline["projects"], total=baseline["total"])
+    for label, row in rows.items():
+        reference = baseline_rows.get(label)
+        if not reference:
+            continue
+        for metric in ("wall", "cpu"):
+            if reference[metric] and row[metric] > reference[metric] * (1 + tolerance):
+                regressions.append(f"{label}: {metric} {row[metric]:.2f} s vs {reference[metric]:.2f} s "
+                                   f"(+{(row[metric] / reference[metric] - 1) * 100:.0f}%)")
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the generation pipeline with a simulated toolchain")
+    parser.add_argument("--profile", default="fast", help="fast, realistic or a JSON file of per-tool overrides")
+    parser.add_argument("--jobs", type=int, default=None, help="Modules installed concurrently")
+    parser.add_argument("--limit", type=int, default=None, help="Only generate the first N projects")
+    parser.add_argument("--save-baseline", metavar="FILE", help="Write the results to a baseline file")
+    parser.add_argument("--baseline", metavar="FILE", help="Compare the results with a baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown (default: 0.25 for 25%%)")
+    parser.add_argument("--js-workspace", action="store_true",
+                        help="Install the JavaScript modules of each project in a workspace")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--project-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--bin-dir", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.worker:
+        print(json.dumps(run_project(args.project_dir, json.loads(args.worker), args.jobs, args.bin_dir,
+                                     args.js_workspace)))
+        return 0
+        
+    projects = build_projects()[:args.limit]
+    root = tempfile.mkdtemp(prefix="monostack-bench-generation-")
+    bin_dir = os.path.join(root, "bin")
+    targets = [name for module in MODULES for name in (module, module.replace("-", "_"))]
+    env = dict(os.environ, **fake_toolchain.install(bin_dir, args.profile, targets))
+    env.update({
+        # Keep the run history, golden environments and catalog cache of the benchmark apart
+        "MONOSTACK_CACHE_DIR": os.path.join(root, "cache"),
+        "GIT_AUTHOR_NAME": "bench", "GIT_AUTHOR_EMAIL": "bench@example.com",
+        "GIT_COMMITTER_NAME": "bench", "GIT_COMMITTER_EMAIL": "bench@example.com",
+    })
+    
+    results = {"profile": args.profile, "jobs": args.jobs, "js_workspace": args.js_workspace, "projects": {}}
+    print(f"{len(projects)} projects, profile {args.profile}, jobs {args.jobs or 'all'}")
+    print(f"{'wall':>9} {'cpu':>9} {'peak RSS':>10} {'files':>7} {'files/s':>9}  project")
+    try:
+        for index, choices in enumerate(projects):
+            project_dir = os.path.join(root, f"project-{index}")
+            command = [sys.executable, os.path.abspath(__file__), "--worker", json.dumps(choices),
+                       "--project-dir", project_dir, "--bin-dir", bin_dir]
+            if args.jobs:
+                command += ["--jobs", str(args.jobs)]
+            if args.js_workspace:
+                command.append("--js-workspace")
+            process = subprocess.run(command, env=env, cwd=root, capture_output=True, text=True)
+            shutil.rmtree(project_dir, ignore_errors=True)
+            if process.returncode != 0:
+                print(f"Project {project_label(choices)} crashed:\n{process.stderr}")
+                return 1
+                
+            row = json.loads(process.stdout.strip().splitlines()[-1])
+            label = project_label(choices)
+            results["projects"][label] = row
+            failed = f"  (failed: {', '.join(row['failed_modules'])})" if row["failed_modules"] else ""
+            print(f"{row['wall']:>7.2f} s {row['cpu']:>7.2f} s {row['peak_rss_mb']:>7.1f} MB {row['files']:>7} "
+                  f"{row['files_per_second']:>9.0f}  {label}{failed}")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+        
+    rows = results["projects"].values()
+    wall = sum(row["wall"] for row in rows)
+    files = sum(row["files"] for row in rows)
+    results["total"] = {
+        "wall": wall,
+        "cpu": sum(row["cpu"] for row in rows),
+        "peak_rss_mb": max(row["peak_rss_mb"] for row in rows),
+        "files": files,
+        "files_per_second": files / wall if wall else 0.0,
+    }
+    total = results["total"]
+    print(f"{total['wall']:>7.2f} s {total['cpu']:>7.2f} s {total['peak_rss_mb']:>7.1f} MB {total['files']:>7} "
+          f"{total['files_per_second']:>9.0f}  total")
+          
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.save_baseline}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"Regression: {regression}")
+        if regressions:
+            return 1
+        print(f"No regression above {args.tolerance * 100:.0f}% against {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+Benchmark of the gitignore matcher on a synthetic project tree.
+
+Usage: python benchmarks/bench_gitignore.py [files]
+
+Builds a temporary tree of about 100,000 files (mostly under node_modules and
+build output, like a freshly installed JavaScript project), writes the root
+.gitignore monostack generates for it, then compares:
+
+- fnmatch: os.walk over everything, each file matched against every pattern
+- is_ignored: os.walk over everything, each file checked with GitignoreMatcher.is_ignored()
+- walk: GitignoreMatcher.walk(), which never descends into ignored directories
+- git: git ls-files --others --exclude-standard, when git is installed
+"""
+import os
+import sys
+import time
+import shutil
+import fnmatch
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monostack.utils.gitignore_generator import GitignoreGenerator
+from monostack.utils.gitignore_matcher import GitignoreMatcher
+
+CHOICES = {
+    "backend": {"language": "javascript", "framework": "express"},
+    "frontend-web": {"language": "javascript", "framework": "react"},
+}
+
+def build_tree(root: str, files: int) -> None:
+    """Create a tree of the given number of files: 80% dependencies, 10% build output, 10% sources."""
+    layout = [("node_modules", 0.8, ".js"), ("build", 0.1, ".js"), ("src", 0.1, ".ts")]
+    for top, share, extension in layout:
+        count = int(files * share)
+        for i in range(count):
+            directory = os.path.join(root, top, f"pkg{i // 100}", f"lib{i % 10}")
+            os.makedirs(directory, exist_ok=True)
+            with open(os.path.join(directory, f"file{i}{extension}"), "w"):
+                pass
+    with open(os.path.join(root, "src", "debug.log"), "w"):
+        pass
+
+def timed(label: str, function) -> None:
+    """Run a benchmark case and print its duration and result size."""
+    start = time.perf_counter()
+    kept = function()
+    print(f"  {label:<12} {(time.perf_counter() - start) * 1000:>9.1f} ms  {kept} files kept")
+
+def main() -> int:
+    files = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    root = tempfile.mkdtemp(prefix="monostack-bench-gitignore-")
+    try:
+        print(f"Building a tree of {files} files in {root}...")
+        build_tree(root, files)
+        GitignoreGenerator().add_root_gitignore(root, CHOICES)
+        gitignore_path = os.path.join(root, ".gitignore")
+        with open(gitignore_path) as f:
+            patterns = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+            
+        def with_fnmatch():
+            kept = 0
+            for dirpath, _, filenames in os.walk(root):
+                relative_dir = os.path.relpath(dirpath, root)
+                for name in filenames:
+                    path = os.path.normpath(os.path.join(relative_dir, name))
+                    if not any(fnmatch.fnmatch(name, p) or fnmatch.fnmatch(path, p.strip("/")) or
+                               path.startswith(p.strip("/") + "/") for p in patterns if not p.startswith("!")):
+                        kept += 1
+            return kept
+            
+        def with_is_ignored():
+            matcher = GitignoreMatcher.from_file(gitignore_path)
+            kept = 0
+            for dirpath, _, filenames in os.walk(root):
+                for name in filenames:
+                    if not matcher.is_ignored(os.path.join(dirpath, name), False):
+                        kept += 1
+            return kept
+            
+        def with_walk():
+            matcher = GitignoreMatcher.from_file(gitignore_path)
+            return sum(len(filenames) for _, _, filenames in matcher.walk())
+            
+        print(f"Listing the files not ignored by {len(patterns)} patterns:")
+        timed("fnmatch", with_fnmatch)
+        timed("is_ignored", with_is_ignored)
+        timed("walk", with_walk)
+        
+        if shutil.which("git"):
+            subprocess.run(["git", "init", "-q", root], check=True)
+            
+            def with_git():
+                output = subprocess.run(["git", "-C", root, "ls-files", "--others", "--exclude-standard"],
+                                        capture_output=True, text=True, check=True).stdout
+                return len(output.splitlines())
+                
+            timed("git", with_git)
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
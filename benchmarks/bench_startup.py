@@ -0,0 +1,27 @@
+"""
+Benchmark of the CLI startup time against the documented budget.
+
+Usage: python benchmarks/bench_startup.py [runs]
+
+Exits with status 1 when the median startup time exceeds STARTUP_BUDGET_MS.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monostack.utils.startup_profile import STARTUP_BUDGET_MS, measure_startup
+
+def main() -> int:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    timings = measure_startup(runs=runs)
+    print(f"monostack --help over {runs} runs: min {timings['min']:.1f} ms, "
+          f"median {timings['median']:.1f} ms, max {timings['max']:.1f} ms "
+          f"(budget: {STARTUP_BUDGET_MS} ms)")
+    if timings["median"] > STARTUP_BUDGET_MS:
+        print("Startup budget exceeded; run 'python monostack.py --startup-profile' to find the slow imports")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""
+Benchmark of the virtual environment backends.
+
+Usage: python benchmarks/bench_venv.py [runs]
+
+Creates environments with every backend available on this machine and prints
+the median duration of each phase, so backends can be compared with each other
+and with a plain `python -m venv` (which installs pip from its wheel every time).
+"""
+import os
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from monostack.utils.venv_backends import available_backends, venv_python
+
+def median(values):
+    values = sorted(values)
+    return values[len(values) // 2]
+
+def main() -> int:
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    root = tempfile.mkdtemp(prefix="monostack-bench-venv-")
+    try:
+        for backend in available_backends():
+            phases = {}
+            totals = []
+            for run in range(runs):
+                venv_path = os.path.join(root, f"{backend.name}-{run}")
+                start = time.monotonic()
+                for phase, duration in backend.create(venv_path).items():
+                    phases.setdefault(phase, []).append(duration)
+                totals.append(time.monotonic() - start)
+                subprocess.run([venv_python(venv_path), "-m", "pip", "--version"], check=True,
+                               stdout=subprocess.DEVNULL)
+                shutil.rmtree(venv_path)
+                
+            details = ", ".join(f"{phase} {median(durations) * 1000:.0f} ms" for phase, durations in phases.items())
+            print(f"  {backend.name:<12} {median(totals) * 1000:>7.0f} ms  ({details})")
+            
+        totals = []
+        for run in range(runs):
+            venv_path = os.path.join(root, f"baseline-{run}")
+            start = time.monotonic()
+            subprocess.run([sys.executable, "-m", "venv", venv_path], check=True)
+            totals.append(time.monotonic() - start)
+            shutil.rmtree(venv_path)
+        print(f"  {'python -m venv':<12} {median(totals) * 1000:>7.0f} ms")
+        return 0
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
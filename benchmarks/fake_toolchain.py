@@ -0,0 +1,174 @@
+"""
+Simulated package managers and scaffolding tools for the generation benchmark.
+
+install() writes a shim for every tool the installation commands call (npx,
+npm, mvn, cargo, pip, composer, flutter, dotnet...) into a bin directory, to be
+put first on PATH. Each shim runs this file, which sleeps for the tool's
+latency and materializes a file tree the size of what the real tool leaves
+behind (30,000 files of node_modules for an npx scaffold, a vendor directory
+for composer, site-packages for pip...).
+
+Tools write into the argument naming one of the benchmarked module directories
+($FAKE_TOOLCHAIN_TARGETS), creating it, or into the working directory otherwise
+(npm install, cargo add, composer require...). An existing manifest is kept,
+``npm init`` only writes the manifest and ``npm install --package-lock-only``
+only writes a lockfile.
+"""
+import os
+import sys
+import json
+import glob
+import time
+from typing import Any, Dict, List, Optional
+
+TARGETS_ENV = "FAKE_TOOLCHAIN_TARGETS"
+PROFILE_ENV = "FAKE_TOOLCHAIN_PROFILE"
+
+# Per tool: seconds per invocation, files written, directory of the files and manifest file
+REALISTIC = {
+    "npx": {"latency": 8.0, "files": 30000, "tree": "node_modules", "manifest": "package.json"},
+    "npm": {"latency": 4.0, "files": 12000, "tree": "node_modules", "manifest": "package.json"},
+    "mvn": {"latency": 6.0, "files": 40, "tree": "src/main/java", "manifest": "pom.xml"},
+    "mn": {"latency": 4.0, "files": 60, "tree": "src/main/java", "manifest": "build.gradle"},
+    "sbt": {"latency": 10.0, "files": 60, "tree": "app", "manifest": "build.sbt"},
+    "sdk": {"latency": 5.0, "files": 0, "tree": "", "manifest": None},
+    "grails": {"latency": 6.0, "files": 120, "tree": "grails-app", "manifest": "build.gradle"},
+    "composer": {"latency": 5.0, "files": 6000, "tree": "vendor", "manifest": "composer.json"},
+    "go": {"latency": 2.0, "files": 2, "tree": "", "manifest": "go.mod"},
+    "cargo": {"latency": 1.5, "files": 3, "tree": "src", "manifest": "Cargo.toml"},
+    "create-tauri-app": {"latency": 2.0, "files": 40, "tree": "src-tauri", "manifest": "package.json"},
+    "django-admin": {"latency": 0.5, "files": 6, "tree": "", "manifest": "manage.py"},
+    "pip": {"latency": 3.0, "files": 2000, "tree": "site-packages", "manifest": None},
+    "pip3": {"latency": 3.0, "files": 2000, "tree": "site-packages", "manifest": None},
+    "gem": {"latency": 6.0, "files": 0, "tree": "", "manifest": None},
+    "bundle": {"latency": 3.0, "files": 4, "tree": "", "manifest": "Gemfile"},
+    "rails": {"latency": 12.0, "files": 3000, "tree": "vendor", "manifest": "Gemfile"},
+    "hanami": {"latency": 4.0, "files": 150, "tree": "app", "manifest": "Gemfile"},
+    "padrino": {"latency": 4.0, "files": 100, "tree": "app", "manifest": "Gemfile"},
+    "trailblazer": {"latency": 4.0, "files": 100, "tree": "app", "manifest": "Gemfile"},
+    "bridgetown": {"latency": 5.0, "files": 2000, "tree": "node_modules", "manifest": "Gemfile"},
+    "dotnet": {"latency": 4.0, "files": 300, "tree": "obj", "manifest": "Project.csproj"},
+    "flutter": {"latency": 6.0, "files": 800, "tree": "build", "manifest": "pubspec.yaml"},
+    "wp": {"latency": 4.0, "files": 1800, "tree": "wp-includes", "manifest": "wp-config-sample.php"},
+    "ionic": {"latency": 6.0, "files": 25000, "tree": "node_modules", "manifest": "ionic.config.json"},
+    "cordova": {"latency": 3.0, "files": 200, "tree": "platforms", "manifest": "config.xml"},
+}
+
+# Same trees, a hundredth of the latency and files: exercises the whole pipeline in seconds
+FAST = {
+    tool: dict(spec, latency=spec["latency"] / 100, files=spec["files"] // 100)
+    for tool, spec in REALISTIC.items()
+}
+
+PROFILES = {"realistic": REALISTIC, "fast": FAST}
+
+SHIM = """#!/bin/sh
+exec "{python}" "{script}" {tool} "$@"
+"""
+
+def load_profile(profile: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Load a profile by name, or from a JSON file overriding the realistic profile per tool.
+    
+    Args:
+        profile: "realistic", "fast" or the path of a JSON file
+        
+    Returns:
+        The specification of every tool
+    """
+    if profile in PROFILES:
+        return PROFILES[profile]
+    with open(profile) as f:
+        overrides = json.load(f)
+    return {tool: dict(REALISTIC.get(tool, {}), **overrides.get(tool, {}))
+            for tool in set(REALISTIC) | set(overrides)}
+
+def install(bin_dir: str, profile: str, targets: List[str]) -> Dict[str, str]:
+    """
+    Write the tool shims into a bin directory.
+    
+    Args:
+        bin_dir: Directory of the shims
+        profile: Profile of the tools (see load_profile)
+        targets: Names of the module directories the tools may create
+        
+    Returns:
+        The environment variables putting the shims first on PATH
+    """
+    os.makedirs(bin_dir, exist_ok=True)
+    for tool in load_profile(profile):
+        path = os.path.join(bin_dir, tool)
+        with open(path, "w") as f:
+            f.write(SHIM.format(python=sys.executable, script=os.path.abspath(__file__), tool=tool))
+        os.chmod(path, 0o755)
+    return {
+        "PATH": bin_dir + os.pathsep + os.environ.get("PATH", ""),
+        TARGETS_ENV: os.pathsep.join(targets),
+        PROFILE_ENV: profile,
+    }
+
+def find_target(arguments: List[str], targets: List[str]) -> Optional[str]:
+    """Return the module directory an invocation creates (-o frontend-web, -DartifactId=backend...)."""
+    for argument in arguments:
+        value = argument.rpartition("=")[2]
+        if value in targets:
+            return value
+    return None
+
+def materialize(directory: str, spec: Dict[str, Any], tool: str) -> int:
+    """
+    Write a tool's file tree, spread over package directories like real dependency trees.
+    
+    Returns:
+        Number of files written
+    """
+    tree = os.path.join(directory, spec["tree"])
+    if tool in ("pip", "pip3"):
+        # pip --prefix <venv> writes into the environment's site-packages
+        site_packages = glob.glob(os.path.join(directory, "lib", "python*", "site-packages"))
+        tree = site_packages[0] if site_packages else tree
+        
+    os.makedirs(directory, exist_ok=True)
+    if spec.get("manifest") and not os.path.exists(os.path.join(directory, spec["manifest"])):
+        with open(os.path.join(directory, spec["manifest"]), "w") as f:
+            f.write(f"# generated by the simulated {tool}\n")
+            
+    # Unique per invocation, so repeated installs in one directory add packages
+    prefix = f"{tool}-{os.getpid()}"
+    for i in range(spec["files"]):
+        package_dir = os.path.join(tree, f"{prefix}-pkg{i // 50}")
+        if i % 50 == 0:
+            os.makedirs(os.path.join(package_dir, "lib"), exist_ok=True)
+        with open(os.path.join(package_dir, "lib" if i % 5 else "", f"file{i}"), "w") as f:
+            f.write("x" * 64 * (1 + i % 8))
+    return spec["files"] + (1 if spec.get("manifest") else 0)
+
+def main(tool: str, arguments: List[str]) -> int:
+    """Simulate an invocation of a tool."""
+    spec = load_profile(os.environ.get(PROFILE_ENV, "realistic")).get(tool)
+    if spec is None:
+        print(f"{tool}: not simulated", file=sys.stderr)
+        return 127
+    if arguments in (["--version"], ["-v"], ["-V"], ["version"]):
+        # Toolchain version probes of the run history
+        print(f"{tool} 0.0.0-simulated")
+        return 0
+        
+    time.sleep(spec["latency"])
+    targets = [target for target in os.environ.get(TARGETS_ENV, "").split(os.pathsep) if target]
+    target = find_target(arguments, targets)
+    if tool == "npm" and "--package-lock-only" in arguments:
+        with open(os.path.join(os.path.abspath(target or "."), "package-lock.json"), "w") as f:
+            f.write("{}\n")
+        print(f"npm: wrote package-lock.json in {target or os.getcwd()}")
+        return 0
+    if tool in ("pip", "pip3") and "--prefix" in arguments:
+        target = arguments[arguments.index("--prefix") + 1]
+    if tool == "npm" and arguments[:1] == ["init"]:
+        spec = dict(spec, files=0)
+    files = materialize(os.path.abspath(target or "."), spec, tool)
+    print(f"{tool}: wrote {files} files in {target or os.getcwd()}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1], sys.argv[2:]))
@@ -1,14 +1,16 @@
 import os
+import time
 import argparse
 import logging
 import sys
 from typing import Dict, Any, Optional
 
-from .config.config_manager import ConfigManager
-from .core.project_generator import ProjectGenerator
-from .core.user_interface import UserInterface
 from .utils.logger import setup_logging
 
+# Heavy modules (inquirer, yaml, the generators...) are imported inside the
+# functions that use them, so --help and the subcommands start quickly.
+# See monostack/utils/startup_profile.py for the startup budget.
+
 def parse_arguments():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description="Monostack - CLI tool for generating full-stack projects")
@@ -20,8 +22,297 @@ def parse_arguments():
                         help="Generate Hello World endpoints in backend and corresponding frontend code")
     parser.add_argument("-v", "--verbose", action="store_true",
                         help="Show verbose output during command execution")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="Number of modules installed concurrently (default: all at once)")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="Stop the generation as soon as one task fails")
+    parser.add_argument("--fast-commit", action="store_true",
+                        help="Create the initial commit with git fast-import instead of git add and git commit")
+    parser.add_argument("--output-tail", type=int, metavar="KB",
+                        help="Only keep the last KB of each command's output in memory and "
+                             "write the full output to a per-command log file")
+    parser.add_argument("--command-log-dir", type=str,
+                        help="Directory for the per-command log files")
+    parser.add_argument("--plan", action="store_true",
+                        help="Print the generation task graph and its critical path without running it")
+    parser.add_argument("--cache", action="store_true",
+                        help="Restore module scaffolds from the local scaffold cache and store new ones")
+    parser.add_argument("--cache-dir", type=str,
+                        help="Directory of the scaffold cache (default: ~/.cache/monostack/scaffolds)")
+    parser.add_argument("--cache-max-size", type=int, metavar="MB",
+                        help="Size of the scaffold cache before old entries are evicted (default: 5120)")
+    parser.add_argument("--venv-backend", choices=["auto", "uv", "venv", "virtualenv"], default="auto",
+                        help="How Python virtual environments are created (default: the fastest available)")
+    parser.add_argument("--no-golden-venvs", action="store_true",
+                        help="Install Python requirements in every module instead of cloning golden environments")
+    parser.add_argument("--speculative", action="store_true",
+                        help="Start installing each module as soon as its technology is chosen, during the prompts")
+    parser.add_argument("--offline", action="store_true",
+                        help="Install pip and npm packages from the prefetched store only (see the prefetch command)")
+    parser.add_argument("--prefetch-dir", type=str,
+                        help="Directory of the prefetched packages (default: ~/.cache/monostack/prefetch)")
+    parser.add_argument("--no-history", action="store_true",
+                        help="Do not record installation durations in the run history")
+    parser.add_argument("--accelerate", action="store_true",
+                        help="Run npm, pip, maven, cargo, go, composer and dotnet with speed-oriented flags and "
+                             "environment variables")
+    parser.add_argument("--accelerate-ecosystems", type=str, metavar="ECOSYSTEMS",
+                        help="Only accelerate this comma-separated list of ecosystems (implies --accelerate)")
+    parser.add_argument("--shared-caches", action="store_true",
+                        help="Point the package managers at package caches monostack shares between modules and "
+                             "projects instead of their own caches")
+    parser.add_argument("--js-workspace", action="store_true",
+                        help="Install the dependencies of the JavaScript modules once, in an npm or pnpm "
+                             "workspace at the project root")
+    parser.add_argument("--trace", type=str, metavar="FILE",
+                        help="Write a Chrome trace-event file of the generation phases (open it in Perfetto)")
+    parser.add_argument("--startup-profile", action="store_true",
+                        help="Print an import time breakdown of the CLI startup and exit")
+    
+    subparsers = parser.add_subparsers(dest="command", metavar="COMMAND")
+    cache_parser = subparsers.add_parser("cache", help="Inspect or prune the scaffold and package caches")
+    cache_parser.add_argument("action", choices=["stats", "prune"],
+                              help="stats: show the cache content and the package cache hit rates, "
+                                   "prune: evict scaffolds and golden virtual environments above their size limits")
+    
+    batch_parser = subparsers.add_parser("batch", help="Generate the projects listed in a JSON Lines manifest")
+    batch_parser.add_argument("manifest", help="Manifest file, one {\"name\", \"choices\", \"options\"} object per line")
+    batch_parser.add_argument("--concurrency", type=int, default=None,
+                              help="Number of projects generated at once (default: CPU count, at most 4)")
+    batch_parser.add_argument("--output-dir", type=str, default=None,
+                              help="Directory in which the projects are created (default: the parent directory)")
+    batch_parser.add_argument("--summary", type=str, default="batch-summary.json",
+                              help="Path of the JSON summary written at the end (default: batch-summary.json)")
+    
+    prefetch_parser = subparsers.add_parser("prefetch", help="Download the packages of the installation commands")
+    prefetch_parser.add_argument("--module", type=str, help="Only prefetch the packages of this module")
+    prefetch_parser.add_argument("--language", type=str, help="Only prefetch the packages of this language")
+    prefetch_parser.add_argument("--framework", type=str, help="Only prefetch the packages of this framework")
+    prefetch_parser.add_argument("--concurrency", type=int, default=None,
+                                 help="Number of concurrent downloads (default: 8)")
+    
+    subparsers.add_parser("stats", help="Show installation timings per framework from the run history")
+    
+    serve_parser = subparsers.add_parser("serve", help="Serve generation requests over a Unix socket")
+    serve_parser.add_argument("--socket", type=str, required=True, help="Path of the Unix socket to listen on")
+    serve_parser.add_argument("--max-projects", type=int, default=None,
+                              help="Number of projects generated at once (default: CPU count, at most 4)")
+    serve_parser.add_argument("--max-installs", type=int, default=None,
+                              help="Number of module installations running at once across all projects "
+                                   "(default: unlimited)")
+    serve_parser.add_argument("--output-dir", type=str, default=None,
+                              help="Directory in which the projects are created (default: the parent directory)")
+    
+    subparsers.add_parser("gc", help="Finish deleting the directories left in the trash by earlier runs")
     return parser.parse_args()
 
+def build_scaffold_cache(args):
+    """Create the ScaffoldCache configured by the command line arguments."""
+    from .utils.scaffold_cache import ScaffoldCache
+    
+    max_size = args.cache_max_size * 1024 ** 2 if args.cache_max_size is not None else None
+    return ScaffoldCache(cache_dir=args.cache_dir, max_size=max_size)
+
+def build_package_store(args):
+    """Create the PackageStore configured by the command line arguments."""
+    from .utils.package_store import PackageStore
+    
+    return PackageStore(store_dir=args.prefetch_dir)
+
+def prefetch_command(args) -> int:
+    """Run the 'prefetch' subcommand."""
+    from .config.config_manager import ConfigManager
+    
+    config_manager = ConfigManager()
+    config_manager.load_catalog()
+    package_store = build_package_store(args)
+    downloads = package_store.collect(config_manager.catalog, module=args.module, language=args.language,
+                                      framework=args.framework)
+    if not downloads:
+        print("No packages to prefetch for the selected technologies")
+        return 1
+    
+    print(f"Prefetching {len(downloads)} download(s) into {package_store.store_dir}...")
+    start = time.monotonic()
+    results = package_store.prefetch(downloads, concurrency=args.concurrency)
+    for result in results:
+        status = "✅" if result["success"] else "❌"
+        print(f"  {status} {result['manager']}: {' '.join(result['packages'])} ({result['duration']:.1f}s)")
+    failed = sum(1 for result in results if not result["success"])
+    print(f"\n{len(results) - failed}/{len(results)} download(s) prefetched in {time.monotonic() - start:.1f}s")
+    return 0 if not failed else 1
+
+def build_run_history(args):
+    """Create the RunHistory, unless it is disabled by the command line arguments."""
+    if args.no_history:
+        return None
+    from .utils.run_history import RunHistory
+    
+    return RunHistory()
+
+def stats_command(args) -> int:
+    """Run the 'stats' subcommand."""
+    from .utils.run_history import RunHistory
+    
+    run_history = RunHistory()
+    stats = run_history.framework_stats()
+    print(f"Run history: {run_history.db_path}")
+    if not stats:
+        print("  No installation recorded yet")
+        return 0
+    
+    print(f"  {'module':<17} {'language':<11} {'framework':<16} {'runs':>5} {'fail':>5} {'p50':>8} {'p95':>8}")
+    for group in stats:
+        p50 = f"{group['p50']:.1f}s" if group["p50"] is not None else "-"
+        p95 = f"{group['p95']:.1f}s" if group["p95"] is not None else "-"
+        print(f"  {group['module']:<17} {group['language']:<11} {group['framework']:<16} "
+              f"{group['runs']:>5} {group['failures']:>5} {p50:>8} {p95:>8}")
+    return 0
+
+def build_default_options(args) -> Dict[str, Any]:
+    """Return the generation options of the command line, for projects that do not set their own."""
+    return {
+        "generate_hello_world": args.generate_hello_world,
+        "verbose": args.verbose,
+        "jobs": args.jobs,
+        "fail_fast": args.fail_fast,
+        "fast_commit": args.fast_commit,
+    }
+
+def accelerated_ecosystems(args) -> Optional[str]:
+    """Return the ecosystems to accelerate: a comma-separated list, "all" or None."""
+    if args.accelerate_ecosystems:
+        return args.accelerate_ecosystems
+    return "all" if args.accelerate else None
+
+def build_settings(args) -> Dict[str, Any]:
+    """Return the runner-wide settings of the command line shared by batch and serve."""
+    return {
+        "output_tail_kb": args.output_tail,
+        "command_log_dir": args.command_log_dir,
+        "cache": args.cache,
+        "cache_dir": args.cache_dir,
+        "cache_max_size": args.cache_max_size * 1024 ** 2 if args.cache_max_size is not None else None,
+        "venv_backend": args.venv_backend,
+        "golden_venvs": not args.no_golden_venvs,
+        "offline": args.offline,
+        "prefetch_dir": args.prefetch_dir,
+        "history": not args.no_history,
+        "accelerate": accelerated_ecosystems(args),
+        "shared_caches": args.shared_caches,
+        "js_workspace": args.js_workspace,
+    }
+
+def batch_command(args) -> int:
+    """Run the 'batch' subcommand."""
+    from .core.batch_runner import BatchRunner
+    
+    batch_runner = BatchRunner(
+        concurrency=args.concurrency,
+        output_dir=args.output_dir,
+        default_options=build_default_options(args),
+        settings=build_settings(args)
+    )
+    
+    entries = batch_runner.load_manifest(args.manifest)
+    summary = batch_runner.run(entries)
+    batch_runner.write_summary(summary, args.summary)
+    
+    print(f"\n{'✅' if not summary['failed'] else '❌'} {summary['succeeded']}/{summary['total']} project(s) "
+          f"generated in {summary['duration']:.1f}s (summary: {args.summary})")
+    for project in summary["projects"]:
+        print(f"  - {project['name']}: {project['status']} ({project['duration']:.1f}s)")
+    return 0 if not summary["failed"] else 1
+
+def serve_command(args) -> int:
+    """Run the 'serve' subcommand."""
+    import signal
+    import threading
+    from .core.server import GenerationServer
+    
+    server = GenerationServer(
+        args.socket,
+        settings=build_settings(args),
+        default_options=build_default_options(args),
+        output_dir=args.output_dir,
+        max_projects=args.max_projects,
+        max_installs=args.max_installs
+    )
+    server.warm_up()
+    # shutdown() waits for serve_forever(), which runs in this thread
+    signal.signal(signal.SIGTERM, lambda signum, frame: threading.Thread(target=server.shutdown).start())
+    print(f"Serving generation requests on {server.socket_path} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+    finally:
+        # The request threads die with the process, but the installations run in their own process groups
+        from .utils.async_command_runner import AsyncCommandRunner
+        
+        AsyncCommandRunner.terminate_all()
+        finish_trash()
+    return 0
+
+def gc_command(args) -> int:
+    """Run the 'gc' subcommand."""
+    from .utils.trash import get_trash
+    
+    summary = get_trash().collect_garbage()
+    print(f"Deleted {summary['entries']} trashed director{'ies' if summary['entries'] != 1 else 'y'} "
+          f"({summary['files']} files) from {summary['trash_dirs']} trash location(s)")
+    return 0
+
+def finish_trash() -> None:
+    """Wait for the directories removed by installation commands to be deleted."""
+    if "monostack.utils.trash" not in sys.modules:
+        # Nothing was generated, so nothing was trashed
+        return
+    from .utils.trash import get_trash
+    
+    trash = get_trash()
+    if trash.pending():
+        print("Finishing the deletion of replaced directories...")
+        trash.wait()
+
+def cache_command(args) -> int:
+    """Run the 'cache' subcommand."""
+    scaffold_cache = build_scaffold_cache(args)
+    
+    if args.action == "prune":
+        evicted = scaffold_cache.prune()
+        print(f"Evicted {evicted} scaffold(s) from {scaffold_cache.cache_dir}")
+    
+    stats = scaffold_cache.stats()
+    print(f"Scaffold cache: {stats['cache_dir']}")
+    print(f"  Entries: {stats['entries']}")
+    print(f"  Size:    {stats['size'] / 1024 ** 2:.1f} MB / {stats['max_size'] / 1024 ** 2:.0f} MB")
+    for module, module_stats in sorted(stats["modules"].items()):
+        print(f"  - {module}: {module_stats['entries']} entr{'ies' if module_stats['entries'] != 1 else 'y'}, "
+              f"{module_stats['size'] / 1024 ** 2:.1f} MB")
+    
+    from .utils.golden_venv import GoldenVenvLibrary
+    golden_library = GoldenVenvLibrary()
+    if args.action == "prune":
+        evicted = golden_library.prune()
+        print(f"Evicted {evicted} golden virtual environment(s) from {golden_library.library_dir}")
+    stats = golden_library.stats()
+    print(f"Golden virtual environments: {stats['library_dir']}")
+    print(f"  Entries: {stats['entries']}")
+    print(f"  Size:    {stats['size'] / 1024 ** 2:.1f} MB / {stats['max_size'] / 1024 ** 2:.0f} MB")
+    
+    from .utils.ecosystem_caches import EcosystemCaches
+    stats = EcosystemCaches().stats()
+    print(f"Package caches: {stats['cache_root']}")
+    if not stats["ecosystems"]:
+        print("  No installation used them yet")
+    for ecosystem, ecosystem_stats in stats["ecosystems"].items():
+        print(f"  - {ecosystem}: {ecosystem_stats['size'] / 1024 ** 2:.1f} MB in {ecosystem_stats['files']} files, "
+              f"{ecosystem_stats['hits']}/{ecosystem_stats['hits'] + ecosystem_stats['misses']} installation(s) hit "
+              f"({ecosystem_stats['hit_rate'] * 100:.0f}%, {ecosystem_stats['concurrent']} concurrent), "
+              f"{ecosystem_stats['bytes_added'] / 1024 ** 2:.1f} MB downloaded")
+    return 0
+
 def main():
     """Main entry point for the application."""
     # Parse command line arguments
@@ -29,20 +320,87 @@ def main():
     
     # Setup logging
     logger = setup_logging(args.log_level, args.log_file)
+    speculative_installer = None
+    tracer = None
     
     try:
+        if args.startup_profile:
+            from .utils.startup_profile import profile_startup
+            print(profile_startup())
+            return 0
+        
+        if args.command == "cache":
+            return cache_command(args)
+        if args.command == "batch":
+            return batch_command(args)
+        if args.command == "prefetch":
+            return prefetch_command(args)
+        if args.command == "stats":
+            return stats_command(args)
+        if args.command == "serve":
+            return serve_command(args)
+        if args.command == "gc":
+            return gc_command(args)
+        
+        if args.trace:
+            from .utils.tracing import enable_tracing
+            tracer = enable_tracing()
+        
         # Set project name and base directory
         project_name = args.name if args.name else "mono-app"
         base_dir = os.path.abspath(os.path.join(os.getcwd(), "..", project_name))
         
+        from .config.config_manager import ConfigManager
+        from .core.project_generator import ProjectGenerator
+        from .core.user_interface import UserInterface
+        from .utils.command_runner import CommandRunner
+        from .utils.venv_manager import VenvManager
+        from .utils.accelerators import select_accelerator
+        from .utils.ecosystem_caches import EcosystemCaches
+        
+        package_store = None
+        if args.offline:
+            package_store = build_package_store(args)
+            os.environ.update(package_store.offline_environment())
+        ecosystem_caches = EcosystemCaches() if args.shared_caches else None
+        maven_repository = ecosystem_caches.location("maven") if ecosystem_caches else None
+        
         # Initialize components
         config_manager = ConfigManager()
         user_interface = UserInterface()
-        project_generator = ProjectGenerator()
+        project_generator = ProjectGenerator(
+            command_runner=CommandRunner(output_tail_kb=args.output_tail, log_dir=args.command_log_dir,
+                                         ecosystem_caches=ecosystem_caches),
+            scaffold_cache=build_scaffold_cache(args) if args.cache else None,
+            config_manager=config_manager,
+            venv_manager=VenvManager(backend=args.venv_backend, golden=not args.no_golden_venvs),
+            package_store=package_store,
+            run_history=build_run_history(args),
+            accelerator=select_accelerator(accelerated_ecosystems(args), maven_repository=maven_repository),
+            js_workspace=args.js_workspace
+        )
         
         # Load technologies and prompt user
         technologies = config_manager.load_technologies()
-        user_choices = user_interface.prompt_user(technologies)
+        if args.speculative and not args.plan:
+            from .core.speculative import SpeculativeInstaller
+            speculative_installer = SpeculativeInstaller(project_generator, base_dir, technologies, jobs=args.jobs)
+        user_choices = user_interface.prompt_user(
+            technologies,
+            on_choice=speculative_installer.start if speculative_installer else None
+        )
+        
+        # Only display the execution plan if requested
+        if user_choices and args.plan:
+            graph = project_generator.build_task_graph(
+                base_dir,
+                user_choices,
+                generate_hello_world=args.generate_hello_world,
+                verbose=args.verbose,
+                fast_commit=args.fast_commit
+            )
+            print(graph.format_plan(jobs=args.jobs))
+            return
         
         # Generate project structure
         if user_choices:
@@ -50,13 +408,29 @@ def main():
                 base_dir, 
                 user_choices,
                 generate_hello_world=args.generate_hello_world,
-                verbose=args.verbose
+                verbose=args.verbose,
+                jobs=args.jobs,
+                fail_fast=args.fail_fast,
+                fast_commit=args.fast_commit,
+                speculative=speculative_installer
             )
             
             if success:
                 logger.info(f"\n✅ Project structure for '{base_dir}' created successfully!")
                 print(f"\n✅ Project structure for '{base_dir}' created successfully!")
                 
+                accelerated = {module: result["accelerator"]["ecosystems"]
+                               for module, result in project_generator.module_results.items()
+                               if result.get("accelerator", {}).get("ecosystems")}
+                if accelerated:
+                    print("⚡ Accelerated installations: " + ", ".join(
+                        f"{module} ({', '.join(ecosystems)})" for module, ecosystems in accelerated.items()))
+                workspace = project_generator.workspace_report
+                if workspace:
+                    print(f"📦 JavaScript workspace ({workspace['package_manager']}): "
+                          f"{', '.join(workspace['modules'])} installed once at the project root "
+                          f"in {workspace['duration']:.1f}s ({workspace['status']})")
+                
                 if args.generate_hello_world and "backend" in user_choices:
                     print(f"\n✅ Hello World example generated with {user_choices['backend']['framework']} backend")
                     frontend_count = 0
@@ -83,6 +457,15 @@ def main():
         logger.error(f"Unexpected error: {str(e)}", exc_info=True)
         print(f"\n❌ An error occurred: {str(e)}")
         sys.exit(1)
+        
+    finally:
+        # Staged modules that were not moved into the project are discarded
+        if speculative_installer:
+            speculative_installer.discard()
+        finish_trash()
+        if tracer:
+            tracer.write(args.trace)
+            print(f"Trace written to {args.trace} ({len(tracer.spans)} spans)")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,202 @@
+"""
+Module providing the process-wide, indexed technology catalog.
+
+The catalog is compiled from install_commands.json into flat and reverse
+indexes. The compiled form is kept in a marshal file in the monostack cache,
+validated against the source file's mtime and size, then its SHA-256, so
+warm starts skip JSON parsing and index building entirely.
+"""
+import os
+import json
+import marshal
+import hashlib
+import logging
+import tempfile
+import threading
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+from ..utils.cache_dir import get_cache_dir
+
+# Version of the compiled catalog layout; bump it when the indexes change
+CATALOG_FORMAT = 1
+
+# Catalogs already loaded by this process, by source path
+_catalogs: Dict[str, "TechnologyCatalog"] = {}
+_catalogs_lock = threading.Lock()
+
+class TechnologyCatalog:
+    """
+    Read-only view of the installation commands, indexed by
+    (module, language, framework) and by language and framework.
+    """
+    def __init__(self, source_path: str, compiled: Dict[str, Any]):
+        """
+        Initialize the TechnologyCatalog from its compiled form.
+
+        Args:
+            source_path: Path of the install_commands.json file
+            compiled: Dictionary returned by compile_catalog()
+        """
+        self.source_path = source_path
+        self.technologies: Dict[str, Any] = compiled["technologies"]
+        self._commands: Dict[Tuple[str, str, str], Union[str, List[Dict[str, Any]]]] = compiled["commands"]
+        self._by_language: Dict[str, List[Tuple[str, str]]] = compiled["by_language"]
+        self._by_framework: Dict[str, List[Tuple[str, str]]] = compiled["by_framework"]
+        self._stat: Tuple[int, int] = compiled["stat"]
+
+    def command(self, module: str, language: str, framework: str) -> Optional[Union[str, List[Dict[str, Any]]]]:
+        """
+        Return the installation command template of a technology.
+
+        Args:
+            module: The module type (backend, frontend-web, etc.)
+            language: The language (for databases, the database type)
+            framework: The framework (for databases, "install")
+
+        Returns:
+            The command template (a shell string or a list of steps), or None if the
+            catalog has no such technology
+        """
+        return self._commands.get((module, language, framework))
+
+    def modules(self) -> List[str]:
+        """Return the module types of the catalog."""
+        return list(self.technologies.keys())
+
+    def languages(self, module: str) -> List[str]:
+        """Return the languages available for a module type."""
+        return list(self.technologies.get(module, {}).keys())
+
+    def frameworks(self, module: str, language: str) -> List[str]:
+        """Return the frameworks available for a module type and language."""
+        return list(self.technologies.get(module, {}).get(language, {}).keys())
+
+    def frameworks_for_language(self, language: str) -> List[Tuple[str, str]]:
+        """Return every (module, framework) pair available for a language."""
+        return list(self._by_language.get(language, []))
+
+    def languages_for_framework(self, framework: str) -> List[Tuple[str, str]]:
+        """Return every (module, language) pair offering a framework."""
+        return list(self._by_framework.get(framework, []))
+
+    def __len__(self) -> int:
+        """Return the number of installation commands."""
+        return len(self._commands)
+
+def compile_catalog(technologies: Dict[str, Any], stat: Tuple[int, int], digest: str) -> Dict[str, Any]:
+    """
+    Build the indexes of a parsed install_commands.json.
+
+    Args:
+        technologies: The parsed configuration
+        stat: Modification time (ns) and size of the source file
+        digest: SHA-256 of the source file
+
+    Returns:
+        Compiled catalog made of plain containers, so it can be marshalled
+    """
+    commands = {}
+    by_language: Dict[str, List[Tuple[str, str]]] = {}
+    by_framework: Dict[str, List[Tuple[str, str]]] = {}
+    for module, languages in technologies.items():
+        for language, frameworks in languages.items():
+            for framework, command in frameworks.items():
+                commands[(module, language, framework)] = command
+                by_language.setdefault(language, []).append((module, framework))
+                by_framework.setdefault(framework, []).append((module, language))
+
+    return {
+        "format": CATALOG_FORMAT,
+        "stat": stat,
+        "sha256": digest,
+        "technologies": technologies,
+        "commands": commands,
+        "by_language": by_language,
+        "by_framework": by_framework,
+    }
+
+def load_catalog(source_path: str, cache_dir: Optional[str] = None) -> TechnologyCatalog:
+    """
+    Load a catalog from its compiled cache, compiling install_commands.json if needed.
+
+    Args:
+        source_path: Path of the install_commands.json file
+        cache_dir: Directory of the compiled catalogs (default: <monostack cache>/catalog)
+
+    Returns:
+        The loaded TechnologyCatalog
+
+    Raises:
+        FileNotFoundError: If the configuration file doesn't exist.
+        json.JSONDecodeError: If the configuration file is not valid JSON.
+    """
+    logger = logging.getLogger(__name__)
+    source_path = os.path.abspath(source_path)
+    source_stat = os.stat(source_path)
+    stat = (source_stat.st_mtime_ns, source_stat.st_size)
+
+    cache_dir = cache_dir or get_cache_dir("catalog")
+    path_digest = hashlib.sha1(source_path.encode("utf-8")).hexdigest()[:16]
+    compiled_path = os.path.join(cache_dir, f"install_commands-{path_digest}.marshal")
+
+    compiled = None
+    try:
+        with open(compiled_path, "rb") as f:
+            compiled = marshal.load(f)
+        if not isinstance(compiled, dict) or compiled.get("format") != CATALOG_FORMAT:
+            compiled = None
+    except (OSError, EOFError, ValueError, TypeError):
+        compiled = None
+
+    if compiled is not None and tuple(compiled["stat"]) == stat:
+        logger.debug(f"Loaded compiled catalog {compiled_path}")
+        return TechnologyCatalog(source_path, compiled)
+
+    # The file was touched or is new: only recompile when its content changed
+    with open(source_path, "rb") as f:
+        content = f.read()
+    digest = hashlib.sha256(content).hexdigest()
+
+    if compiled is not None and compiled["sha256"] == digest:
+        compiled["stat"] = stat
+    else:
+        logger.debug(f"Compiling technology catalog from {source_path}")
+        compiled = compile_catalog(json.loads(content), stat, digest)
+
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix="catalog-", dir=cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump(compiled, f)
+            os.replace(tmp_path, compiled_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except OSError as e:
+        logger.debug(f"Could not write compiled catalog {compiled_path}: {str(e)}")
+
+    return TechnologyCatalog(source_path, compiled)
+
+def get_catalog(source_path: str, cache_dir: Optional[str] = None) -> TechnologyCatalog:
+    """
+    Return the process-wide catalog of a configuration file.
+
+    The catalog is loaded once per process and reloaded only when the file changes,
+    so long-running modes (batch workers, server) always see the current commands.
+
+    Args:
+        source_path: Path of the install_commands.json file
+        cache_dir: Directory of the compiled catalogs
+
+    Returns:
+        The shared TechnologyCatalog
+    """
+    source_path = os.path.abspath(source_path)
+    source_stat = os.stat(source_path)
+    with _catalogs_lock:
+        catalog = _catalogs.get(source_path)
+        if catalog is None or catalog._stat != (source_stat.st_mtime_ns, source_stat.st_size):
+            catalog = load_catalog(source_path, cache_dir)
+            _catalogs[source_path] = catalog
+        return catalog
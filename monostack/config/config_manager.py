@@ -1,7 +1,9 @@
 import os
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+from .catalog import TechnologyCatalog, get_catalog
 
 class ConfigManager:
     """
@@ -18,29 +20,41 @@ class ConfigManager:
         self.logger = logging.getLogger(__name__)
         self.config_dir = config_dir or os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
         self.technologies = None
+        self.catalog: Optional[TechnologyCatalog] = None
         self.docker_template = None
+        # (mtime, size) of each configuration file when it was loaded
+        self._loaded_stats: Dict[str, Tuple[int, int]] = {}
     
-    def load_technologies(self) -> Dict[str, Any]:
+    def _file_stat(self, filename: str) -> Tuple[int, int]:
+        """Return the modification time and size of a configuration file."""
+        stat = os.stat(os.path.join(self.config_dir, filename))
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def load_catalog(self) -> TechnologyCatalog:
         """
-        Load the technologies configuration from the install_commands.json file.
+        Load the indexed technology catalog built from the install_commands.json file.
+        
+        The catalog is shared by every ConfigManager of the process and compiled
+        once to the monostack cache, so the JSON file is only parsed when it changes.
         
         Returns:
-            Dict containing the technologies configuration.
+            The TechnologyCatalog.
         
         Raises:
             FileNotFoundError: If the configuration file doesn't exist.
             json.JSONDecodeError: If the configuration file is not valid JSON.
         """
-        if self.technologies is not None:
-            return self.technologies
+        if self.catalog is not None:
+            return self.catalog
             
         try:
             config_path = os.path.join(self.config_dir, "install_commands.json")
             self.logger.debug(f"Loading technologies from {config_path}")
             
-            with open(config_path, "r") as f:
-                self.technologies = json.load(f)
-            return self.technologies
+            stat = self._file_stat("install_commands.json")
+            self.catalog = get_catalog(config_path)
+            self._loaded_stats["install_commands.json"] = stat
+            return self.catalog
         except FileNotFoundError:
             self.logger.error(f"Configuration file not found: {config_path}")
             raise
@@ -48,6 +62,21 @@ class ConfigManager:
             self.logger.error(f"Invalid JSON in configuration file: {config_path}")
             raise
     
+    def load_technologies(self) -> Dict[str, Any]:
+        """
+        Load the technologies configuration from the install_commands.json file.
+        
+        Returns:
+            Dict containing the technologies configuration.
+        
+        Raises:
+            FileNotFoundError: If the configuration file doesn't exist.
+            json.JSONDecodeError: If the configuration file is not valid JSON.
+        """
+        if self.technologies is None:
+            self.technologies = self.load_catalog().technologies
+        return self.technologies
+    
     def load_docker_compose_template(self) -> str:
         """
         Load the Docker Compose template from the docker_compose_template.yml file.
@@ -65,9 +94,39 @@ class ConfigManager:
             template_path = os.path.join(self.config_dir, "docker_compose_template.yml")
             self.logger.debug(f"Loading Docker Compose template from {template_path}")
             
+            stat = self._file_stat("docker_compose_template.yml")
             with open(template_path, "r") as f:
                 self.docker_template = f.read()
+            self._loaded_stats["docker_compose_template.yml"] = stat
             return self.docker_template
         except FileNotFoundError:
             self.logger.error(f"Template file not found: {template_path}")
-            raise
\ No newline at end of file
+            raise
+    
+    def refresh(self) -> List[str]:
+        """
+        Forget the configuration files that changed on disk since they were loaded,
+        so long-running processes (the server) load them again on next use.
+        
+        Returns:
+            Names of the changed files
+        """
+        changed = []
+        for filename, loaded_stat in list(self._loaded_stats.items()):
+            try:
+                if self._file_stat(filename) == loaded_stat:
+                    continue
+            except OSError:
+                # Missing while being rewritten: keep the loaded version for now
+                continue
+            changed.append(filename)
+            del self._loaded_stats[filename]
+            
+        if "install_commands.json" in changed:
+            self.catalog = None
+            self.technologies = None
+        if "docker_compose_template.yml" in changed:
+            self.docker_template = None
+        if changed:
+            self.logger.info(f"Configuration changed on disk: {', '.join(changed)}")
+        return changed
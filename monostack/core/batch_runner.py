@@ -0,0 +1,250 @@
+"""
+Module for generating many projects non-interactively from a manifest file.
+"""
+import os
+import json
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, Any, List, Optional
+
+# Generation options a manifest entry may set, with their defaults
+DEFAULT_OPTIONS = {
+    "generate_hello_world": False,
+    "verbose": False,
+    "jobs": None,
+    "fail_fast": False,
+    "fast_commit": False,
+}
+
+def build_components(settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Create the components a ProjectGenerator is configured with from runner-wide settings.
+
+    With the offline setting, the environment of the process is also pointed at the package store.
+
+    Args:
+        settings: Runner-wide settings (output capture, scaffold cache, venv backend, offline store,
+                  history, quiet command output, accelerated ecosystems, shared package caches,
+                  JavaScript workspace)
+
+    Returns:
+        Keyword arguments for ProjectGenerator (command_runner, scaffold_cache, venv_manager,
+        package_store, run_history, accelerator and js_workspace)
+    """
+    from ..utils.command_runner import CommandRunner
+    from ..utils.scaffold_cache import ScaffoldCache
+    from ..utils.venv_manager import VenvManager
+    from ..utils.package_store import PackageStore
+    from ..utils.run_history import RunHistory
+    from ..utils.accelerators import select_accelerator
+    from ..utils.ecosystem_caches import EcosystemCaches
+
+    scaffold_cache = None
+    if settings.get("cache"):
+        scaffold_cache = ScaffoldCache(cache_dir=settings.get("cache_dir"), max_size=settings.get("cache_max_size"))
+    package_store = None
+    if settings.get("offline"):
+        package_store = PackageStore(store_dir=settings.get("prefetch_dir"))
+        os.environ.update(package_store.offline_environment())
+    ecosystem_caches = EcosystemCaches() if settings.get("shared_caches", False) else None
+    maven_repository = ecosystem_caches.location("maven") if ecosystem_caches else None
+
+    return {
+        "command_runner": CommandRunner(output_tail_kb=settings.get("output_tail_kb"),
+                                        log_dir=settings.get("command_log_dir"), quiet=settings.get("quiet", False),
+                                        ecosystem_caches=ecosystem_caches),
+        "scaffold_cache": scaffold_cache,
+        "venv_manager": VenvManager(backend=settings.get("venv_backend"), golden=settings.get("golden_venvs", True)),
+        "package_store": package_store,
+        "run_history": RunHistory() if settings.get("history", True) else None,
+        "accelerator": select_accelerator(settings.get("accelerate"), maven_repository=maven_repository),
+        "js_workspace": settings.get("js_workspace", False),
+    }
+
+def generation_status(success: bool, module_results: Dict[str, Dict[str, Any]]) -> str:
+    """
+    Return the status of a project generation.
+
+    create_project_structure() only reports failed installations with fail_fast,
+    so the module results are checked as well.
+
+    Args:
+        success: The return value of create_project_structure()
+        module_results: The per-module installation results of the ProjectGenerator
+
+    Returns:
+        "ok" if the generation and every module installation succeeded, "failed" otherwise
+    """
+    if not success or any(not module_result["success"] for module_result in module_results.values()):
+        return "failed"
+    return "ok"
+
+def generate_project(entry: Dict[str, Any], settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Generate a single project from a manifest entry. Runs in a worker process.
+
+    Args:
+        entry: The manifest entry with name, base_dir, choices and options
+        settings: Runner-wide settings (see build_components)
+
+    Returns:
+        Dictionary with the project name, status, duration and per-module results
+    """
+    # Imported here so the parent process, which only dispatches work, stays light
+    from .project_generator import ProjectGenerator
+
+    start = time.monotonic()
+    result = {"name": entry["name"], "base_dir": entry["base_dir"]}
+    try:
+        project_generator = ProjectGenerator(**build_components(settings))
+        options = entry["options"]
+        success = project_generator.create_project_structure(
+            entry["base_dir"],
+            entry["choices"],
+            generate_hello_world=options["generate_hello_world"],
+            verbose=options["verbose"],
+            jobs=options["jobs"],
+            fail_fast=options["fail_fast"],
+            fast_commit=options["fast_commit"]
+        )
+        result["status"] = generation_status(success, project_generator.module_results)
+        result["modules"] = project_generator.module_results
+    except Exception as e:
+        logging.getLogger(__name__).error(f"Error generating {entry['name']}: {str(e)}")
+        result["status"] = "error"
+        result["error"] = str(e)
+
+    result["duration"] = time.monotonic() - start
+    return result
+
+class BatchRunner:
+    """
+    Generates the projects listed in a JSON Lines manifest concurrently, using a process pool.
+    """
+    def __init__(self, concurrency: Optional[int] = None, output_dir: Optional[str] = None,
+                 default_options: Optional[Dict[str, Any]] = None,
+                 settings: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the BatchRunner.
+
+        Args:
+            concurrency: Maximum number of projects generated at once (default: CPU count, at most 4)
+            output_dir: Directory in which projects without a base_dir are created
+            default_options: Generation options applied when an entry does not set them
+            settings: Runner-wide settings passed to every worker
+        """
+        self.logger = logging.getLogger(__name__)
+        self.concurrency = concurrency or min(4, os.cpu_count() or 1)
+        self.output_dir = os.path.abspath(output_dir or os.path.join(os.getcwd(), ".."))
+        self.default_options = dict(DEFAULT_OPTIONS, **(default_options or {}))
+        self.settings = settings or {}
+
+    def load_manifest(self, manifest_path: str) -> List[Dict[str, Any]]:
+        """
+        Load and validate a manifest. Each non-empty line is a JSON object such as
+        {"name": "billing", "choices": {"backend": {...}}, "options": {"generate_hello_world": true}}.
+
+        Args:
+            manifest_path: Path to the JSON Lines manifest
+
+        Returns:
+            List of normalized entries with name, base_dir, choices and options
+
+        Raises:
+            ValueError: If a line is not valid or two entries target the same directory
+        """
+        entries = []
+        base_dirs = set()
+
+        with open(manifest_path, "r") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip() or line.lstrip().startswith("#"):
+                    continue
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ValueError(f"{manifest_path}:{line_number}: invalid JSON ({e.msg})")
+
+                entry = self.parse_entry(data, f"{manifest_path}:{line_number}")
+                if entry["base_dir"] in base_dirs:
+                    raise ValueError(f"{manifest_path}:{line_number}: duplicate project directory {entry['base_dir']}")
+                base_dirs.add(entry["base_dir"])
+                entries.append(entry)
+
+        return entries
+
+    def parse_entry(self, data: Any, location: str) -> Dict[str, Any]:
+        """
+        Validate and normalize a single project request.
+
+        Args:
+            data: The decoded {"name", "choices", "options"} object
+            location: Where the request comes from, prefixed to error messages
+
+        Returns:
+            The normalized entry with name, base_dir, choices and options
+
+        Raises:
+            ValueError: If the request is not valid
+        """
+        if not isinstance(data, dict) or not data.get("name") or not isinstance(data.get("choices"), dict):
+            raise ValueError(f"{location}: expected an object with 'name' and 'choices'")
+
+        options = data.get("options", {})
+        if not isinstance(options, dict):
+            raise ValueError(f"{location}: 'options' must be an object")
+        unknown = set(options) - set(DEFAULT_OPTIONS) - {"base_dir"}
+        if unknown:
+            raise ValueError(f"{location}: unknown options {', '.join(sorted(unknown))}")
+
+        return {
+            "name": data["name"],
+            "base_dir": os.path.abspath(options.get("base_dir") or os.path.join(self.output_dir, data["name"])),
+            "choices": data["choices"],
+            "options": {key: options.get(key, value) for key, value in self.default_options.items()},
+        }
+
+    def run(self, entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Generate every project of the manifest.
+
+        Args:
+            entries: Entries returned by load_manifest()
+
+        Returns:
+            Summary with overall timings and the per-project results, in manifest order
+        """
+        start = time.monotonic()
+        results: Dict[str, Dict[str, Any]] = {}
+        self.logger.info(f"Generating {len(entries)} project(s) with {self.concurrency} worker(s)")
+
+        with ProcessPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = {executor.submit(generate_project, entry, self.settings): entry for entry in entries}
+            for future in as_completed(futures):
+                entry = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"name": entry["name"], "base_dir": entry["base_dir"], "status": "error",
+                              "error": str(e), "duration": 0.0}
+                results[entry["base_dir"]] = result
+                self.logger.info(f"{result['name']}: {result['status']} in {result['duration']:.1f}s")
+
+        projects = [results[entry["base_dir"]] for entry in entries]
+        return {
+            "total": len(projects),
+            "succeeded": sum(1 for project in projects if project["status"] == "ok"),
+            "failed": sum(1 for project in projects if project["status"] != "ok"),
+            "concurrency": self.concurrency,
+            "duration": time.monotonic() - start,
+            "projects": projects,
+        }
+
+    def write_summary(self, summary: Dict[str, Any], summary_path: str) -> None:
+        """Write the batch summary as JSON."""
+        summary_dir = os.path.dirname(os.path.abspath(summary_path))
+        os.makedirs(summary_dir, exist_ok=True)
+        with open(summary_path, "w") as f:
+            json.dump(summary, f, indent=2)
+        self.logger.info(f"Wrote batch summary to {summary_path}")
@@ -1,32 +1,117 @@
 import os
+import time
 import logging
 import json
-from typing import Dict, Any, Optional
+import shlex
+import shutil
+import subprocess
+from typing import Dict, Any, List, Optional
 
 from ..config.config_manager import ConfigManager
 from ..utils.command_runner import CommandRunner
-from ..utils.venv_manager import VenvManager
-from ..utils.gitignore_generator import GitignoreGenerator
-from ..templates.template_manager import TemplateManager
-from ..templates.hello_world import HelloWorldGenerator
+from ..utils.accelerators import Accelerator
+from ..utils.async_command_runner import CustomCompletedProcess
+from ..utils import js_workspace
+from ..utils.install_steps import (InstallStep, convert_command, format_step, format_steps, outputs_exist,
+                                   parse_steps, removed_names, render_steps)
+from ..utils.venv_manager import VenvManager, split_venv_command
+from ..utils.scaffold_cache import ScaffoldCache
+from ..utils.package_store import PackageStore
+from ..utils.run_history import RunHistory
+from ..utils.toolchain import ToolchainProber
+from ..utils.tracing import current_span, trace_span, traced
+from ..utils.trash import TRASH_DIR_NAME, Trash, get_trash, split_rm_prefix
+from ..templates.template_manager import TemplateManager, parse_docker_compose_template
+from .task_graph import TaskGraph
+
+# Estimated duration of a module installation, in seconds, used by the execution plan
+DEFAULT_INSTALL_ESTIMATE = 60.0
 
 class ProjectGenerator:
     """
     Main class responsible for generating project structures based on user choices.
     Coordinates all the components needed for project generation.
     """
-    def __init__(self):
-        """Initialize the ProjectGenerator with required managers."""
+    def __init__(self, command_runner: Optional[CommandRunner] = None,
+                 scaffold_cache: Optional[ScaffoldCache] = None,
+                 config_manager: Optional[ConfigManager] = None,
+                 venv_manager: Optional[VenvManager] = None,
+                 package_store: Optional[PackageStore] = None,
+                 run_history: Optional[RunHistory] = None,
+                 trash: Optional[Trash] = None,
+                 accelerator: Optional[Accelerator] = None,
+                 js_workspace: bool = False):
+        """
+        Initialize the ProjectGenerator with required managers.
+        
+        Args:
+            command_runner: Optional pre-configured CommandRunner (e.g. with bounded output capture)
+            scaffold_cache: Optional ScaffoldCache used to skip installations already done
+            config_manager: Optional ConfigManager shared with the caller
+            venv_manager: Optional VenvManager (e.g. with a specific creation backend)
+            package_store: Optional PackageStore; when given, pip and npm installations run offline from it
+            run_history: Optional RunHistory recording the installations and estimating their durations
+            trash: Optional Trash deleting the directories replaced by installations (default: the process-wide one)
+            accelerator: Optional Accelerator adding the flags and environment of its ecosystem profiles
+            js_workspace: Install the dependencies of the JavaScript modules once, in a workspace at the project root
+        """
         self.logger = logging.getLogger(__name__)
-        self.config_manager = ConfigManager()
-        self.command_runner = CommandRunner()
-        self.venv_manager = VenvManager()
+        self.config_manager = config_manager or ConfigManager()
+        self.command_runner = command_runner or CommandRunner()
+        self.venv_manager = venv_manager or VenvManager()
         self.template_manager = TemplateManager()
-        self.hello_world_generator = HelloWorldGenerator()
-        self.gitignore_generator = GitignoreGenerator()
+        self.scaffold_cache = scaffold_cache
+        self.package_store = package_store
+        self.run_history = run_history
+        self.trash = trash or get_trash()
+        self.accelerator = accelerator
+        self.js_workspace = js_workspace
+        self._toolchain_prober = None
+        self.module_results: Dict[str, Dict[str, Any]] = {}
+        self.venv_reports: Dict[str, Optional[Dict[str, Any]]] = {}
+        self.step_reports: Dict[str, List[Dict[str, Any]]] = {}
+        self.accelerator_reports: Dict[str, Dict[str, Any]] = {}
+        self.workspace_report: Optional[Dict[str, Any]] = None
+        self._hello_world_generator = None
+        self._gitignore_generator = None
+    
+    @property
+    def hello_world_generator(self):
+        """HelloWorldGenerator, imported and created on first use."""
+        if self._hello_world_generator is None:
+            from ..templates.hello_world import HelloWorldGenerator
+            self._hello_world_generator = HelloWorldGenerator()
+        return self._hello_world_generator
+    
+    @property
+    def gitignore_generator(self):
+        """GitignoreGenerator, imported and created on first use."""
+        if self._gitignore_generator is None:
+            from ..utils.gitignore_generator import GitignoreGenerator
+            self._gitignore_generator = GitignoreGenerator()
+        return self._gitignore_generator
+    
+    @property
+    def toolchain_prober(self) -> ToolchainProber:
+        """ToolchainProber shared with the scaffold cache, created on first use."""
+        if self._toolchain_prober is None:
+            self._toolchain_prober = self.scaffold_cache.toolchain_prober if self.scaffold_cache else ToolchainProber()
+        return self._toolchain_prober
+    
+    def warm_up(self) -> None:
+        """
+        Load what every generation needs ahead of time (configuration, parsed Docker
+        Compose template, gitignore registry, Hello World generator), for long-running
+        processes such as the server.
+        """
+        self.config_manager.load_technologies()
+        parse_docker_compose_template(self.config_manager.load_docker_compose_template())
+        self.gitignore_generator.registry
+        self.hello_world_generator
     
+    @traced("initialize_project", "module")
     def initialize_project(self, base_dir: str, module: str, choice: Dict[str, Any], 
-                          install_commands: Dict[str, Any], verbose: bool = False) -> bool:
+                          install_commands: Dict[str, Any], verbose: bool = False, workspace: bool = False) -> bool:
         """
         Initialize a specific module (backend, frontend-web, etc.) in the project.
         
@@ -35,6 +120,8 @@ class ProjectGenerator:
             module: The module type (backend, frontend-web, etc.)
             choice: User's technology choices for this module
             install_commands: Available installation commands
+            workspace: Whether the module joins the JavaScript workspace, so its npm installs
+                       only record dependencies for the workspace installation
             
         Returns:
             True if successful, False otherwise
@@ -42,6 +129,9 @@ class ProjectGenerator:
         try:
             project_path = os.path.join(base_dir, module)
             os.makedirs(project_path, exist_ok=True)
+            self.venv_reports.pop(module, None)
+            self.step_reports.pop(module, None)
+            self.accelerator_reports.pop(module, None)
             
             # Verify if language and framework are provided
             if "language" not in choice or "framework" not in choice:
@@ -50,6 +140,9 @@ class ProjectGenerator:
             
             language = choice["language"]
             framework = choice["framework"]
+            span = current_span()
+            span.set_attribute("language", language)
+            span.set_attribute("framework", framework)
             
             # Check if an installation command exists
             if (module in install_commands and 
@@ -58,33 +151,78 @@ class ProjectGenerator:
                 
                 command_template = install_commands[module][language][framework]
                 variables = {"module": module}
+                steps = None
+                warm = bool(self.accelerator) and self._installed_before(module, language, framework)
                 
-                # Render the installation command with variables
-                install_command = self.template_manager.render_install_command(command_template, variables)
-                
-                # Verify all possible variable patterns were correctly replaced
-                patterns_to_check = ["${module}", "$${module}", "{module}", "$module"]
-                if any(pattern in install_command for pattern in patterns_to_check):
-                    self.logger.warning(f"Variable replacement may have failed in command: {install_command}")
-                    # Direct replacement as last resort
-                    for pattern in patterns_to_check:
-                        install_command = install_command.replace(pattern, module)
+                if isinstance(command_template, list):
+                    # Structured steps: render each argument, and identify them by their shell form
+                    steps = render_steps(parse_steps(command_template),
+                                         lambda text: self.template_manager.render_install_command(text, variables))
+                    if self.accelerator:
+                        steps = [self._accelerate_step(step, warm) for step in steps]
+                    if workspace:
+                        steps = [step._replace(argv=shlex.split(js_workspace.defer_installs(shlex.join(step.argv))))
+                                 for step in steps]
+                    install_command = format_steps(steps)
+                else:
+                    # Render the installation command with variables
+                    install_command = self.template_manager.render_install_command(
+                        command_template, variables, accelerator=self.accelerator, warm=warm)
+                    
+                    # Verify all possible variable patterns were correctly replaced
+                    patterns_to_check = ["${module}", "$${module}", "{module}", "$module"]
+                    if any(pattern in install_command for pattern in patterns_to_check):
+                        self.logger.warning(f"Variable replacement may have failed in command: {install_command}")
+                        # Direct replacement as last resort
+                        for pattern in patterns_to_check:
+                            install_command = install_command.replace(pattern, module)
+                    if workspace:
+                        install_command = js_workspace.defer_installs(install_command)
                 
-                self.logger.info(f"Installing {framework} ({language}) in {module}...")
-                result = self.command_runner.run(install_command, cwd=base_dir, show_output=verbose)
+                if self.accelerator:
+                    self.accelerator_reports[module] = self.accelerator.report(install_command, warm)
+                    
+                cache_key = None
+                if self.scaffold_cache:
+                    cache_key = self.scaffold_cache.make_key(module, install_command)
                 
-                if result.returncode != 0:
-                    self.logger.error(f"Installation failed for {framework} ({language}) in {module}.")
-                    self.logger.error(f"Error: {result.stderr}")
-                    return False
+                cache_hit = bool(cache_key) and self.scaffold_cache.restore(cache_key, project_path)
+                span.set_attribute("cache_hit", cache_hit)
+                if cache_hit:
+                    self.logger.info(f"Restored {framework} ({language}) in {module} from the scaffold cache")
+                else:
+                    self.logger.info(f"Installing {framework} ({language}) in {module}...")
+                    start = time.monotonic()
+                    returncode, output_size = -1, 0
+                    try:
+                        result = self._run_install_command(install_command, base_dir, module, language, verbose,
+                                                           steps)
+                        returncode, output_size = result.returncode, result.output_size
+                    except subprocess.CalledProcessError as e:
+                        returncode, output_size = e.returncode, len(e.output or "") + len(e.stderr or "")
+                        raise
+                    finally:
+                        self._record_run(module, language, framework, install_command, time.monotonic() - start,
+                                         returncode, output_size)
+                    
+                    if result.returncode != 0:
+                        self.logger.error(f"Installation failed for {framework} ({language}) in {module}.")
+                        self.logger.error(f"Error: {result.stderr}")
+                        if result.log_path:
+                            self.logger.error(f"Full output: {result.log_path}")
+                        return False
+                    
+                    if cache_key:
+                        self.scaffold_cache.store(cache_key, project_path, module, install_command)
             else:
                 self.logger.warning(f"No installation command found for {framework} in {language} ({module}).")
                 
-            # Set up virtual environment if it's a Python project
-            if language == "python":
+            # Set up virtual environment if it's a Python project and the installation did not
+            if language == "python" and module not in self.venv_reports:
                 self.logger.info(f"Setting up virtual environment for {module}...")
                 if not self.venv_manager.create_venv(project_path):
                     self.logger.warning(f"Failed to create virtual environment for {module}, continuing anyway.")
+                self.venv_reports[module] = self.venv_manager.reports.get(project_path)
             
             # Add a README.md file
             with open(os.path.join(project_path, "README.md"), "w") as f:
@@ -102,6 +240,405 @@ class ProjectGenerator:
             self.logger.error(f"Error initializing {module}: {str(e)}")
             return False
     
+    def _run_install_command(self, install_command: str, base_dir: str, module: str, language: str,
+                             verbose: bool, steps: Optional[List[InstallStep]] = None):
+        """
+        Run an installation command, letting the VenvManager create the Python
+        virtual environments it sets up, so they can be cloned from golden templates.
+        Commands made of plain ``&&`` chains are converted to steps, run without a shell.
+        With a package store, the commands run are rewritten to install offline.
+        
+        Returns:
+            The CustomCompletedProcess of the last command run
+        """
+        if steps is None:
+            install_command = self._trash_removed_directories(install_command, base_dir)
+            venv_command = split_venv_command(install_command) if language == "python" else None
+            if venv_command is None:
+                steps = convert_command(install_command)
+        if steps is not None:
+            return self._run_install_steps(steps, install_command, base_dir, module, verbose)
+            
+        if self.package_store:
+            install_command = self.package_store.offline_command(install_command)
+        if venv_command is None:
+            return self.command_runner.run(install_command, cwd=base_dir,
+                                           env=self._command_environment(install_command),
+                                           show_output=verbose, label=module)
+            
+        result = self.command_runner.run(venv_command.prefix, cwd=base_dir,
+                                         env=self._command_environment(venv_command.prefix),
+                                         show_output=verbose, label=module)
+        if result.returncode != 0:
+            return result
+        output_size = result.output_size
+            
+        module_dir = os.path.join(base_dir, venv_command.directory)
+        if not self.venv_manager.create_venv(module_dir, venv_command.venv_name, venv_command.requirements):
+            self.logger.warning(f"Could not set up the virtual environment of {module}, running the full command")
+            return self.command_runner.run(install_command, cwd=base_dir,
+                                           env=self._command_environment(install_command),
+                                           show_output=verbose, label=module)
+        self.venv_reports[module] = self.venv_manager.reports.get(module_dir)
+        
+        if venv_command.rest:
+            rest = self.package_store.offline_command(venv_command.rest) if self.package_store else venv_command.rest
+            env = self.venv_manager.venv_environment(os.path.join(module_dir, venv_command.venv_name))
+            result = self.command_runner.run(rest, cwd=module_dir, env=self._command_environment(rest, env),
+                                             show_output=verbose, label=module)
+            result.output_size += output_size
+        return result
+    
+    def _trash_removed_directories(self, install_command: str, base_dir: str) -> str:
+        """
+        Handle the leading ``rm -rf`` of an installation command natively: the removed
+        directories are renamed into a trash directory next to the project and deleted
+        in the background, so the installer starts at once.
+        
+        Returns:
+            The command left to run, still removing the directories that were not moved
+            (missing, empty or on another filesystem)
+        """
+        split = split_rm_prefix(install_command)
+        if split is None:
+            return install_command
+        names, rest = split
+        
+        remaining = self._trash_names(names, base_dir, base_dir)
+        return f"rm -rf {' '.join(remaining)} && {rest}" if remaining else rest
+    
+    def _trash_names(self, names: List[str], directory: str, base_dir: str) -> List[str]:
+        """Move directories of a project to its trash and return the names that were not moved."""
+        trash_dir = os.path.join(os.path.dirname(os.path.abspath(base_dir)), TRASH_DIR_NAME)
+        return [name for name in names if not self.trash.discard(os.path.join(directory, name), trash_dir)]
+    
+    def _run_install_steps(self, steps: List[InstallStep], install_command: str, base_dir: str, module: str,
+                           verbose: bool) -> CustomCompletedProcess:
+        """
+        Run installation steps one by one without a shell, timing each of them in step_reports.
+        
+        Steps whose outputs already exist are skipped. With a scaffold cache, the module
+        directory is restored after the last cached step instead of running the steps up
+        to it, and the steps marked "cache" store the module directory they leave.
+        
+        Returns:
+            The CustomCompletedProcess of the last step run, with the output size of every step
+        """
+        module_dir = os.path.join(base_dir, module)
+        reports = self.step_reports[module] = []
+        result = CustomCompletedProcess(install_command, 0, "", "")
+        output_size = 0
+        
+        for index in range(self._restore_cached_steps(steps, module, module_dir, reports), len(steps)):
+            step = steps[index]
+            report = {"step": format_step(step), "cwd": step.cwd, "status": "skipped", "duration": 0.0}
+            reports.append(report)
+            if outputs_exist(step, base_dir):
+                continue
+                
+            start = time.monotonic()
+            report["status"] = "failed"
+            with trace_span("install_step", module=module, step=report["step"]) as span:
+                try:
+                    step_result = self._run_install_step(step, base_dir, module, verbose)
+                    if step_result is not None:
+                        result = step_result
+                        output_size += step_result.output_size
+                    report["status"] = "ok" if result.returncode == 0 else "failed"
+                finally:
+                    report["duration"] = time.monotonic() - start
+                    span.set_attribute("status", report["status"])
+            if result.returncode != 0:
+                break
+                
+            if step.cache and self.scaffold_cache:
+                prefix = format_steps(steps[:index + 1])
+                self.scaffold_cache.store(self.scaffold_cache.make_key(module, prefix), module_dir, module, prefix)
+                
+        result.output_size = output_size
+        return result
+    
+    def _restore_cached_steps(self, steps: List[InstallStep], module: str, module_dir: str,
+                              reports: List[Dict[str, Any]]) -> int:
+        """
+        Restore the module directory left by the last cached step found in the scaffold cache.
+        
+        Returns:
+            Index of the first step left to run
+        """
+        if not self.scaffold_cache:
+            return 0
+        for index in range(len(steps) - 1, -1, -1):
+            if not steps[index].cache:
+                continue
+            key = self.scaffold_cache.make_key(module, format_steps(steps[:index + 1]))
+            if self.scaffold_cache.restore(key, module_dir):
+                reports.extend({"step": format_step(step), "cwd": step.cwd, "status": "cached", "duration": 0.0}
+                               for step in steps[:index + 1])
+                return index + 1
+        return 0
+    
+    def _run_install_step(self, step: InstallStep, base_dir: str, module: str,
+                          verbose: bool) -> Optional[CustomCompletedProcess]:
+        """
+        Run an installation step, moving the directories it removes to the trash.
+        
+        Returns:
+            The CustomCompletedProcess of the step, or None if it had nothing left to run
+        """
+        cwd = os.path.join(base_dir, step.cwd)
+        argv = step.argv
+        names = removed_names(step)
+        if names is not None:
+            names = self._trash_names(names, cwd, base_dir)
+            if not names:
+                return None
+            argv = argv[:2] + names
+        if self.package_store:
+            argv = shlex.split(self.package_store.offline_command(shlex.join(argv)))
+        env = dict(os.environ, **step.env) if step.env else None
+        return self.command_runner.run(argv, cwd=cwd, env=self._command_environment(shlex.join(argv), env),
+                                       show_output=verbose, label=module)
+    
+    def _command_environment(self, command: str,
+                             env: Optional[Dict[str, str]] = None) -> Optional[Dict[str, str]]:
+        """
+        Add the accelerator's variables for a command to its environment.
+        
+        Args:
+            command: The command about to run
+            env: Its environment, or None to inherit the process environment
+            
+        Returns:
+            The environment of the command, None still meaning the process environment
+        """
+        variables = self.accelerator.environment(command) if self.accelerator else {}
+        if not variables:
+            return env
+        return dict(env if env is not None else os.environ, **variables)
+    
+    def _accelerate_step(self, step: InstallStep, warm: bool) -> InstallStep:
+        """Add the flags of the accelerator's profiles to the command of a step."""
+        return step._replace(argv=shlex.split(self.accelerator.accelerate(shlex.join(step.argv), warm)))
+    
+    def _installed_before(self, module: str, language: str, framework: str) -> bool:
+        """Return whether the run history has a successful installation of a technology."""
+        return self.run_history is not None and self.run_history.estimate(module, language, framework) is not None
+    
+    def _record_run(self, module: str, language: str, framework: str, command: str, duration: float,
+                    returncode: int, output_size: int) -> None:
+        """Record an installation in the run history, if there is one."""
+        if self.run_history is None:
+            return
+        self.run_history.record(module, language, framework, command, duration, returncode, output_size,
+                                toolchain=self.toolchain_prober.versions_for_command(command))
+    
+    def estimate_install(self, module: str, choice: Dict[str, Any]) -> float:
+        """
+        Estimate the duration of a module installation from the run history.
+        
+        Returns:
+            The median of the recent successful runs, or DEFAULT_INSTALL_ESTIMATE without history
+        """
+        if self.run_history and "language" in choice and "framework" in choice:
+            estimate = self.run_history.estimate(module, choice["language"], choice["framework"])
+            if estimate is not None:
+                return estimate
+        return DEFAULT_INSTALL_ESTIMATE
+    
+    def _add_install_tasks(self, graph: TaskGraph, base_dir: str, choices: Dict[str, Any],
+                           install_commands: Dict[str, Any], verbose: bool, speculative=None,
+                           workspace_modules: Optional[List[str]] = None) -> List[str]:
+        """
+        Add one heavy install task per selected module and return their names.
+        
+        Modules already installed by a SpeculativeInstaller are moved into the
+        project by their task instead of being installed again.
+        """
+        names = []
+        for module, choice in choices.items():
+            if module == "database":  # Handle database separately
+                continue
+            name = f"install:{module}"
+            graph.add_task(
+                name,
+                lambda module=module, choice=choice: self._install_module(
+                    base_dir, module, choice, install_commands, verbose, speculative,
+                    workspace=module in (workspace_modules or ())
+                ),
+                estimate=self.estimate_install(module, choice),
+                heavy=True,
+                description=f"Install {choice.get('framework')} ({choice.get('language')}) in {module}"
+            )
+            names.append(name)
+        return names
+    
+    def _install_module(self, base_dir: str, module: str, choice: Dict[str, Any], install_commands: Dict[str, Any],
+                        verbose: bool, speculative=None, workspace: bool = False) -> bool:
+        """Commit a module's speculative installation, or install it if it was not staged."""
+        if speculative is not None:
+            committed = speculative.commit(module, choice, workspace=workspace)
+            if committed is not None:
+                return committed
+        return self.initialize_project(base_dir, module, choice, install_commands, verbose=verbose,
+                                       workspace=workspace)
+    
+    def _collect_module_results(self, graph: TaskGraph) -> Dict[str, Dict[str, Any]]:
+        """Build the per-module installation results from the install tasks of a graph."""
+        results = {}
+        for name, task in graph.tasks.items():
+            if name.startswith("install:"):
+                module = name[len("install:"):]
+                results[module] = {
+                    "success": task.status == "ok",
+                    "status": task.status,
+                    "duration": task.duration,
+                }
+                if self.venv_reports.get(module):
+                    results[module]["venv"] = self.venv_reports.pop(module)
+                if self.step_reports.get(module):
+                    results[module]["steps"] = self.step_reports.pop(module)
+                if self.accelerator_reports.get(module):
+                    results[module]["accelerator"] = self.accelerator_reports.pop(module)
+        return results
+    
+    def build_task_graph(self, base_dir: str, choices: Dict[str, Any],
+                         generate_hello_world: bool = False, verbose: bool = False,
+                         fast_commit: bool = False, speculative=None) -> TaskGraph:
+        """
+        Compile the generation of a project into a graph of tasks with explicit dependencies.
+        
+        Module installations are the only long-running tasks. Hello World code for a
+        module only waits for that module's installation, while the Docker Compose file,
+        READMEs and root .gitignore do not wait for anything. With js_workspace, the
+        dependencies of the JavaScript modules are installed at the project root once
+        their installations are done. The Git repository is initialized last, once every
+        other task has finished.
+        
+        Args:
+            base_dir: The base directory for the project
+            choices: User's technology choices
+            generate_hello_world: Whether to generate Hello World examples
+            verbose: Whether to show command output in real-time
+            fast_commit: Whether to create the initial commit with git fast-import
+            speculative: Optional SpeculativeInstaller holding modules installed during the prompts
+            
+        Returns:
+            The TaskGraph, ready to be run or displayed with format_plan()
+        """
+        install_commands = self.config_manager.load_technologies()
+        graph = TaskGraph()
+        workspace_modules = js_workspace.workspace_modules(choices) if self.js_workspace else []
+        
+        self._add_install_tasks(graph, base_dir, choices, install_commands, verbose, speculative, workspace_modules)
+        if workspace_modules:
+            graph.add_task(
+                "install-workspace",
+                lambda: self.install_workspace(base_dir, workspace_modules, verbose=verbose),
+                dependencies=[f"install:{module}" for module in workspace_modules],
+                estimate=max(self.estimate_install(module, choices[module]) for module in workspace_modules),
+                heavy=True,
+                description=f"Install the JavaScript workspace of {', '.join(workspace_modules)}"
+            )
+        
+        graph.add_task("docker-compose", lambda: self.generate_docker_compose(base_dir, choices),
+                       description="Render infra/docker-compose.yml")
+        
+        if generate_hello_world and "backend" in choices:
+            backend_language = choices["backend"]["language"]
+            backend_framework = choices["backend"]["framework"]
+            
+            graph.add_task(
+                "hello-world:backend",
+                lambda: self.hello_world_generator.generate_backend(base_dir, backend_language, backend_framework),
+                dependencies=["install:backend"],
+                description="Generate the backend Hello World endpoint"
+            )
+            
+            for module in ["frontend-web", "frontend-mobile", "frontend-desktop"]:
+                if module in choices:
+                    graph.add_task(
+                        f"hello-world:{module}",
+                        lambda module=module: self.hello_world_generator.generate_frontend(
+                            base_dir, module, choices[module]["language"], choices[module]["framework"],
+                            backend_language, backend_framework
+                        ),
+                        dependencies=[f"install:{module}"],
+                        description=f"Generate the {module} Hello World component"
+                    )
+        
+        graph.add_task("docs", lambda: self.write_docs_readme(base_dir, choices, generate_hello_world),
+                       description="Write docs/README.md")
+        graph.add_task("readme", lambda: self.write_root_readme(base_dir, choices, generate_hello_world),
+                       description="Write the root README.md")
+        graph.add_task("gitignore", lambda: self.gitignore_generator.add_root_gitignore(
+                           base_dir, choices, workspace=bool(workspace_modules)),
+                       description="Write the root .gitignore")
+        
+        graph.add_task("git", lambda: self.initialize_git_repo(base_dir, verbose=verbose, fast_commit=fast_commit),
+                       dependencies=list(graph.tasks), estimate=1.0,
+                       description="Initialize the Git repository with an initial commit")
+        return graph
+    
+    @traced("install_workspace")
+    def install_workspace(self, base_dir: str, modules: List[str], verbose: bool = False) -> bool:
+        """
+        Install the dependencies of JavaScript modules once, in a workspace at the project root.
+        
+        The node_modules and lockfiles of the modules are replaced by the hoisted
+        node_modules and the single lockfile of the workspace. Only the modules with
+        a package.json join the workspace.
+        
+        Args:
+            base_dir: The base directory for the project
+            modules: The JavaScript modules
+            verbose: Whether to show command output in real-time
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        self.workspace_report = None
+        try:
+            members = [module for module in modules if os.path.isfile(os.path.join(base_dir, module, "package.json"))]
+            if not members:
+                self.logger.warning("No JavaScript module has a package.json, not creating a workspace")
+                return True
+            
+            package_manager = js_workspace.select_package_manager(offline=self.package_store is not None)
+            current_span().set_attribute("package_manager", package_manager)
+            for module in members:
+                module_dir = os.path.join(base_dir, module)
+                # Installed by the scaffolders, which cannot skip it
+                if self._trash_names(["node_modules"], module_dir, base_dir):
+                    shutil.rmtree(os.path.join(module_dir, "node_modules"), ignore_errors=True)
+                js_workspace.remove_module_lockfiles(module_dir)
+            js_workspace.write_workspace_manifest(base_dir, members, package_manager)
+            
+            self.logger.info(f"Installing the {package_manager} workspace of {', '.join(members)}...")
+            command = js_workspace.install_command(package_manager)
+            if self.accelerator:
+                command = self.accelerator.accelerate(command)
+            if self.package_store:
+                command = self.package_store.offline_command(command)
+            start = time.monotonic()
+            result = self.command_runner.run(command, cwd=base_dir, env=self._command_environment(command),
+                                             show_output=verbose, label="workspace")
+            self.workspace_report = {
+                "package_manager": package_manager,
+                "modules": members,
+                "status": "ok" if result.returncode == 0 else "failed",
+                "duration": time.monotonic() - start,
+            }
+            if result.returncode != 0:
+                self.logger.error(f"Installation of the JavaScript workspace failed: {result.stderr}")
+                return False
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error installing the JavaScript workspace: {str(e)}")
+            return False
+    
+    @traced("generate_docker_compose")
     def generate_docker_compose(self, base_dir: str, choices: Dict[str, Any]) -> bool:
         """
         Generate a Docker Compose file for the selected services.
@@ -125,7 +662,7 @@ class ProjectGenerator:
             os.makedirs(infra_path, exist_ok=True)
             
             with open(os.path.join(infra_path, "docker-compose.yml"), "w") as f:
-                f.write(docker_compose_content)
+                current_span().add("bytes_written", f.write(docker_compose_content))
                 
             self.logger.info(f"Generated Docker Compose file at {os.path.join(infra_path, 'docker-compose.yml')}")
             return True
@@ -134,12 +671,16 @@ class ProjectGenerator:
             self.logger.error(f"Error generating Docker Compose file: {str(e)}")
             return False
     
-    def initialize_git_repo(self, base_dir: str, verbose: bool = False) -> bool:
+    @traced("initialize_git_repo", "fast_commit")
+    def initialize_git_repo(self, base_dir: str, verbose: bool = False, fast_commit: bool = False) -> bool:
         """
         Initialize a Git repository in the project directory.
         
         Args:
             base_dir: The base directory for the project
+            verbose: Whether to show command output in real-time
+            fast_commit: Stream the files that are not ignored to git fast-import instead
+                         of running git add and git commit
             
         Returns:
             True if successful, False otherwise
@@ -152,6 +693,13 @@ class ProjectGenerator:
             if git_init.returncode != 0:
                 self.logger.error("Failed to initialize Git repository")
                 return False
+            
+            if fast_commit:
+                from ..utils.git_fast_import import FastImportCommitter
+                if FastImportCommitter().commit(base_dir, "Initial commit with project structure"):
+                    self.logger.info("Git repository initialized successfully")
+                    return True
+                self.logger.warning("Falling back to git add and git commit")
                 
             # Add all files to Git
             git_add = self.command_runner.run("git add .", cwd=base_dir, show_output=verbose)
@@ -176,61 +724,19 @@ class ProjectGenerator:
             self.logger.error(f"Error initializing Git repository: {str(e)}")
             return False
     
-    def create_project_structure(self, base_dir: str, choices: Dict[str, Any], 
-                              generate_hello_world: bool = False, verbose: bool = False) -> bool:
+    def write_docs_readme(self, base_dir: str, choices: Dict[str, Any], generate_hello_world: bool = False) -> bool:
         """
-        Create the entire project structure based on user choices.
+        Write the documentation README in the docs directory.
         
         Args:
             base_dir: The base directory for the project
             choices: User's technology choices
-            generate_hello_world: Whether to generate Hello World examples
+            generate_hello_world: Whether Hello World examples are generated
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            self.logger.info(f"Creating project structure at {base_dir}")
-            
-            # Create the base directory
-            os.makedirs(base_dir, exist_ok=True)
-            
-            # Load installation commands
-            install_commands = self.config_manager.load_technologies()
-            
-            # Initialize each module
-            for module, choice in choices.items():
-                if module != "database":  # Handle database separately
-                    success = self.initialize_project(base_dir, module, choice, install_commands, verbose=verbose)
-                    if not success:
-                        self.logger.warning(f"Failed to initialize {module}, continuing with other modules")
-            
-            # Generate Docker Compose file
-            self.generate_docker_compose(base_dir, choices)
-            
-            # Generate Hello World examples if requested
-            if generate_hello_world and "backend" in choices:
-                self.logger.info("Generating Hello World examples...")
-                backend_language = choices["backend"]["language"]
-                backend_framework = choices["backend"]["framework"]
-                
-                # Generate backend Hello World endpoint
-                self.hello_world_generator.generate_backend(
-                    base_dir, backend_language, backend_framework
-                )
-                
-                # Generate frontend Hello World components
-                frontend_modules = ["frontend-web", "frontend-mobile", "frontend-desktop"]
-                for module in frontend_modules:
-                    if module in choices:
-                        frontend_language = choices[module]["language"]
-                        frontend_framework = choices[module]["framework"]
-                        
-                        self.hello_world_generator.generate_frontend(
-                            base_dir, module, frontend_language, frontend_framework,
-                            backend_language, backend_framework
-                        )
-            
             # Create docs directory
             docs_path = os.path.join(base_dir, "docs")
             os.makedirs(docs_path, exist_ok=True)
@@ -261,6 +767,25 @@ class ProjectGenerator:
                     f.write("2. Launch the frontend application(s)\n")
                     f.write("3. The frontend will display the message from the backend\n")
             
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Error writing documentation README: {str(e)}")
+            return False
+    
+    def write_root_readme(self, base_dir: str, choices: Dict[str, Any], generate_hello_world: bool = False) -> bool:
+        """
+        Write the main README at the root of the project.
+        
+        Args:
+            base_dir: The base directory for the project
+            choices: User's technology choices
+            generate_hello_world: Whether Hello World examples are generated
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
             # Create main README
             with open(os.path.join(base_dir, "README.md"), "w") as f:
                 f.write(f"# {os.path.basename(base_dir)}\n\n")
@@ -303,11 +828,57 @@ class ProjectGenerator:
                     
                     f.write("See the respective README files in each component directory for more details on how to run the example.\n")
             
-            # Add root .gitignore file
-            self.gitignore_generator.add_root_gitignore(base_dir, choices)
+            return True
             
-            # Initialize Git repository
-            self.initialize_git_repo(base_dir, verbose=verbose)
+        except Exception as e:
+            self.logger.error(f"Error writing root README: {str(e)}")
+            return False
+    
+    def create_project_structure(self, base_dir: str, choices: Dict[str, Any], 
+                              generate_hello_world: bool = False, verbose: bool = False,
+                              jobs: Optional[int] = None, fail_fast: bool = False,
+                              fast_commit: bool = False, speculative=None,
+                              install_slots=None, on_task_event=None) -> bool:
+        """
+        Create the entire project structure based on user choices.
+        
+        The generation runs as a task graph (see build_task_graph), so files that do
+        not depend on an installation are written while the installers are running.
+        Per-module installation results are kept in ``self.module_results``.
+        
+        Args:
+            base_dir: The base directory for the project
+            choices: User's technology choices
+            generate_hello_world: Whether to generate Hello World examples
+            verbose: Whether to show command output in real-time
+            jobs: Maximum number of modules installed concurrently (default: all at once)
+            fail_fast: Abort the generation as soon as one task fails
+            fast_commit: Create the initial commit with git fast-import
+            speculative: Optional SpeculativeInstaller holding modules installed during the prompts
+            install_slots: Optional semaphore limiting module installations across concurrent generations
+            on_task_event: Optional callback receiving "started"/"finished" and each task of the graph
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            self.logger.info(f"Creating project structure at {base_dir}")
+            
+            # Create the base directory
+            os.makedirs(base_dir, exist_ok=True)
+            
+            # Module directories are regenerated, so file indexes from a previous run are stale
+            if self._hello_world_generator is not None:
+                self._hello_world_generator.reset_file_indexes()
+            
+            graph = self.build_task_graph(base_dir, choices, generate_hello_world, verbose=verbose,
+                                          fast_commit=fast_commit, speculative=speculative)
+            success = graph.run(jobs=jobs, fail_fast=fail_fast, heavy_slots=install_slots, on_event=on_task_event)
+            self.module_results = self._collect_module_results(graph)
+            
+            if fail_fast and not success:
+                self.logger.error("Aborting project generation because a task failed")
+                return False
             
             self.logger.info(f"Project structure created successfully at {base_dir}")
             return True
@@ -0,0 +1,273 @@
+"""
+Module serving project generations over a Unix socket.
+
+`monostack serve --socket PATH` keeps one process running with the technology
+catalog, the Docker Compose template, the gitignore registry and the scaffold,
+golden environment and toolchain caches loaded, so each request skips the
+interpreter startup, imports and cold caches of a CLI run. Configuration files
+are reloaded when they change on disk.
+
+Each request is a line of JSON with the fields of a batch manifest entry
+({"name", "choices", "options"}). The server answers with one JSON event per
+line and closes the request with a "done" or "error" event:
+
+    {"event": "accepted", "name": "billing", "base_dir": "/srv/projects/billing", "reloaded": []}
+    {"event": "queued", "running": 4}
+    {"event": "started"}
+    {"event": "task", "task": "install:backend", "status": "running"}
+    {"event": "task", "task": "install:backend", "status": "ok", "duration": 12.3}
+    {"event": "done", "status": "ok", "duration": 15.2, "modules": {...}}
+"""
+import os
+import json
+import time
+import socket
+import logging
+import threading
+import socketserver
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .batch_runner import BatchRunner, build_components, generation_status
+from .project_generator import ProjectGenerator
+from ..config.config_manager import ConfigManager
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix socket server handling each connection in its own thread."""
+    daemon_threads = True
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Reads the requests of a connection, one JSON line each, and streams their events back."""
+    def handle(self) -> None:
+        """Serve the requests of the connection until the client closes it."""
+        lock = threading.Lock()
+        
+        def emit(event: Dict[str, Any]) -> None:
+            with lock:
+                try:
+                    self.wfile.write((json.dumps(event, default=str) + "\n").encode())
+                    self.wfile.flush()
+                except OSError:
+                    # The client went away; the generation carries on
+                    pass
+                    
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                emit({"event": "error", "error": f"invalid JSON ({e.msg})"})
+                continue
+            self.server.generation_server.handle_request(data, emit)
+
+class GenerationServer:
+    """
+    Long-running generation service sharing warm caches between requests, with
+    global limits on the projects and module installations running at once.
+    """
+    def __init__(self, socket_path: str, settings: Optional[Dict[str, Any]] = None,
+                 default_options: Optional[Dict[str, Any]] = None, output_dir: Optional[str] = None,
+                 max_projects: Optional[int] = None, max_installs: Optional[int] = None,
+                 config_dir: Optional[str] = None):
+        """
+        Initialize the GenerationServer.
+        
+        Args:
+            socket_path: Path of the Unix socket to listen on
+            settings: Server-wide settings, as for the batch runner (scaffold cache, venv backend, offline...)
+            default_options: Generation options applied when a request does not set them
+            output_dir: Directory in which projects are created; a request's base_dir must be inside it
+            max_projects: Maximum number of projects generated at once (default: CPU count, at most 4)
+            max_installs: Maximum number of module installations running at once across
+                          every project (default: unlimited)
+            config_dir: Directory of install_commands.json and docker_compose_template.yml
+        """
+        self.logger = logging.getLogger(__name__)
+        self.socket_path = os.path.abspath(socket_path)
+        self.max_projects = max_projects or min(4, os.cpu_count() or 1)
+        self.max_installs = max_installs
+        self.batch_runner = BatchRunner(output_dir=output_dir, default_options=default_options)
+        self.config_manager = ConfigManager(config_dir)
+        # Progress goes to the clients, so commands do not print to the server's console
+        self.components = build_components(dict(settings or {}, quiet=True))
+        self.ready = threading.Event()
+        
+        self._project_slots = threading.BoundedSemaphore(self.max_projects)
+        self._install_slots = threading.BoundedSemaphore(max_installs) if max_installs else None
+        self._active_dirs = set()
+        self._running = 0
+        self._lock = threading.Lock()
+        self._config_lock = threading.Lock()
+        self._server: Optional[_UnixServer] = None
+        
+    def warm_up(self) -> None:
+        """Load the configuration, the Docker Compose template and the gitignore registry."""
+        start = time.monotonic()
+        self.config_manager.load_technologies()
+        ProjectGenerator(config_manager=self.config_manager, **self.components).warm_up()
+        self.logger.info(f"Server caches warmed up in {time.monotonic() - start:.2f}s")
+        
+    def reload_config(self) -> List[str]:
+        """
+        Reload the configuration files that changed on disk since they were loaded.
+        
+        Returns:
+            Names of the reloaded files
+        """
+        with self._config_lock:
+            changed = self.config_manager.refresh()
+            if changed:
+                self.config_manager.load_technologies()
+                self.config_manager.load_docker_compose_template()
+            return changed
+            
+    def handle_request(self, data: Any, emit: Callable[[Dict[str, Any]], None]) -> None:
+        """
+        Generate the project of a request, reporting its progress as events.
+        
+        Args:
+            data: The decoded request
+            emit: Called with each event of the request, the last one being "done" or "error"
+        """
+        start = time.monotonic()
+        try:
+            entry = self.batch_runner.parse_entry(data, "request")
+            self._check_base_dir(entry["base_dir"])
+        except ValueError as e:
+            emit({"event": "error", "error": str(e)})
+            return
+            
+        base_dir = entry["base_dir"]
+        with self._lock:
+            if base_dir in self._active_dirs:
+                emit({"event": "error", "error": f"{base_dir} is already being generated"})
+                return
+            self._active_dirs.add(base_dir)
+            
+        try:
+            reloaded = self.reload_config()
+            emit({"event": "accepted", "name": entry["name"], "base_dir": base_dir, "reloaded": reloaded})
+            
+            if not self._project_slots.acquire(blocking=False):
+                emit({"event": "queued", "running": self._running})
+                self._project_slots.acquire()
+            try:
+                with self._lock:
+                    self._running += 1
+                emit({"event": "started"})
+                result = self._generate(entry, emit)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                self._project_slots.release()
+                
+            emit({"event": "done", **result, "duration": time.monotonic() - start})
+            self.logger.info(f"{entry['name']}: {result['status']} in {time.monotonic() - start:.1f}s")
+            
+        except Exception as e:
+            self.logger.error(f"Error generating {entry['name']}: {str(e)}")
+            emit({"event": "error", "error": str(e)})
+            
+        finally:
+            with self._lock:
+                self._active_dirs.discard(base_dir)
+                
+    def _check_base_dir(self, base_dir: str) -> None:
+        """
+        Check that a request generates its project inside the output directory.
+        
+        Raises:
+            ValueError: If the project directory is the output directory or outside it
+        """
+        output_dir = os.path.realpath(self.batch_runner.output_dir)
+        project_dir = os.path.realpath(base_dir)
+        if project_dir == output_dir or os.path.commonpath([output_dir, project_dir]) != output_dir:
+            raise ValueError(f"request: the project directory must be inside {output_dir}")
+            
+    def _generate(self, entry: Dict[str, Any], emit: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+        """Run the generation of an accepted request."""
+        def on_task_event(kind: str, task) -> None:
+            event = {"event": "task", "task": task.name, "status": task.status if kind == "finished" else "running"}
+            if kind == "finished":
+                event["duration"] = task.duration
+            emit(event)
+            
+        project_generator = ProjectGenerator(config_manager=self.config_manager, **self.components)
+        options = entry["options"]
+        success = project_generator.create_project_structure(
+            entry["base_dir"],
+            entry["choices"],
+            generate_hello_world=options["generate_hello_world"],
+            verbose=False,
+            jobs=options["jobs"],
+            fail_fast=options["fail_fast"],
+            fast_commit=options["fast_commit"],
+            install_slots=self._install_slots,
+            on_task_event=on_task_event
+        )
+        return {"status": generation_status(success, project_generator.module_results),
+                "modules": project_generator.module_results}
+        
+    def serve_forever(self) -> None:
+        """
+        Listen on the socket and serve requests until shutdown() is called.
+        
+        Raises:
+            RuntimeError: If another server is already listening on the socket
+        """
+        if os.path.exists(self.socket_path):
+            # A socket file left by a server that did not exit cleanly is replaced
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(self.socket_path)
+                raise RuntimeError(f"A server is already listening on {self.socket_path}")
+            except (ConnectionRefusedError, FileNotFoundError):
+                os.unlink(self.socket_path)
+            finally:
+                probe.close()
+                
+        os.makedirs(os.path.dirname(self.socket_path), exist_ok=True)
+        # Requests run arbitrary installation commands: only the owner may connect, from the moment
+        # the socket exists
+        umask = os.umask(0o077)
+        try:
+            self._server = _UnixServer(self.socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+        self._server.generation_server = self
+        try:
+            self.logger.info(f"Listening on {self.socket_path} ({self.max_projects} project(s) and "
+                             f"{self.max_installs or 'unlimited'} installation(s) at once)")
+            self.ready.set()
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self.ready.clear()
+            
+    def shutdown(self) -> None:
+        """Stop serve_forever(), waiting for it to return. Must be called from another thread."""
+        if self._server:
+            self._server.shutdown()
+
+def send_request(socket_path: str, request: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """
+    Send a generation request to a server and yield its events.
+    
+    Args:
+        socket_path: Path of the server's Unix socket
+        request: The request, e.g. {"name": "billing", "choices": {...}, "options": {...}}
+        
+    Yields:
+        The events of the request, up to its "done" or "error" event
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall((json.dumps(request) + "\n").encode())
+        with client.makefile("r") as events:
+            for line in events:
+                event = json.loads(line)
+                yield event
+                if event["event"] in ("done", "error"):
+                    return
@@ -0,0 +1,191 @@
+"""
+Module installing modules speculatively while the user is still answering the prompts.
+
+Once a module's language and framework are chosen, nothing asked afterwards
+changes how it installs, so its installation starts right away in a staging
+directory next to the project. When the generation runs, each staged module is
+moved into the project instead of being installed again; if the prompts are
+cancelled, the running installations are terminated and the staging directory
+is discarded.
+
+With --js-workspace, JavaScript modules are staged without their dependencies,
+which the workspace installs at the root; a module that ends up outside of a
+workspace (the only JavaScript module) is then installed normally.
+"""
+import os
+import shutil
+import logging
+import tempfile
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
+
+from .project_generator import ProjectGenerator
+from ..utils.command_runner import CommandRunner
+from ..utils.golden_venv import find_venvs, relocate_venv
+from ..utils.js_workspace import WORKSPACE_LANGUAGES
+
+# Name prefix of the threads running speculative installations
+THREAD_PREFIX = "speculative"
+
+class BackgroundLogFilter(logging.Filter):
+    """
+    Hides the informational records of the speculative installation threads,
+    so they do not interrupt the prompts.
+    """
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Keep warnings and errors, and every record of the other threads."""
+        return record.levelno >= logging.WARNING or not record.threadName.startswith(THREAD_PREFIX)
+
+class SpeculativeInstaller:
+    """
+    Starts module installations in a staging directory as soon as their technology
+    is chosen, and moves them into the project when the generation needs them.
+    """
+    def __init__(self, project_generator: ProjectGenerator, base_dir: str, install_commands: Dict[str, Any],
+                 jobs: Optional[int] = None):
+        """
+        Initialize the SpeculativeInstaller.
+        
+        Args:
+            project_generator: The generator of the project; staged installations share its
+                               configuration, caches, run history and other components
+            base_dir: The base directory of the project
+            install_commands: Available installation commands
+            jobs: Maximum number of concurrent speculative installations (default: 4)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.project_generator = project_generator
+        self.base_dir = os.path.abspath(base_dir)
+        self.install_commands = install_commands
+        self.staging_dir: Optional[str] = None
+        self.log_filter = BackgroundLogFilter()
+        
+        command_runner = project_generator.command_runner
+        output_tail_kb = command_runner.capture_limit // 1024 if command_runner.capture_limit is not None else None
+        self.staging_generator = ProjectGenerator(
+            command_runner=CommandRunner(output_tail_kb=output_tail_kb, log_dir=command_runner.log_dir, quiet=True,
+                                         ecosystem_caches=command_runner.ecosystem_caches),
+            scaffold_cache=project_generator.scaffold_cache,
+            config_manager=project_generator.config_manager,
+            venv_manager=project_generator.venv_manager,
+            package_store=project_generator.package_store,
+            run_history=project_generator.run_history,
+            trash=project_generator.trash,
+            accelerator=project_generator.accelerator,
+            js_workspace=project_generator.js_workspace
+        )
+        self._executor = ThreadPoolExecutor(max_workers=jobs or 4, thread_name_prefix=THREAD_PREFIX)
+        self._staged: Dict[str, Tuple[Dict[str, Any], bool, Future]] = {}
+        self._filtered_handlers: List[logging.Handler] = []
+        self._lock = threading.Lock()
+        
+    def start(self, module: str, choice: Dict[str, Any]) -> None:
+        """
+        Start installing a module in the staging directory. Used as the on_choice
+        callback of UserInterface.prompt_user.
+        
+        Args:
+            module: The module type (backend, frontend-web, etc.)
+            choice: The technology chosen for the module
+        """
+        if module == "database" or "language" not in choice or "framework" not in choice:
+            return
+            
+        with self._lock:
+            if module in self._staged:
+                return
+            if self.staging_dir is None:
+                parent_dir = os.path.dirname(self.base_dir)
+                os.makedirs(parent_dir, exist_ok=True)
+                # Next to the project, so staged modules are moved into it with a rename
+                self.staging_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(self.base_dir)}-staging-",
+                                                    dir=parent_dir)
+                self._hide_background_logs()
+                
+            self.logger.info(f"Speculatively installing {choice['framework']} ({choice['language']}) in {module}")
+            workspace = self.staging_generator.js_workspace and choice["language"] in WORKSPACE_LANGUAGES
+            future = self._executor.submit(self.staging_generator.initialize_project, self.staging_dir, module,
+                                           choice, self.install_commands, False, workspace=workspace)
+            self._staged[module] = (dict(choice), workspace, future)
+            
+    def commit(self, module: str, choice: Dict[str, Any], workspace: bool = False) -> Optional[bool]:
+        """
+        Wait for a module's speculative installation and move it into the project.
+        
+        Args:
+            module: The module type
+            choice: The final technology choice for the module
+            workspace: Whether the module joins the JavaScript workspace of the project
+            
+        Returns:
+            Whether the staged installation succeeded, or None if the module was not
+            staged with this choice and must be installed normally
+        """
+        staged = self._staged.get(module)
+        if staged is None or staged[0] != choice or staged[1] != workspace:
+            return None
+        self._show_background_logs()
+        
+        try:
+            if not staged[2].result():
+                self.logger.error(f"The speculative installation of {module} failed")
+                return False
+                
+            source_dir = os.path.join(self.staging_dir, module)
+            target_dir = os.path.join(self.base_dir, module)
+            os.makedirs(self.base_dir, exist_ok=True)
+            if os.path.lexists(target_dir):
+                shutil.rmtree(target_dir)
+            os.rename(source_dir, target_dir)
+            
+            # Virtual environments embed the absolute path they were created at
+            for relative_path in find_venvs(target_dir):
+                relocate_venv(os.path.join(target_dir, relative_path), os.path.join(source_dir, relative_path))
+            report = self.staging_generator.venv_reports.pop(module, None)
+            if report:
+                report["path"] = os.path.join(target_dir, os.path.relpath(report["path"], source_dir))
+                self.project_generator.venv_reports[module] = report
+            steps = self.staging_generator.step_reports.pop(module, None)
+            if steps:
+                self.project_generator.step_reports[module] = steps
+            accelerator_report = self.staging_generator.accelerator_reports.pop(module, None)
+            if accelerator_report:
+                self.project_generator.accelerator_reports[module] = accelerator_report
+                
+            self.logger.info(f"Moved the speculatively installed {module} into {self.base_dir}")
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Could not commit the speculative installation of {module}: {str(e)}")
+            return False
+            
+    def discard(self) -> None:
+        """
+        Cancel the pending installations, terminate the running ones and remove the
+        staging directory with every module that was not committed.
+        """
+        running = [future for _, _, future in self._staged.values() if not future.cancel() and not future.done()]
+        self._executor.shutdown(wait=False)
+        # Terminated commands fail their installation, which returns without starting the next command;
+        # terminating again catches a command started meanwhile
+        while running:
+            self.staging_generator.command_runner.terminate()
+            running = list(wait(running, timeout=0.5).not_done)
+        self._show_background_logs()
+        
+        if self.staging_dir:
+            shutil.rmtree(self.staging_dir, ignore_errors=True)
+            self.staging_dir = None
+            
+    def _hide_background_logs(self) -> None:
+        """Filter the console handlers of the root logger while the user is prompted."""
+        for handler in logging.getLogger().handlers:
+            if isinstance(handler, logging.StreamHandler) and not isinstance(handler, logging.FileHandler):
+                handler.addFilter(self.log_filter)
+                self._filtered_handlers.append(handler)
+                
+    def _show_background_logs(self) -> None:
+        """Remove the console filters once the prompts are over."""
+        while self._filtered_handlers:
+            self._filtered_handlers.pop().removeFilter(self.log_filter)
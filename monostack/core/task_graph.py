@@ -0,0 +1,285 @@
+"""
+Module containing a small dependency-graph scheduler used to run the
+project generation phases as soon as their inputs are ready.
+"""
+import time
+import heapq
+import threading
+import logging
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Dict, Any, List, Optional, Sequence, Tuple
+
+from ..utils.tracing import trace_span
+
+class Task:
+    """
+    A single unit of work in a TaskGraph.
+    """
+    def __init__(self, name: str, action: Callable[[], bool], dependencies: Sequence[str] = (),
+                 estimate: float = 0.1, heavy: bool = False, description: str = ""):
+        """
+        Initialize the Task.
+
+        Args:
+            name: Unique name of the task (e.g. install:backend)
+            action: Callable doing the work, returning True on success
+            dependencies: Names of the tasks that must finish before this one starts
+            estimate: Expected duration in seconds, used for the plan and critical path
+            heavy: Whether the task counts against the scheduler's job limit
+            description: Human readable description shown in the plan
+        """
+        self.name = name
+        self.action = action
+        self.dependencies = list(dependencies)
+        self.estimate = estimate
+        self.heavy = heavy
+        self.description = description
+        self.status = "pending"  # pending, running, ok, failed, cancelled
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        """Wall-clock duration of the task in seconds (0 if it never ran)."""
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+class TaskGraph:
+    """
+    Directed acyclic graph of tasks with declared dependencies.
+
+    Tasks are started as soon as all their dependencies have finished. Heavy
+    tasks (module installations) are limited by the ``jobs`` setting while
+    light tasks (file rendering) are never held back.
+    """
+    def __init__(self):
+        """Initialize an empty TaskGraph."""
+        self.logger = logging.getLogger(__name__)
+        self.tasks: Dict[str, Task] = {}
+
+    def add_task(self, name: str, action: Callable[[], bool], dependencies: Sequence[str] = (),
+                 estimate: float = 0.1, heavy: bool = False, description: str = "") -> Task:
+        """
+        Add a task to the graph. Dependencies must already be part of the graph,
+        which keeps the graph acyclic by construction.
+
+        Returns:
+            The created Task
+
+        Raises:
+            ValueError: If the name is already used or a dependency is unknown
+        """
+        if name in self.tasks:
+            raise ValueError(f"Duplicate task name: {name}")
+        for dependency in dependencies:
+            if dependency not in self.tasks:
+                raise ValueError(f"Unknown dependency '{dependency}' for task '{name}'")
+
+        task = Task(name, action, dependencies, estimate=estimate, heavy=heavy, description=description)
+        self.tasks[name] = task
+        return task
+
+    def critical_path(self) -> Tuple[List[str], float]:
+        """
+        Compute the longest chain of dependent tasks using their estimates.
+
+        Returns:
+            Tuple of the task names on the critical path and its estimated duration
+        """
+        finish: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+
+        # Insertion order is a topological order since dependencies are added first
+        for name, task in self.tasks.items():
+            slowest = max(task.dependencies, key=lambda dep: finish[dep], default=None)
+            finish[name] = task.estimate + (finish[slowest] if slowest else 0.0)
+            previous[name] = slowest
+
+        if not finish:
+            return [], 0.0
+
+        last = max(finish, key=finish.get)
+        path = []
+        current: Optional[str] = last
+        while current:
+            path.append(current)
+            current = previous[current]
+        return list(reversed(path)), finish[last]
+
+    def estimate_duration(self, jobs: Optional[int] = None) -> float:
+        """
+        Estimate the wall-clock duration of run() by simulating its schedule with the task estimates.
+
+        Args:
+            jobs: Maximum number of heavy tasks running at once (default: unlimited)
+
+        Returns:
+            Estimated duration in seconds
+        """
+        waiting = {name: set(task.dependencies) for name, task in self.tasks.items()}
+        ready = [name for name, deps in waiting.items() if not deps]
+        max_heavy = max(1, jobs or sum(1 for task in self.tasks.values() if task.heavy))
+        heavy_running = 0
+        running: List[Tuple[float, str]] = []
+        now = 0.0
+
+        while ready or running:
+            deferred = []
+            for name in sorted(ready, key=lambda name: self.tasks[name].estimate, reverse=True):
+                task = self.tasks[name]
+                if task.heavy and heavy_running >= max_heavy:
+                    deferred.append(name)
+                    continue
+                heavy_running += task.heavy
+                heapq.heappush(running, (now + task.estimate, name))
+            ready = deferred
+            if not running:
+                break
+
+            now, name = heapq.heappop(running)
+            heavy_running -= self.tasks[name].heavy
+            for dependent, deps in waiting.items():
+                if name in deps:
+                    deps.discard(name)
+                    if not deps:
+                        ready.append(dependent)
+        return now
+
+    def format_plan(self, jobs: Optional[int] = None) -> str:
+        """
+        Render the graph as a human readable execution plan.
+
+        Args:
+            jobs: Maximum number of heavy tasks running at once, used for the ETA
+
+        Returns:
+            The plan, one task per line, followed by the critical path and the ETA
+        """
+        path, total = self.critical_path()
+        width = max((len(name) for name in self.tasks), default=0)
+
+        lines = [f"Execution plan ({len(self.tasks)} tasks, * = critical path):"]
+        for name, task in self.tasks.items():
+            marker = "*" if name in path else " "
+            dependencies = ", ".join(task.dependencies) if task.dependencies else "-"
+            lines.append(f" {marker} {name:<{width}}  est. {task.estimate:>7.1f}s  after: {dependencies}")
+        lines.append(f"Critical path (est. {total:.1f}s): {' -> '.join(path)}")
+        parallelism = f"{jobs} parallel installation(s)" if jobs else "all installations in parallel"
+        lines.append(f"ETA: {self.estimate_duration(jobs):.1f}s ({parallelism})")
+        return "\n".join(lines)
+
+    def run(self, jobs: Optional[int] = None, fail_fast: bool = False,
+            heavy_slots: Optional[threading.Semaphore] = None,
+            on_event: Optional[Callable[[str, Task], None]] = None) -> bool:
+        """
+        Run every task, starting each one as soon as its dependencies are done.
+
+        A failed task does not prevent its dependents from running, unless
+        fail_fast is set, in which case no new task is started after a failure.
+
+        Args:
+            jobs: Maximum number of heavy tasks running at once (default: unlimited)
+            fail_fast: Cancel the tasks not yet started as soon as one fails
+            heavy_slots: Semaphore shared with other graphs, acquired by each heavy task
+                         before it starts, to limit heavy tasks across concurrent runs
+            on_event: Called with "started" or "finished" and the task, e.g. to report progress
+
+        Returns:
+            True if every task succeeded, False otherwise
+        """
+        waiting = {name: set(task.dependencies) for name, task in self.tasks.items()}
+        dependents: Dict[str, List[str]] = {name: [] for name in self.tasks}
+        for name, task in self.tasks.items():
+            for dependency in task.dependencies:
+                dependents[dependency].append(name)
+
+        ready = deque(name for name, deps in waiting.items() if not deps)
+        heavy_count = sum(1 for task in self.tasks.values() if task.heavy)
+        max_heavy = max(1, jobs or heavy_count)
+        heavy_running = 0
+        aborted = False
+        running: Dict[Any, str] = {}
+        interrupted = threading.Event()
+
+        def release(name: str) -> None:
+            for dependent in dependents[name]:
+                waiting[dependent].discard(name)
+                if not waiting[dependent]:
+                    ready.append(dependent)
+
+        def execute(task: Task) -> bool:
+            slot = heavy_slots if task.heavy else None
+            if slot:
+                slot.acquire()
+            if interrupted.is_set():
+                if slot:
+                    slot.release()
+                return False
+            task.started_at = time.monotonic()
+            if on_event:
+                on_event("started", task)
+            try:
+                with trace_span(f"task:{task.name}", heavy=task.heavy, estimate=task.estimate) as span:
+                    success = bool(task.action())
+                    span.set_attribute("success", success)
+                    return success
+            except Exception as e:
+                self.logger.error(f"Task {task.name} raised an error: {str(e)}")
+                return False
+            finally:
+                task.finished_at = time.monotonic()
+                if slot:
+                    slot.release()
+
+        with ThreadPoolExecutor(max_workers=max(1, len(self.tasks)), thread_name_prefix="monostack-task") as executor:
+            try:
+                while ready or running:
+                    deferred = deque()
+                    # Longest expected tasks first, so the slowest installations are never started last
+                    candidates = sorted(ready, key=lambda name: self.tasks[name].estimate, reverse=True)
+                    ready.clear()
+                    for name in candidates:
+                        task = self.tasks[name]
+                        if aborted:
+                            task.status = "cancelled"
+                            release(name)
+                        elif task.heavy and heavy_running >= max_heavy:
+                            deferred.append(name)
+                        else:
+                            task.status = "running"
+                            heavy_running += task.heavy
+                            running[executor.submit(execute, task)] = name
+                            self.logger.debug(f"Started task {name}")
+                    ready.extend(deferred)
+
+                    if not running:
+                        continue
+
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        name = running.pop(future)
+                        task = self.tasks[name]
+                        heavy_running -= task.heavy
+                        task.status = "ok" if future.result() else "failed"
+                        self.logger.debug(f"Task {name} finished with status {task.status} in {task.duration:.1f}s")
+                        if on_event:
+                            on_event("finished", task)
+                        if task.status == "failed":
+                            if fail_fast:
+                                self.logger.error(f"Task {name} failed, cancelling remaining tasks")
+                                aborted = True
+                            else:
+                                self.logger.warning(f"Task {name} failed, continuing with other tasks")
+                        release(name)
+            except KeyboardInterrupt:
+                # Commands run in their own process groups, which the terminal's Ctrl-C does not reach,
+                # and leaving this block waits for the running tasks
+                from ..utils.async_command_runner import AsyncCommandRunner
+
+                interrupted.set()
+                AsyncCommandRunner.terminate_all()
+                raise
+
+        return all(task.status == "ok" for task in self.tasks.values())
@@ -1,7 +1,7 @@
 import os
 import logging
 import sys
-from typing import Dict, Any, List, Optional
+from typing import Callable, Dict, Any, List, Optional
 import inquirer
 from colorama import Fore, Style, init as colorama_init
 
@@ -78,12 +78,25 @@ class UserInterface:
         """Print colored text to the console."""
         print(f"{color}{text}{Style.RESET_ALL}")
     
-    def prompt_user(self, technologies: Dict[str, Any]) -> Dict[str, Any]:
+    def _notify_choice(self, on_choice: Optional[Callable[[str, Dict[str, Any]], None]], module: str,
+                       user_choices: Dict[str, Any]) -> None:
+        """Pass a module's choice to the on_choice callback, never letting it break the prompts."""
+        if on_choice is None:
+            return
+        try:
+            on_choice(module, dict(user_choices[module]))
+        except Exception as e:
+            self.logger.warning(f"Could not handle the choice for {module}: {str(e)}")
+    
+    def prompt_user(self, technologies: Dict[str, Any],
+                    on_choice: Optional[Callable[[str, Dict[str, Any]], None]] = None) -> Dict[str, Any]:
         """
         Prompt the user for technology choices.
         
         Args:
             technologies: Available technology options
+            on_choice: Optional callback receiving the module and choice as soon as a
+                       module's technology is chosen, before the remaining prompts
             
         Returns:
             Dictionary of user choices
@@ -107,6 +120,7 @@ class UserInterface:
                         mobile_technologies
                     )
                     user_choices["frontend-mobile"] = {"language": mobile_language_choice, "framework": mobile_tech_choice}
+                    self._notify_choice(on_choice, "frontend-mobile", user_choices)
             
             # Web app selection
             if app_type in ["Web_App", "All"]:
@@ -120,6 +134,7 @@ class UserInterface:
                         web_technologies
                     )
                     user_choices["frontend-web"] = {"language": web_language_choice, "framework": web_tech_choice}
+                    self._notify_choice(on_choice, "frontend-web", user_choices)
             
             # Desktop app selection
             if app_type in ["Desktop_App", "All"]:
@@ -133,6 +148,7 @@ class UserInterface:
                         desktop_technologies
                     )
                     user_choices["frontend-desktop"] = {"language": desktop_language_choice, "framework": desktop_tech_choice}
+                    self._notify_choice(on_choice, "frontend-desktop", user_choices)
             
             # Backend selection
             backend_choice = self._prompt_choice("Do you want to include a backend?", ["Yes", "No"])
@@ -148,6 +164,7 @@ class UserInterface:
                         backend_technologies
                     )
                     user_choices["backend"] = {"language": language_choice, "framework": tech_choice}
+                    self._notify_choice(on_choice, "backend", user_choices)
             
             # Database selection
             db_choice = self._prompt_choice("Do you want to include a database?", ["Yes", "No"])
@@ -158,6 +175,7 @@ class UserInterface:
                 
                 if database_choice in db_choices:
                     user_choices["database"] = {"type": database_choice}
+                    self._notify_choice(on_choice, "database", user_choices)
             
             return user_choices
             
@@ -4,8 +4,14 @@ across different frameworks and languages.
 """
 import os
 import logging
+import threading
 from typing import Dict, Any, Optional
 
+from ..utils.file_index import FileIndex
+from ..utils.gitignore_generator import GitignoreGenerator
+from ..utils.gitignore_matcher import GitignoreMatcher
+from ..utils.tracing import traced
+
 class HelloWorldGenerator:
     """
     Generates Hello World examples for different backend and frontend frameworks.
@@ -13,7 +19,34 @@ class HelloWorldGenerator:
     def __init__(self):
         """Initialize the HelloWorldGenerator with a logger."""
         self.logger = logging.getLogger(__name__)
+        self.gitignore_generator = GitignoreGenerator()
+        self._file_indexes: Dict[str, FileIndex] = {}
+        self._matchers: Dict[str, GitignoreMatcher] = {}
+        self._index_lock = threading.Lock()
+    
+    def reset_file_indexes(self) -> None:
+        """Forget the file indexes of the previous run, since module directories are regenerated."""
+        with self._index_lock:
+            self._file_indexes.clear()
+            self._matchers.clear()
+    
+    def _register_module(self, directory: str, module: str, language: str, framework: str) -> None:
+        """Remember which directories to skip when indexing a module, from its .gitignore rules."""
+        matcher = self.gitignore_generator.get_matcher(directory, module, language, framework)
+        with self._index_lock:
+            self._matchers[directory] = matcher
+    
+    def _get_file_index(self, directory: str) -> FileIndex:
+        """Return the file index of a module directory, building it on first use."""
+        with self._index_lock:
+            index = self._file_indexes.get(directory)
+            if index is None:
+                index = FileIndex(directory, matcher=self._matchers.get(directory))
+                self._file_indexes[directory] = index
+                self.logger.debug(f"Indexed {len(index)} files in {directory}")
+            return index
         
+    @traced("hello_world.generate_backend", "language", "framework")
     def generate_backend(self, base_dir: str, language: str, framework: str) -> bool:
         """
         Generate a Hello World API endpoint for the specified backend framework.
@@ -28,6 +61,7 @@ class HelloWorldGenerator:
         """
         try:
             backend_dir = os.path.join(base_dir, "backend")
+            self._register_module(backend_dir, "backend", language, framework)
             
             # Create backend code based on the language and framework
             if language == "python":
@@ -54,6 +88,7 @@ class HelloWorldGenerator:
             self.logger.error(f"Error generating Hello World backend: {str(e)}")
             return False
     
+    @traced("hello_world.generate_frontend", "module", "language", "framework")
     def generate_frontend(self, base_dir: str, module: str, language: str, 
                          framework: str, backend_language: str, backend_framework: str) -> bool:
         """
@@ -72,6 +107,7 @@ class HelloWorldGenerator:
         """
         try:
             frontend_dir = os.path.join(base_dir, module)
+            self._register_module(frontend_dir, module, language, framework)
             
             # Create frontend code based on the module type, language and framework
             if module == "frontend-web":
@@ -138,17 +174,13 @@ class HelloWorldGenerator:
             main_app_file = None
             package_name = "com.example"
             
-            for root, dirs, files in os.walk(backend_dir):
-                for file in files:
-                    if file.endswith("Application.java"):
-                        main_app_file = os.path.join(root, file)
-                        rel_path = os.path.relpath(root, backend_dir)
-                        package_name = rel_path.replace(os.path.sep, ".")
-                        if package_name.startswith("src.main.java."):
-                            package_name = package_name[len("src.main.java."):]
-                        break
-                if main_app_file:
-                    break
+            application_files = self._get_file_index(backend_dir).glob("*Application.java")
+            if application_files:
+                main_app_file = application_files[0]
+                rel_path = os.path.relpath(os.path.dirname(main_app_file), backend_dir)
+                package_name = rel_path.replace(os.path.sep, ".")
+                if package_name.startswith("src.main.java."):
+                    package_name = package_name[len("src.main.java."):]
             
             # Create controllers directory if it doesn't exist
             controller_dir = os.path.join(backend_dir, "src", "main", "java", *package_name.split("."), "controllers")
@@ -781,8 +813,5 @@ This React Native application fetches data from the {backend_framework} backend'
             return False
     
     def _find_file(self, directory: str, filename: str) -> Optional[str]:
-        """Find a file in the directory structure"""
-        for root, dirs, files in os.walk(directory):
-            if filename in files:
-                return os.path.join(root, filename)
-        return None
\ No newline at end of file
+        """Find a file in the directory structure using the module's file index"""
+        return self._get_file_index(directory).find(filename)
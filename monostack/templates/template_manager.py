@@ -1,9 +1,22 @@
 import os
 import logging
-import yaml
+import functools
 from string import Template
 from typing import Dict, Any, Optional
 
+@functools.lru_cache(maxsize=8)
+def parse_docker_compose_template(template: str) -> Dict[str, Any]:
+    """
+    Parse a Docker Compose template, once per distinct template text.
+    
+    Long-running processes render the same template for every project; the
+    result is shared, so callers must copy what they modify.
+    """
+    # PyYAML is only needed here, so it is not imported with the module
+    import yaml
+    
+    return yaml.safe_load(template)
+
 class TemplateManager:
     """
     Manages templates for installation commands and Docker Compose files.
@@ -19,13 +32,16 @@ class TemplateManager:
         self.logger = logging.getLogger(__name__)
         self.template_dir = template_dir or os.path.dirname(__file__)
     
-    def render_install_command(self, command_template: str, variables: Dict[str, Any]) -> str:
+    def render_install_command(self, command_template: str, variables: Dict[str, Any],
+                               accelerator=None, warm: bool = False) -> str:
         """
         Render an installation command template with the given variables.
         
         Args:
             command_template: The command template string
             variables: Dictionary of variables to substitute in the template
+            accelerator: Optional Accelerator adding the flags of its ecosystem profiles
+            warm: Whether the same installation already succeeded, enabling the warm-cache flags
             
         Returns:
             Rendered command string
@@ -61,6 +77,9 @@ class TemplateManager:
                 except Exception as e:
                     self.logger.error(f"Template substitution failed: {e}")
                 
+            if accelerator is not None:
+                rendered_command = accelerator.accelerate(rendered_command, warm)
+                
             self.logger.debug(f"Final rendered command: {rendered_command}")
             return rendered_command
         except KeyError as e:
@@ -81,9 +100,11 @@ class TemplateManager:
         Returns:
             Rendered Docker Compose file content
         """
+        import yaml
+        
         try:
             # Parse the template as YAML
-            docker_config = yaml.safe_load(template)
+            docker_config = parse_docker_compose_template(template)
             
             # Start with the basic structure
             result = {
@@ -0,0 +1,182 @@
+"""
+Module adding speed-oriented flags and environment variables to installation commands.
+
+With --accelerate, the package managers of an installation run with a profile
+per ecosystem, which skips work that does not change the generated module:
+
+- npm: ``--no-audit --no-fund --prefer-offline``, also for the npm runs of npx scaffolders
+- pip: ``--disable-pip-version-check --no-compile``
+- maven: parallel builds (``-T 1C``), offline (``-o``) once the same installation
+  succeeded and the local repository is warm
+- cargo: a target directory shared by every module, and sccache when installed
+- go: ``GOFLAGS=-mod=mod`` and an explicitly shared module cache
+- composer: ``--prefer-dist`` and an explicitly shared download cache
+- dotnet: no telemetry, logo or first-run experience
+"""
+import os
+import re
+import shutil
+import logging
+from typing import Any, Dict, List, Optional
+
+from .cache_dir import get_cache_dir
+from .package_store import NPM_INSTALL_PATTERN, PIP_INSTALL_PATTERN
+from .toolchain import ToolchainProber
+
+MVN_PATTERN = re.compile(r"\bmvn\b(?P<args>[^&;|]*)")
+COMPOSER_PATTERN = re.compile(r"\bcomposer\s+(?:create-project|require|install|update)\b(?P<args>[^&;|]*)")
+
+# Executables whose runs use each ecosystem's package manager
+ECOSYSTEM_EXECUTABLES = {
+    "npm": {"npm", "npx", "pnpm", "ionic", "cordova"},
+    "pip": {"pip", "pip3"},
+    "maven": {"mvn"},
+    "cargo": {"cargo", "create-tauri-app"},
+    "go": {"go"},
+    "composer": {"composer"},
+    "dotnet": {"dotnet"},
+}
+
+# Flags added to the matching invocations, by ecosystem
+ECOSYSTEM_FLAGS = {
+    "npm": [(NPM_INSTALL_PATTERN, ["--no-audit", "--no-fund", "--prefer-offline"])],
+    "pip": [(PIP_INSTALL_PATTERN, ["--disable-pip-version-check", "--no-compile"])],
+    "maven": [(MVN_PATTERN, ["-T", "1C"])],
+    "composer": [(COMPOSER_PATTERN, ["--prefer-dist"])],
+}
+
+ECOSYSTEMS = list(ECOSYSTEM_EXECUTABLES)
+
+class Accelerator:
+    """
+    Rewrites installation commands and builds their environment for the selected ecosystem profiles.
+    """
+    def __init__(self, ecosystems: Optional[List[str]] = None, maven_repository: Optional[str] = None):
+        """
+        Initialize the Accelerator.
+        
+        Args:
+            ecosystems: Ecosystems to accelerate (default: all of them)
+            maven_repository: Local Maven repository (default: ~/.m2/repository)
+            
+        Raises:
+            ValueError: If an ecosystem is unknown
+        """
+        self.logger = logging.getLogger(__name__)
+        self.ecosystems = list(ecosystems or ECOSYSTEMS)
+        unknown = [ecosystem for ecosystem in self.ecosystems if ecosystem not in ECOSYSTEM_EXECUTABLES]
+        if unknown:
+            raise ValueError(f"Unknown ecosystem(s): {', '.join(unknown)} (choose from {', '.join(ECOSYSTEMS)})")
+        self.maven_repository = maven_repository or os.path.join(os.path.expanduser("~"), ".m2", "repository")
+        self.toolchain_prober = ToolchainProber()
+        
+    def used_ecosystems(self, command: str) -> List[str]:
+        """Return the selected ecosystems whose package managers a command runs."""
+        executables = set(self.toolchain_prober.executables(command))
+        return [ecosystem for ecosystem in self.ecosystems if executables & ECOSYSTEM_EXECUTABLES[ecosystem]]
+        
+    def accelerate(self, command: str, warm: bool = False) -> str:
+        """
+        Add the flags of the selected profiles to a rendered installation command.
+        
+        Args:
+            command: The rendered installation command
+            warm: Whether the same installation already succeeded on this machine, so
+                  the dependencies it needs are in the local caches
+                  
+        Returns:
+            The command with the flags its invocations do not already have
+        """
+        for ecosystem in self.used_ecosystems(command):
+            for pattern, flags in ECOSYSTEM_FLAGS.get(ecosystem, []):
+                if ecosystem == "maven" and self._maven_offline(warm):
+                    flags = flags + ["-o"]
+                command = pattern.sub(lambda match: self._add_flags(match, flags), command)
+        return command
+        
+    def environment(self, command: str) -> Dict[str, str]:
+        """
+        Return the environment variables of the selected profiles a command needs.
+        
+        Args:
+            command: The rendered installation command
+            
+        Returns:
+            Variables to add to the environment of the command
+        """
+        environment = {}
+        for ecosystem in self.used_ecosystems(command):
+            environment.update(self._ecosystem_environment(ecosystem))
+        return environment
+        
+    def report(self, command: str, warm: bool = False) -> Dict[str, Any]:
+        """
+        Describe the profiles applied to a command, for the run report.
+        
+        Returns:
+            Dictionary with the accelerated ecosystems, the environment variables set and
+            whether the warm-cache options (maven offline) were used
+        """
+        return {
+            "ecosystems": self.used_ecosystems(command),
+            "environment": sorted(self.environment(command)),
+            "warm": "maven" in self.used_ecosystems(command) and self._maven_offline(warm),
+        }
+        
+    def _add_flags(self, match: "re.Match", flags: List[str]) -> str:
+        """Insert the flags an invocation does not have yet after its subcommand."""
+        arguments = match.group("args")
+        missing = [flag for flag in flags if flag not in arguments.split()]
+        # -T takes a value: only add the pair when the invocation has no -T at all
+        if "-T" in arguments.split():
+            missing = [flag for flag in missing if flag != "1C"]
+        if not missing:
+            return match.group(0)
+        return f"{match.group(0)[:match.start('args') - match.start()]} {' '.join(missing)}{arguments}"
+        
+    def _maven_offline(self, warm: bool) -> bool:
+        """Return whether Maven can run offline: a previous run succeeded and filled the local repository."""
+        return warm and os.path.isdir(self.maven_repository) and bool(os.listdir(self.maven_repository))
+        
+    def _ecosystem_environment(self, ecosystem: str) -> Dict[str, str]:
+        """Return the environment variables of an ecosystem's profile."""
+        if ecosystem == "npm":
+            # Scaffolders run npm themselves, so the flags are also set through npm's configuration variables
+            return {"npm_config_audit": "false", "npm_config_fund": "false", "npm_config_prefer_offline": "true",
+                    "npm_config_update_notifier": "false"}
+        if ecosystem == "pip":
+            return {"PIP_DISABLE_PIP_VERSION_CHECK": "1"}
+        if ecosystem == "cargo":
+            environment = {"CARGO_TARGET_DIR": os.environ.get("CARGO_TARGET_DIR") or get_cache_dir("cargo-target")}
+            if shutil.which("sccache"):
+                # sccache does not cache incremental compilations
+                environment.update({"RUSTC_WRAPPER": "sccache", "CARGO_INCREMENTAL": "0"})
+            return environment
+        if ecosystem == "go":
+            # The module cache is made explicit so every module, staging directory and worker shares it
+            gopath = (os.environ.get("GOPATH") or os.path.join(os.path.expanduser("~"), "go")).split(os.pathsep)[0]
+            goflags = os.environ.get("GOFLAGS", "")
+            return {"GOFLAGS": goflags if "-mod=" in goflags else f"{goflags} -mod=mod".strip(),
+                    "GOMODCACHE": os.environ.get("GOMODCACHE") or os.path.join(gopath, "pkg", "mod")}
+        if ecosystem == "composer":
+            cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+            return {"COMPOSER_CACHE_DIR": os.environ.get("COMPOSER_CACHE_DIR") or os.path.join(cache_home, "composer")}
+        if ecosystem == "dotnet":
+            return {"DOTNET_CLI_TELEMETRY_OPTOUT": "1", "DOTNET_SKIP_FIRST_TIME_EXPERIENCE": "1", "DOTNET_NOLOGO": "1"}
+        return {}
+
+def select_accelerator(value: Optional[str], maven_repository: Optional[str] = None) -> Optional[Accelerator]:
+    """
+    Create the Accelerator of an --accelerate value.
+    
+    Args:
+        value: "all" or a comma-separated list of ecosystems (e.g. "npm,maven")
+        maven_repository: Local Maven repository (default: ~/.m2/repository)
+        
+    Returns:
+        The Accelerator, or None without a value
+    """
+    if not value:
+        return None
+    return Accelerator(None if value == "all" else [name.strip() for name in value.split(",") if name.strip()],
+                       maven_repository=maven_repository)
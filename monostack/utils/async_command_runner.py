@@ -0,0 +1,286 @@
+"""
+Module providing an asyncio-based runner for external commands.
+
+Both output streams of a command are drained concurrently, so a process
+writing a lot to stderr can never stall on a full pipe, and the output of
+several processes can be multiplexed from a single event loop.
+"""
+import os
+import sys
+import codecs
+import shlex
+import signal
+import asyncio
+import logging
+import threading
+import subprocess
+from typing import Optional, Dict, List, Set, Union
+
+from .output_capture import TailBuffer
+
+# Size of the chunks read from the output pipes
+READ_CHUNK_SIZE = 64 * 1024
+
+# Seconds to wait after SIGTERM before killing a timed out process group
+KILL_GRACE_PERIOD = 5.0
+
+class CustomCompletedProcess:
+    """
+    Result of a command, compatible with subprocess.CompletedProcess.
+
+    With a capture limit, stdout and stderr only hold the tail of the output;
+    ``truncated`` tells whether anything was dropped, ``output_size`` is the
+    number of characters written to both streams and ``log_path`` points to
+    the file holding the full output, if one was written.
+    """
+    def __init__(self, args: str, returncode: int, stdout: str, stderr: str,
+                 log_path: Optional[str] = None, truncated: bool = False,
+                 output_size: Optional[int] = None):
+        self.args = args
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.log_path = log_path
+        self.truncated = truncated
+        self.output_size = output_size if output_size is not None else len(stdout) + len(stderr)
+
+def _signal_process_group(pid: int, signum: int) -> None:
+    """Send a signal to the process group led by a command, ignoring groups that are gone."""
+    try:
+        if os.name != "nt":
+            os.killpg(pid, signum)
+        else:
+            os.kill(pid, signum)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+class AsyncCommandRunner:
+    """
+    Runs shell commands with asyncio, draining stdout and stderr concurrently.
+    Each command runs in its own process group so a timeout kills the whole tree.
+
+    Process groups are out of reach of the terminal's Ctrl-C, so the running ones
+    are tracked, per runner and across runners, to be terminated on interrupt.
+    """
+    _live_pids: Set[int] = set()
+    _live_lock = threading.Lock()
+
+    def __init__(self):
+        """Initialize the AsyncCommandRunner with a logger."""
+        self.logger = logging.getLogger(__name__)
+        self._pids: Set[int] = set()
+
+    def terminate(self) -> int:
+        """
+        Terminate the process groups of the commands this runner is running.
+
+        The commands then fail, and their run() calls return or raise as usual.
+
+        Returns:
+            Number of process groups signalled
+        """
+        with self._live_lock:
+            pids = set(self._pids)
+        return self._terminate_process_groups(pids)
+
+    @classmethod
+    def terminate_all(cls) -> int:
+        """Terminate the process groups of the commands every runner of the process is running."""
+        with cls._live_lock:
+            pids = set(cls._live_pids)
+        return cls._terminate_process_groups(pids)
+
+    @classmethod
+    def _terminate_process_groups(cls, pids: Set[int]) -> int:
+        """Send SIGTERM to process groups, then SIGKILL to those still running after the grace period."""
+        for pid in pids:
+            _signal_process_group(pid, signal.SIGTERM)
+
+        def kill() -> None:
+            # A group whose command was reaped is no longer tracked, and its id may have been reused
+            with cls._live_lock:
+                remaining = pids & cls._live_pids
+            for pid in remaining:
+                _signal_process_group(pid, signal.SIGKILL)
+
+        if pids and os.name != "nt":
+            killer = threading.Timer(KILL_GRACE_PERIOD, kill)
+            killer.daemon = True
+            killer.start()
+        return len(pids)
+
+    async def run(self, command: Union[str, List[str]], cwd: Optional[str] = None,
+                  env: Optional[Dict[str, str]] = None, timeout: Optional[float] = None, check: bool = True,
+                  show_output: bool = True, label: Optional[str] = None, capture_limit: Optional[int] = None,
+                  log_path: Optional[str] = None) -> CustomCompletedProcess:
+        """
+        Run a command and wait for it to finish.
+
+        Args:
+            command: The command string to execute with the shell, or an argument
+                     list executed directly
+            cwd: Current working directory to run the command in
+            env: Environment variables for the command
+            timeout: Timeout in seconds, after which the process group is killed
+            check: Whether to raise an exception if the command fails
+            show_output: Whether to print the output in real-time
+            label: Optional prefix identifying the command's output lines (e.g. the module)
+            capture_limit: Maximum number of characters of each stream kept in memory
+            log_path: Optional file receiving the full output of both streams
+
+        Returns:
+            CustomCompletedProcess with the return code and output
+
+        Raises:
+            subprocess.CalledProcessError: If the command fails and check=True
+            subprocess.TimeoutExpired: If the command times out
+        """
+        log_file = None
+        if log_path:
+            os.makedirs(os.path.dirname(os.path.abspath(log_path)), exist_ok=True)
+            log_file = open(log_path, "w", encoding="utf-8")
+            log_file.write(f"$ {command if isinstance(command, str) else shlex.join(command)}\n")
+
+        try:
+            options = dict(cwd=cwd, env=env, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+                           start_new_session=(os.name != "nt"))
+            if isinstance(command, str):
+                process = await asyncio.create_subprocess_shell(command, **options)
+            else:
+                try:
+                    process = await asyncio.create_subprocess_exec(*command, **options)
+                except OSError as e:
+                    if cwd and e.filename == cwd:
+                        raise
+                    # Report a missing or non-executable program like the shell would
+                    error = f"{command[0]}: {e.strerror}\n"
+                    if log_file is not None:
+                        log_file.write(error)
+                    result = CustomCompletedProcess(command, 127 if isinstance(e, FileNotFoundError) else 126,
+                                                    "", error, log_path=log_path)
+                    if check:
+                        raise subprocess.CalledProcessError(result.returncode, command, "", error)
+                    return result
+
+            with self._live_lock:
+                self._pids.add(process.pid)
+                self._live_pids.add(process.pid)
+            stdout = TailBuffer(capture_limit, log_file)
+            stderr = TailBuffer(capture_limit, log_file)
+            prefix = f"[{label}] " if label else ""
+
+            try:
+                await asyncio.wait_for(
+                    asyncio.gather(
+                        self._drain(process.stdout, stdout, f"{prefix}>> " if show_output else None),
+                        self._drain(process.stderr, stderr, f"{prefix}!! " if show_output else None),
+                        process.wait()
+                    ),
+                    timeout=timeout
+                )
+            except asyncio.TimeoutError:
+                await self._kill_process_group(process)
+                raise subprocess.TimeoutExpired(command, timeout, stdout.getvalue(), stderr.getvalue())
+            except asyncio.CancelledError:
+                await self._kill_process_group(process)
+                raise
+            finally:
+                with self._live_lock:
+                    self._pids.discard(process.pid)
+                    self._live_pids.discard(process.pid)
+        finally:
+            if log_file is not None:
+                log_file.close()
+
+        result = CustomCompletedProcess(command, process.returncode, stdout.getvalue(), stderr.getvalue(),
+                                        log_path=log_path, truncated=stdout.truncated or stderr.truncated,
+                                        output_size=stdout.total_chars + stderr.total_chars)
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(result.returncode, command, result.stdout, result.stderr)
+        return result
+
+    async def run_many(self, commands: Dict[str, str], cwd: Optional[str] = None,
+                       env: Optional[Dict[str, str]] = None, timeout: Optional[float] = None,
+                       show_output: bool = True, limit: Optional[int] = None) -> Dict[str, CustomCompletedProcess]:
+        """
+        Run several labelled commands concurrently from the current event loop.
+
+        Commands never raise on a non-zero exit code here; check the returncode of
+        each result instead. A timed out command gets the return code -9.
+
+        Args:
+            commands: Dictionary mapping a label (e.g. the module) to its command
+            cwd: Current working directory to run the commands in
+            env: Environment variables for the commands
+            timeout: Timeout in seconds for each command
+            show_output: Whether to print the output in real-time
+            limit: Maximum number of commands running at once (default: unlimited)
+
+        Returns:
+            Dictionary mapping each label to its CustomCompletedProcess
+        """
+        semaphore = asyncio.Semaphore(limit or max(1, len(commands)))
+
+        async def run_one(label: str, command: str) -> CustomCompletedProcess:
+            async with semaphore:
+                try:
+                    return await self.run(command, cwd=cwd, env=env, timeout=timeout, check=False,
+                                          show_output=show_output, label=label)
+                except subprocess.TimeoutExpired as e:
+                    self.logger.error(f"Command timed out after {timeout} seconds: {command}")
+                    return CustomCompletedProcess(command, -9, e.output or "", e.stderr or "")
+
+        labels = list(commands)
+        results = await asyncio.gather(*(run_one(label, commands[label]) for label in labels))
+        return dict(zip(labels, results))
+
+    async def _drain(self, stream: Optional[asyncio.StreamReader], sink: TailBuffer,
+                     prefix: Optional[str]) -> None:
+        """Read a stream to EOF, storing its text and printing complete lines with a prefix."""
+        if stream is None:
+            return
+
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        pending = ""
+        while True:
+            chunk = await stream.read(READ_CHUNK_SIZE)
+            text = decoder.decode(chunk, final=not chunk)
+            if text:
+                sink.write(text)
+                if prefix is not None:
+                    lines = (pending + text).split("\n")
+                    pending = lines.pop()
+                    for line in lines:
+                        print(f"{prefix}{line}")
+            if not chunk:
+                break
+
+        if prefix is not None and pending:
+            print(f"{prefix}{pending}")
+        sys.stdout.flush()
+
+    async def _kill_process_group(self, process: asyncio.subprocess.Process) -> None:
+        """Terminate a process and all its children, killing them if they do not exit in time."""
+        self.logger.warning(f"Terminating process group of pid {process.pid}")
+        try:
+            if os.name != "nt":
+                # Children may outlive the shell, so signal the group even if the shell has exited
+                os.killpg(process.pid, signal.SIGTERM)
+            elif process.returncode is None:
+                process.terminate()
+        except ProcessLookupError:
+            return
+
+        try:
+            await asyncio.wait_for(process.wait(), timeout=KILL_GRACE_PERIOD)
+        except asyncio.TimeoutError:
+            pass
+
+        try:
+            if os.name != "nt":
+                os.killpg(process.pid, signal.SIGKILL)
+            elif process.returncode is None:
+                process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
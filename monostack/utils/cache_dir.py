@@ -0,0 +1,23 @@
+"""
+Module locating the directory where monostack keeps its local caches.
+"""
+import os
+
+def get_cache_dir(*parts: str) -> str:
+    """
+    Return a path inside the monostack cache directory.
+
+    The cache directory is $MONOSTACK_CACHE_DIR if set, otherwise
+    $XDG_CACHE_HOME/monostack (~/.cache/monostack by default).
+
+    Args:
+        parts: Optional sub-path components inside the cache directory
+
+    Returns:
+        Absolute path (not created)
+    """
+    root = os.environ.get("MONOSTACK_CACHE_DIR")
+    if not root:
+        xdg_cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        root = os.path.join(xdg_cache, "monostack")
+    return os.path.abspath(os.path.join(root, *parts))
@@ -1,129 +1,171 @@
 import subprocess
 import logging
+import asyncio
+import itertools
+import tempfile
+import time
 import os
-from typing import Optional, List, Dict, Union
+import shlex
+from contextlib import nullcontext
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict, Union, Awaitable, ContextManager, TypeVar
+
+from .async_command_runner import AsyncCommandRunner, CustomCompletedProcess
+from .ecosystem_caches import EcosystemCaches
+from .tracing import current_span, traced
+
+T = TypeVar("T")
 
 class CommandRunner:
     """
     A utility class to safely run external commands with proper error handling.
     Replaces os.system with subprocess for better security and control.
     """
-    def __init__(self):
-        """Initialize the CommandRunner with a logger."""
+    def __init__(self, output_tail_kb: Optional[int] = None, log_dir: Optional[str] = None,
+                 quiet: bool = False, ecosystem_caches: Optional[EcosystemCaches] = None):
+        """
+        Initialize the CommandRunner.
+        
+        Args:
+            output_tail_kb: Only keep the last N KB of each output stream in memory and
+                write the full output to a per-command log file
+            log_dir: Directory for the per-command log files (default: a monostack-logs
+                directory in the system temp directory when output_tail_kb is set)
+            quiet: Never print to the console (e.g. for commands running while the user is prompted)
+            ecosystem_caches: Shared package caches the package managers of every command are pointed at
+        """
         self.logger = logging.getLogger(__name__)
+        self.async_runner = AsyncCommandRunner()
+        self.capture_limit = output_tail_kb * 1024 if output_tail_kb is not None else None
+        self.log_dir = log_dir
+        if self.capture_limit is not None and not self.log_dir:
+            self.log_dir = os.path.join(tempfile.gettempdir(), "monostack-logs")
+        self.quiet = quiet
+        self.ecosystem_caches = ecosystem_caches
+        self._log_counter = itertools.count(1)
     
-    def run(self, command: str, cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None,
+    def _next_log_path(self, label: Optional[str]) -> Optional[str]:
+        """Return a unique log file path for the next command, if logging to files is enabled."""
+        if not self.log_dir:
+            return None
+        name = (label or "command").replace(os.sep, "_")
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        return os.path.join(self.log_dir, f"{stamp}-{os.getpid()}-{next(self._log_counter):03d}-{name}.log")
+    
+    def _run_coroutine(self, coroutine: Awaitable[T]) -> T:
+        """
+        Run a coroutine to completion from synchronous code.
+        
+        When called from a thread that already runs an event loop, the coroutine
+        is run on a fresh loop in a helper thread instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+        
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coroutine).result()
+    
+    def terminate(self) -> int:
+        """Terminate the process groups of the commands this runner is running, returning their number."""
+        return self.async_runner.terminate()
+    
+    @traced("command", "command", "label")
+    def run(self, command: Union[str, List[str]], cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None,
             timeout: Optional[int] = None, check: bool = True, 
-            show_output: bool = True) -> subprocess.CompletedProcess:
+            show_output: bool = True, label: Optional[str] = None) -> CustomCompletedProcess:
         """
-        Run a shell command with subprocess and handle errors appropriately.
+        Run a command with subprocess and handle errors appropriately.
         
         Args:
-            command: The command string to execute
+            command: The command string to execute with the shell, or an argument list
+                     executed directly (an installation step)
             cwd: Current working directory to run the command in
             env: Environment variables for the command
             timeout: Timeout in seconds for the command
             check: Whether to raise an exception if the command fails
             show_output: Whether to show output in real-time (for long-running commands)
+            label: Optional prefix for the output lines, to tell concurrent commands apart
             
         Returns:
-            CompletedProcess instance with return code and output
+            CustomCompletedProcess instance with return code and output
             
         Raises:
             subprocess.CalledProcessError: If the command fails and check=True
-            subprocess.TimeoutExpired: If the command times out
+            subprocess.TimeoutExpired: If the command times out (its process group is killed)
         """
+        display = command if isinstance(command, str) else shlex.join(command)
         try:
-            self.logger.info(f"Running command: {command}")
-            print(f"\n⚙️  Executing: {command}")
+            current_span().set_attribute("command", display)
+            self.logger.info(f"Running command: {display}")
+            show_output = show_output and not self.quiet
+            self._print(f"\n⚙️  Executing: {display}")
             
-            if show_output:
-                # Run with real-time output
-                process = subprocess.Popen(
+            if show_output and not label:
+                print("\n--- Command Output ---")
+            
+            with self._shared_caches(display, env) as env:
+                # Both output streams are drained concurrently by the async runner
+                result = self._run_coroutine(self.async_runner.run(
                     command,
-                    shell=True,
                     cwd=cwd,
                     env=env,
-                    text=True,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    bufsize=1,
-                    universal_newlines=True
-                )
-                
-                stdout = []
-                stderr = []
-                
-                # Print output in real-time
-                print("\n--- Command Output ---")
-                for line in process.stdout:
-                    print(f">> {line}", end='')  # Add prefix for better visibility
-                    stdout.append(line)
-                
-                # Get the return code
-                process.wait()
-                
-                # Collect any stderr after process completion
-                if process.stderr:
-                    print("\n--- Error Output ---")
-                    for line in process.stderr:
-                        print(f"!! {line}", end='')  # Add prefix for errors
-                        stderr.append(line)
-                
-                # Create a CompletedProcess-like object
-                class CustomCompletedProcess:
-                    def __init__(self, returncode, stdout, stderr):
-                        self.returncode = returncode
-                        self.stdout = ''.join(stdout)
-                        self.stderr = ''.join(stderr)
-                
-                result = CustomCompletedProcess(process.returncode, ''.join(stdout), ''.join(stderr))
-                
-                if check and result.returncode != 0:
-                    raise subprocess.CalledProcessError(result.returncode, command, 
-                                                       result.stdout, result.stderr)
-            else:
-                # Use standard run for simple commands
-                result = subprocess.run(
-                    command, 
-                    shell=True, 
-                    check=check, 
-                    cwd=cwd, 
-                    env=env, 
                     timeout=timeout,
-                    text=True,
-                    capture_output=True
-                )
+                    check=check,
+                    show_output=show_output,
+                    label=label,
+                    capture_limit=self.capture_limit,
+                    log_path=self._next_log_path(label)
+                ))
+            
+            span = current_span()
+            span.set_attribute("returncode", result.returncode)
+            span.set_attribute("output_size", result.output_size)
             
             # Log results
             if result.returncode == 0:
-                print(f"\n✅ Command completed successfully")
-                self.logger.debug(f"Command completed successfully: {command}")
+                self._print(f"\n✅ Command completed successfully")
+                self.logger.debug(f"Command completed successfully: {display}")
                 if result.stdout and not show_output:
                     self.logger.debug(f"Command output: {result.stdout}")
             else:
-                print(f"\n❌ Command failed with exit code {result.returncode}")
-                self.logger.warning(f"Command returned non-zero exit code {result.returncode}: {command}")
+                self._print(f"\n❌ Command failed with exit code {result.returncode}")
+                self.logger.warning(f"Command returned non-zero exit code {result.returncode}: {display}")
                 if result.stderr and not show_output:
-                    print(f"Error: {result.stderr}")
+                    self._print(f"Error: {result.stderr}")
                     self.logger.warning(f"Command error output: {result.stderr}")
+            if result.log_path:
+                self.logger.debug(f"Full command output written to {result.log_path}")
             
             return result
         
         except subprocess.CalledProcessError as e:
-            self.logger.error(f"Command failed with exit code {e.returncode}: {command}")
+            current_span().set_attribute("returncode", e.returncode)
+            self.logger.error(f"Command failed with exit code {e.returncode}: {display}")
             if e.stderr:
                 self.logger.error(f"Error output: {e.stderr}")
             raise
         
         except subprocess.TimeoutExpired as e:
-            self.logger.error(f"Command timed out after {timeout} seconds: {command}")
+            self.logger.error(f"Command timed out after {timeout} seconds: {display}")
             raise
         
         except Exception as e:
-            self.logger.error(f"Unexpected error running command '{command}': {str(e)}")
+            self.logger.error(f"Unexpected error running command '{display}': {str(e)}")
             raise
     
+    def _shared_caches(self, command: str, env: Optional[Dict[str, str]]) -> ContextManager[Optional[Dict[str, str]]]:
+        """Return the context running a command with the shared package caches, if they are enabled."""
+        if self.ecosystem_caches is None:
+            return nullcontext(env)
+        return self.ecosystem_caches.use(command, env)
+    
+    def _print(self, message: str) -> None:
+        """Print a message to the console unless the runner is quiet."""
+        if not self.quiet:
+            print(message)
+    
     def create_virtual_env(self, project_path: str, venv_name: str = "venv") -> bool:
         """
         Create a virtual environment in the specified project directory.
@@ -136,11 +178,8 @@ class CommandRunner:
             True if successful, False otherwise
         """
         try:
-            venv_path = os.path.join(project_path, venv_name)
-            self.logger.info(f"Creating virtual environment at {venv_path}")
-            
-            result = self.run(f"python -m virtualenv {venv_path}", cwd=project_path)
-            return result.returncode == 0
+            from .venv_manager import VenvManager
+            return VenvManager().create_venv(project_path, venv_name)
         
         except Exception as e:
             self.logger.error(f"Failed to create virtual environment: {str(e)}")
@@ -0,0 +1,333 @@
+"""
+Module sharing the package caches of every ecosystem between modules and projects.
+
+Installation commands run with their package manager's download cache pointed at
+a directory of the monostack cache, so every module, staging directory, batch
+worker and server request reuses what an earlier installation downloaded:
+
+- npm: ``npm_config_cache``
+- pip: ``PIP_CACHE_DIR``
+- cargo: ``CARGO_HOME`` (registry index and crates), with the user's config.toml
+  and credentials.toml linked into it
+- go: ``GOMODCACHE``
+- composer: ``COMPOSER_CACHE_DIR``
+- dotnet: ``NUGET_PACKAGES``
+- maven: ``-Dmaven.repo.local`` added to ``MAVEN_OPTS``
+
+The shared caches are enabled with --shared-caches; until then the package
+managers keep using their own caches (~/.npm, ~/.m2...). A variable already set
+in the environment of monostack (by the user, or by --offline for npm) is left
+alone. Installations sharing a cache run in parallel: npm, pip, cargo, go and
+NuGet lock their own caches, Composer writes its cache files atomically, and
+Maven gets its resolver's per-artifact file locks.
+
+Installations only log when they ran. `monostack cache stats` walks each cache
+once to tell hits (nothing was added to the cache during the installation) from
+misses, and reports hit rates and sizes per ecosystem.
+"""
+import os
+import json
+import time
+import logging
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent processes are not coordinated
+    fcntl = None
+
+from .accelerators import ECOSYSTEM_EXECUTABLES
+from .cache_dir import get_cache_dir
+from .toolchain import ToolchainProber
+
+# Environment variable pointing each ecosystem at its cache directory
+CACHE_VARIABLES = {
+    "npm": "npm_config_cache",
+    "pip": "PIP_CACHE_DIR",
+    "cargo": "CARGO_HOME",
+    "go": "GOMODCACHE",
+    "composer": "COMPOSER_CACHE_DIR",
+    "dotnet": "NUGET_PACKAGES",
+    "maven": "MAVEN_OPTS",
+}
+
+# Maven resolver options locking each artifact of the local repository, not the whole
+# repository, so parallel builds can share it (Maven 3.9+, ignored by older versions)
+MAVEN_LOCKING_OPTIONS = "-Daether.syncContext.named.factory=file-lock -Daether.syncContext.named.nameMapper=file-gav"
+
+# Seconds file timestamps can lag behind the installation log (they come from the
+# kernel's coarse clock, up to a tick behind)
+CLOCK_SLACK = 0.01
+
+# Files of the user's cargo home kept when CARGO_HOME points at the shared cache
+CARGO_USER_FILES = ["config.toml", "config", "credentials.toml", "credentials"]
+
+ECOSYSTEMS = list(CACHE_VARIABLES)
+
+class EcosystemCaches:
+    """
+    Points installation commands at shared package caches and records how often they hit.
+    """
+    def __init__(self, cache_root: Optional[str] = None):
+        """
+        Initialize the EcosystemCaches.
+        
+        Args:
+            cache_root: Directory of the caches (default: ~/.cache/monostack/ecosystems)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_root = cache_root or get_cache_dir("ecosystems")
+        self.locks_dir = os.path.join(self.cache_root, "locks")
+        self.stats_path = os.path.join(self.cache_root, "stats.json")
+        self.installs_path = os.path.join(self.cache_root, "installs.jsonl")
+        self.reading_path = os.path.join(self.cache_root, "installs.reading.jsonl")
+        self.toolchain_prober = ToolchainProber()
+        
+    def path(self, ecosystem: str) -> str:
+        """Return the shared cache directory of an ecosystem."""
+        return os.path.join(self.cache_root, ecosystem)
+        
+    def location(self, ecosystem: str) -> Optional[str]:
+        """Return the shared cache directory of an ecosystem, or None if the environment overrides it."""
+        return None if self._overridden(ecosystem) else self.path(ecosystem)
+        
+    def used_ecosystems(self, command: str) -> List[str]:
+        """Return the ecosystems whose package managers a command runs and whose cache is shared."""
+        executables = set(self.toolchain_prober.executables(command))
+        return [ecosystem for ecosystem in ECOSYSTEMS
+                if executables & ECOSYSTEM_EXECUTABLES[ecosystem] and not self._overridden(ecosystem)]
+                
+    def environment(self, command: str, env: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Return the variables pointing the package managers of a command at the shared caches.
+        
+        Args:
+            command: The command about to run
+            env: Its environment, or None for the process environment
+            
+        Returns:
+            Variables to add to the environment of the command
+        """
+        environment = {}
+        for ecosystem in self.used_ecosystems(command):
+            if ecosystem == "maven":
+                options = (env if env is not None else os.environ).get("MAVEN_OPTS", "")
+                environment["MAVEN_OPTS"] = (f"{options} -Dmaven.repo.local={self.path(ecosystem)} "
+                                             f"{MAVEN_LOCKING_OPTIONS}").strip()
+            else:
+                environment[CACHE_VARIABLES[ecosystem]] = self.path(ecosystem)
+        return environment
+        
+    @contextmanager
+    def use(self, command: str, env: Optional[Dict[str, str]] = None) -> Iterator[Optional[Dict[str, str]]]:
+        """
+        Prepare the environment of a command and record when it used the shared caches.
+        
+        Nothing is measured while the command runs: its time window is appended to the
+        installation log, which stats() compares with the content of the caches.
+        
+        Args:
+            command: The command about to run
+            env: Its environment, or None to inherit the process environment
+            
+        Yields:
+            The environment of the command, None still meaning the process environment
+        """
+        ecosystems = self.used_ecosystems(command)
+        if not ecosystems:
+            yield env
+            return
+            
+        for ecosystem in ecosystems:
+            self._prepare(ecosystem)
+        start = time.time()
+        try:
+            # The shared caches replace the accelerator's defaults, but not the user's variables
+            yield dict(env if env is not None else os.environ, **self.environment(command, env))
+        finally:
+            self._log_installs(ecosystems, start, time.time())
+            
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize the use and content of the shared caches.
+        
+        The installations logged since the last call are classified first, in a single
+        walk of each cache: an installation is a miss when files were added to the cache
+        during it, and a hit otherwise. When parallel installations overlap and the files
+        added could come from either of them, they are counted as concurrent, outside the
+        hit rate.
+        
+        Returns:
+            Dictionary with the cache root and, per ecosystem, its path, size, number of files,
+            recorded installations, hits, misses, concurrent installations, hit rate and bytes
+            downloaded into it
+        """
+        with self._lock("stats"):
+            # Installations logged from now on go to a new log; a log left by an interrupted
+            # call is classified first
+            if not os.path.exists(self.reading_path):
+                with self._lock("installs"):
+                    try:
+                        os.rename(self.installs_path, self.reading_path)
+                    except FileNotFoundError:
+                        pass
+            pending = self._load_installs()
+            recorded = self._load_stats()
+            contents = {}
+            for ecosystem in ECOSYSTEMS:
+                windows = [(install["start"], install["end"]) for install in pending
+                           if install["ecosystem"] == ecosystem]
+                contents[ecosystem] = self._scan(ecosystem, min((start for start, _ in windows), default=None))
+                if windows:
+                    self._classify(recorded.setdefault(ecosystem, {}), windows, contents[ecosystem][2])
+            if pending:
+                self._save_stats(recorded)
+                os.remove(self.reading_path)
+                
+        ecosystems = {}
+        for ecosystem in ECOSYSTEMS:
+            size, files, _ = contents[ecosystem]
+            counts = recorded.get(ecosystem, {})
+            installs = counts.get("installs", 0)
+            if not installs and not files:
+                continue
+            hits, misses = counts.get("hits", 0), counts.get("misses", 0)
+            ecosystems[ecosystem] = {
+                "path": self.path(ecosystem),
+                "size": size,
+                "files": files,
+                "installs": installs,
+                "hits": hits,
+                "misses": misses,
+                "concurrent": counts.get("concurrent", 0),
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "bytes_added": counts.get("bytes_added", 0),
+                "last_used": counts.get("last_used"),
+            }
+        return {"cache_root": self.cache_root, "ecosystems": ecosystems}
+        
+    def _overridden(self, ecosystem: str) -> bool:
+        """Return whether the environment of monostack already sets the cache of an ecosystem."""
+        if ecosystem == "maven":
+            return "-Dmaven.repo.local" in os.environ.get("MAVEN_OPTS", "")
+        return bool(os.environ.get(CACHE_VARIABLES[ecosystem]))
+        
+    def _prepare(self, ecosystem: str) -> None:
+        """Create the cache directory of an ecosystem, with the user's cargo configuration for cargo."""
+        directory = self.path(ecosystem)
+        os.makedirs(directory, exist_ok=True)
+        if ecosystem != "cargo":
+            return
+        # Registry mirrors and tokens of the user's cargo home still apply
+        user_home = os.path.join(os.path.expanduser("~"), ".cargo")
+        for name in CARGO_USER_FILES:
+            source = os.path.join(user_home, name)
+            target = os.path.join(directory, name)
+            if os.path.isfile(source) and not os.path.lexists(target):
+                try:
+                    os.symlink(source, target)
+                except OSError as e:
+                    self.logger.debug(f"Could not link {source} into the shared cargo home: {str(e)}")
+                    
+    def _scan(self, ecosystem: str, since: Optional[float]) -> Tuple[int, int, List[Tuple[float, int]]]:
+        """
+        Walk the cache of an ecosystem once.
+        
+        Returns:
+            Its size in bytes, its number of files, and the change time and size of
+            the files changed since a timestamp (none without a timestamp)
+        """
+        size = 0
+        files = 0
+        changed = []
+        for root, dirs, names in os.walk(self.path(ecosystem)):
+            for name in names:
+                try:
+                    stat = os.lstat(os.path.join(root, name))
+                except OSError:
+                    continue
+                size += stat.st_size
+                files += 1
+                # Unlike the modification time, tools cannot set the change time to a remote timestamp
+                if since is not None and stat.st_ctime >= since - CLOCK_SLACK:
+                    changed.append((stat.st_ctime, stat.st_size))
+        return size, files, changed
+        
+    def _classify(self, counts: Dict[str, Any], windows: List[Tuple[float, float]],
+                  changed: List[Tuple[float, int]]) -> None:
+        """Add logged installations to an ecosystem's counts, from the files changed during them."""
+        owned = [0] * len(windows)
+        shared = [0] * len(windows)
+        for ctime, size in changed:
+            matches = [index for index, (start, end) in enumerate(windows)
+                       if start - CLOCK_SLACK <= ctime <= end]
+            for index in matches:
+                if len(matches) == 1:
+                    owned[index] += 1
+                else:
+                    shared[index] += 1
+            if matches:
+                counts["bytes_added"] = counts.get("bytes_added", 0) + size
+                
+        for index in range(len(windows)):
+            outcome = "misses" if owned[index] else "concurrent" if shared[index] else "hits"
+            counts[outcome] = counts.get(outcome, 0) + 1
+        counts["installs"] = counts.get("installs", 0) + len(windows)
+        counts["last_used"] = max(end for _, end in windows)
+        
+    def _log_installs(self, ecosystems: List[str], start: float, end: float) -> None:
+        """Append the time window of an installation to the installation log."""
+        lines = "".join(json.dumps({"ecosystem": ecosystem, "start": start, "end": end}) + "\n"
+                        for ecosystem in ecosystems)
+        try:
+            # A single small append, so concurrent processes do not interleave their lines, and
+            # under the lock so it does not land in a log already read by stats()
+            with self._lock("installs"), open(self.installs_path, "a") as f:
+                f.write(lines)
+        except OSError as e:
+            self.logger.warning(f"Could not record the use of the shared package caches: {str(e)}")
+            
+    def _load_installs(self) -> List[Dict[str, Any]]:
+        """Return the installations of the log being read by stats()."""
+        installs = []
+        try:
+            with open(self.reading_path, "r") as f:
+                for line in f:
+                    try:
+                        installs.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        return installs
+        
+    def _load_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return the recorded statistics per ecosystem."""
+        try:
+            with open(self.stats_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+            
+    def _save_stats(self, recorded: Dict[str, Dict[str, Any]]) -> None:
+        """Replace the recorded statistics atomically."""
+        temp_path = f"{self.stats_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(recorded, f, indent=2)
+        os.replace(temp_path, self.stats_path)
+        
+    @contextmanager
+    def _lock(self, name: str) -> Iterator[None]:
+        """Hold an exclusive lock on the statistics or the installation log across processes."""
+        if fcntl is None:
+            yield
+            return
+            
+        os.makedirs(self.locks_dir, exist_ok=True)
+        with open(os.path.join(self.locks_dir, f"{name}.lock"), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
@@ -0,0 +1,72 @@
+"""
+Module copying directory trees as cheaply as the filesystem allows.
+"""
+import os
+import sys
+import errno
+import shutil
+import functools
+from typing import Iterable, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no reflinks, regular copies are used
+    fcntl = None
+
+# FICLONE ioctl request, used to create copy-on-write clones on Linux (btrfs, xfs...)
+FICLONE = 0x40049409
+
+class FileCloner:
+    """
+    Copies files with a hardlink when the caller allows it, otherwise with a
+    copy-on-write reflink, falling back to a regular copy on filesystems
+    without these features.
+    """
+    def __init__(self, hardlink_dirs: Iterable[str] = ()):
+        """
+        Initialize the FileCloner.
+        
+        Args:
+            hardlink_dirs: Names of directories whose files are never edited in place,
+                           so they can be shared through hardlinks (e.g. node_modules)
+        """
+        self.hardlink_dirs = set(hardlink_dirs)
+        self.reflink_supported = fcntl is not None and sys.platform.startswith("linux")
+        
+    def copy_file(self, source: str, destination: str, root: Optional[str] = None) -> str:
+        """
+        Copy a file, using a hardlink or reflink when possible.
+        
+        Args:
+            source: The file to copy
+            destination: The path of the copy
+            root: Directory of the copied tree; only the directories below it decide
+                  whether the file can be hardlinked (none without a root)
+            
+        Returns:
+            The destination path, as shutil.copytree copy functions do
+        """
+        if self.hardlink_dirs and root is not None and \
+                set(os.path.dirname(os.path.relpath(source, root)).split(os.sep)) & self.hardlink_dirs:
+            try:
+                os.link(source, destination)
+                return destination
+            except OSError:
+                pass
+                
+        if self.reflink_supported:
+            try:
+                with open(source, "rb") as src, open(destination, "wb") as dst:
+                    fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+                shutil.copystat(source, destination)
+                return destination
+            except OSError as e:
+                if e.errno in (errno.EOPNOTSUPP, errno.EXDEV, errno.EINVAL, errno.ENOTTY):
+                    self.reflink_supported = False
+                    
+        return shutil.copy2(source, destination)
+        
+    def copy_tree(self, source: str, destination: str) -> None:
+        """Copy a directory tree, keeping symlinks as symlinks."""
+        shutil.copytree(source, destination, symlinks=True,
+                        copy_function=functools.partial(self.copy_file, root=source))
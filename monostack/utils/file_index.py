@@ -0,0 +1,88 @@
+"""
+Module providing a one-pass index of the files of a module directory.
+"""
+import os
+import fnmatch
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+from .gitignore_matcher import GitignoreMatcher
+
+class FileIndex:
+    """
+    Index of the files below a directory, built with a single breadth-first
+    os.scandir pass that never descends into skipped or ignored directories.
+    
+    Name lookups are dictionary lookups; glob lookups only match the k distinct
+    file names instead of every path.
+    """
+    def __init__(self, root: str, skip_dirs: Iterable[str] = (), matcher: Optional[GitignoreMatcher] = None):
+        """
+        Initialize the FileIndex and scan the directory.
+        
+        Args:
+            root: The directory to index
+            skip_dirs: Names of directories not to descend into (e.g. node_modules)
+            matcher: Optional gitignore matcher rooted at root; ignored directories are not descended into
+        """
+        self.root = root
+        self.skip_dirs = set(skip_dirs) | {".git"}
+        self.matcher = matcher
+        self._paths_by_name: Dict[str, List[str]] = {}
+        self._build()
+        
+    def _build(self) -> None:
+        """Scan the directory tree breadth-first, so shallower files come first."""
+        pending = deque([(self.root, "")])
+        while pending:
+            directory, relative_dir = pending.popleft()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            relative_path = f"{relative_dir}/{entry.name}" if relative_dir else entry.name
+                            if entry.name in self.skip_dirs:
+                                continue
+                            if self.matcher is not None and self.matcher.match(relative_path, True):
+                                continue
+                            pending.append((entry.path, relative_path))
+                        else:
+                            self._paths_by_name.setdefault(entry.name, []).append(entry.path)
+            except OSError:
+                continue
+                
+    def __len__(self) -> int:
+        """Return the number of indexed files."""
+        return sum(len(paths) for paths in self._paths_by_name.values())
+        
+    def find(self, name: str) -> Optional[str]:
+        """
+        Find the shallowest file with the given name.
+        
+        Args:
+            name: The file name (e.g. App.js)
+            
+        Returns:
+            The file path, or None if no such file exists
+        """
+        paths = self._paths_by_name.get(name)
+        return paths[0] if paths else None
+        
+    def find_all(self, name: str) -> List[str]:
+        """Return every file with the given name, shallowest first."""
+        return list(self._paths_by_name.get(name, []))
+        
+    def glob(self, pattern: str) -> List[str]:
+        """
+        Find the files whose name matches a shell-style pattern.
+        
+        Args:
+            pattern: The pattern (e.g. *Application.java)
+            
+        Returns:
+            Matching file paths
+        """
+        paths = []
+        for name in fnmatch.filter(self._paths_by_name.keys(), pattern):
+            paths.extend(self._paths_by_name[name])
+        return paths
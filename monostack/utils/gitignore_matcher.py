@@ -0,0 +1,292 @@
+"""
+Module compiling .gitignore patterns into a matcher answering "is this path ignored?".
+"""
+import os
+import re
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Characters giving a pattern a wildcard meaning
+WILDCARD_CHARACTERS = "*?[\\"
+
+class GitignoreRule:
+    """
+    A compiled .gitignore pattern.
+    """
+    def __init__(self, pattern: str, negated: bool, dir_only: bool, anchored: bool):
+        """
+        Initialize the GitignoreRule.
+        
+        Args:
+            pattern: The pattern without its negation, leading slash and trailing slash
+            negated: Whether the pattern re-includes paths (!pattern)
+            dir_only: Whether the pattern only matches directories (pattern/)
+            anchored: Whether the pattern is matched against the path from the root
+                      rather than against the file name
+        """
+        self.pattern = pattern
+        self.negated = negated
+        self.dir_only = dir_only
+        self.anchored = anchored
+        self.regex = re.compile(translate_pattern(pattern))
+
+def translate_pattern(pattern: str) -> str:
+    """
+    Translate a gitignore glob into a regular expression.
+    
+    Args:
+        pattern: The glob, using *, ?, [...], ** and backslash escapes
+        
+    Returns:
+        The regular expression, to be used with fullmatch()
+    """
+    result = []
+    i = 0
+    n = len(pattern)
+    while i < n:
+        char = pattern[i]
+        if char == '*':
+            if pattern.startswith('**', i) and (i == 0 or pattern[i - 1] == '/') and (i + 2 == n or pattern[i + 2] == '/'):
+                if i + 2 == n:
+                    result.append('.*')
+                    i += 2
+                else:
+                    result.append('(?:.*/)?')
+                    i += 3
+                continue
+            while i < n and pattern[i] == '*':
+                i += 1
+            result.append('[^/]*')
+            continue
+        elif char == '?':
+            result.append('[^/]')
+        elif char == '[':
+            start = i + 2 if pattern[i + 1:i + 2] in ('!', '^') else i + 1
+            # A "]" right after "[" or "[!" is part of the class, as in git
+            end = pattern.find(']', start + 1 if pattern[start:start + 1] == ']' else start)
+            if end == -1:
+                # git matches nothing with an unterminated class (e.g. "[]" or "a[b")
+                return '(?!)'
+            body = re.sub(r'([\\\[\]^])', r'\\\1', pattern[start:end])
+            result.append(f"[^/{body}]" if start > i + 1 else f"[{body}]")
+            i = end
+        elif char == '\\' and i + 1 < n:
+            i += 1
+            result.append(re.escape(pattern[i]))
+        else:
+            result.append(re.escape(char))
+        i += 1
+    return ''.join(result)
+
+class GitignoreMatcher:
+    """
+    Matches paths against the rules of a .gitignore file, with git semantics:
+    the last matching rule wins, and nothing inside an ignored directory can be
+    re-included.
+    
+    Rules are bucketed so most lookups are dictionary hits: literal names,
+    literal paths, "*suffix" and "prefix*" rules are found by key, and only the
+    remaining patterns are matched with regular expressions.
+    """
+    def __init__(self, patterns: Iterable[str], root: str = ".", parent: Optional["GitignoreMatcher"] = None):
+        """
+        Initialize the GitignoreMatcher and compile its rules.
+        
+        Args:
+            patterns: Lines of the .gitignore file
+            root: Directory the patterns are relative to
+            parent: Matcher of an enclosing directory, consulted when no rule of this one matches
+        """
+        self.root = os.path.abspath(root)
+        self.parent = parent
+        self.prefix = os.path.relpath(self.root, parent.root).replace(os.sep, '/') if parent else ""
+        if self.prefix == '.':
+            self.prefix = ""
+        self.rules: List[GitignoreRule] = []
+        self._names: Dict[str, List[int]] = {}
+        self._paths: Dict[str, List[int]] = {}
+        self._suffixes: Dict[str, List[int]] = {}
+        self._prefixes: Dict[str, List[int]] = {}
+        self._suffix_lengths: List[int] = []
+        self._prefix_lengths: List[int] = []
+        self._generic: List[Tuple[int, GitignoreRule]] = []
+        self._ignored_dirs: Dict[str, bool] = {}
+        
+        for line in patterns:
+            self._add_rule(line)
+        self._suffix_lengths = sorted({len(key) for key in self._suffixes})
+        self._prefix_lengths = sorted({len(key) for key in self._prefixes})
+        
+    @classmethod
+    def from_file(cls, gitignore_path: str, parent: Optional["GitignoreMatcher"] = None) -> "GitignoreMatcher":
+        """
+        Compile a .gitignore file, relative to the directory containing it.
+        
+        Args:
+            gitignore_path: Path of the .gitignore file
+            parent: Matcher of an enclosing directory
+            
+        Returns:
+            The GitignoreMatcher
+        """
+        with open(gitignore_path, 'r', errors='replace') as f:
+            return cls(f.read().splitlines(), os.path.dirname(os.path.abspath(gitignore_path)), parent)
+            
+    def _add_rule(self, line: str) -> None:
+        """Compile a .gitignore line and file it in its bucket."""
+        pattern = line.rstrip('\n')
+        if not pattern.endswith('\\ '):
+            pattern = pattern.rstrip()
+        if not pattern or pattern.startswith('#'):
+            return
+            
+        negated = pattern.startswith('!')
+        if negated:
+            pattern = pattern[1:]
+        elif pattern.startswith(('\\#', '\\!')):
+            pattern = pattern[1:]
+            
+        dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        anchored = '/' in pattern
+        pattern = pattern.lstrip('/')
+        if not pattern:
+            return
+            
+        index = len(self.rules)
+        rule = GitignoreRule(pattern, negated, dir_only, anchored)
+        self.rules.append(rule)
+        
+        literal = not any(char in pattern for char in WILDCARD_CHARACTERS)
+        if literal:
+            bucket = self._paths if anchored else self._names
+            bucket.setdefault(pattern, []).append(index)
+        elif not anchored and pattern[0] == '*' and not any(char in pattern[1:] for char in WILDCARD_CHARACTERS):
+            self._suffixes.setdefault(pattern[1:], []).append(index)
+        elif not anchored and pattern[-1] == '*' and not any(char in pattern[:-1] for char in WILDCARD_CHARACTERS):
+            self._prefixes.setdefault(pattern[:-1], []).append(index)
+        else:
+            self._generic.append((index, rule))
+            
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """
+        Apply the rules to a path, ignoring its parent directories.
+        
+        Args:
+            path: Path relative to the matcher's root, with / separators
+            is_dir: Whether the path is a directory
+            
+        Returns:
+            True if the path is ignored, False if it is explicitly re-included, None if no rule matches
+        """
+        name = path.rsplit('/', 1)[-1]
+        best = -1
+        
+        candidates = []
+        candidates.extend(self._names.get(name, ()))
+        candidates.extend(self._paths.get(path, ()))
+        for length in self._suffix_lengths:
+            if length <= len(name):
+                candidates.extend(self._suffixes.get(name[len(name) - length:], ()))
+        for length in self._prefix_lengths:
+            if length <= len(name):
+                candidates.extend(self._prefixes.get(name[:length], ()))
+        for index in candidates:
+            if index > best and (is_dir or not self.rules[index].dir_only):
+                best = index
+                
+        # Regular expressions are only tried for rules after the best literal match
+        for index, rule in reversed(self._generic):
+            if index <= best:
+                break
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.regex.fullmatch(path if rule.anchored else name):
+                best = index
+                break
+                
+        if best >= 0:
+            return not self.rules[best].negated
+        if self.parent is not None:
+            return self.parent.match(f"{self.prefix}/{path}" if self.prefix else path, is_dir)
+        return None
+        
+    def is_ignored(self, path: str, is_dir: Optional[bool] = None) -> bool:
+        """
+        Check whether a path is ignored, taking its parent directories into account.
+        
+        Args:
+            path: Absolute path, or path relative to the matcher's root
+            is_dir: Whether the path is a directory (default: checked on disk)
+            
+        Returns:
+            True if git would ignore the path
+        """
+        if os.path.isabs(path):
+            path = os.path.relpath(path, self.root)
+        path = path.replace(os.sep, '/').strip('/')
+        if path in ('', '.'):
+            return False
+        if is_dir is None:
+            is_dir = os.path.isdir(os.path.join(self.root, path))
+            
+        parts = path.split('/')
+        for depth in range(1, len(parts)):
+            if self._is_dir_ignored('/'.join(parts[:depth])):
+                return True
+        return bool(self.match(path, is_dir))
+        
+    def _is_dir_ignored(self, path: str) -> bool:
+        """Check whether a directory is ignored by its own rules, caching the answer."""
+        ignored = self._ignored_dirs.get(path)
+        if ignored is None:
+            ignored = self._ignored_dirs[path] = bool(self.match(path, True))
+        return ignored
+        
+    def walk(self, top: Optional[str] = None, nested: bool = False) -> Iterator[Tuple[str, List[str], List[str]]]:
+        """
+        Walk a directory tree like os.walk, skipping ignored files and never
+        descending into ignored directories (nor .git).
+        
+        Args:
+            top: Directory to walk, inside the matcher's root (default: the root)
+            nested: Whether to also apply the .gitignore files found below the root
+            
+        Yields:
+            (dirpath, dirnames, filenames) tuples; dirnames may be pruned in place
+        """
+        top = os.path.abspath(top or self.root)
+        start = os.path.relpath(top, self.root).replace(os.sep, '/')
+        if start == '.':
+            start = ''
+        elif self.is_ignored(start, True):
+            return
+            
+        pending = [(top, start, self)]
+        while pending:
+            dirpath, relpath, matcher = pending.pop()
+            try:
+                with os.scandir(dirpath) as scanned:
+                    entries = [(entry.name, entry.is_dir(follow_symlinks=False)) for entry in scanned]
+            except OSError:
+                continue
+                
+            if nested and relpath and any(name == '.gitignore' and not is_dir for name, is_dir in entries):
+                try:
+                    matcher = GitignoreMatcher.from_file(os.path.join(dirpath, '.gitignore'), parent=matcher)
+                    relpath = ''
+                except OSError:
+                    pass
+                    
+            dirnames = []
+            filenames = []
+            for name, is_dir in entries:
+                if is_dir and name == '.git':
+                    continue
+                if matcher.match(f"{relpath}/{name}" if relpath else name, is_dir):
+                    continue
+                (dirnames if is_dir else filenames).append(name)
+                
+            yield dirpath, dirnames, filenames
+            
+            for name in reversed(dirnames):
+                pending.append((os.path.join(dirpath, name), f"{relpath}/{name}" if relpath else name, matcher))
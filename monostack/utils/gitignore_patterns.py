@@ -0,0 +1,866 @@
+"""
+Registry of the .gitignore patterns used by monostack.
+
+Patterns are grouped in named sets, each a sequence of lines in which comments
+title the sections that follow them and blank lines end a section. A template
+is the tuple of set names composing the .gitignore of a technology; the
+GitignoreGenerator merges the sets of a template, or of several templates for
+the root .gitignore, into a single file without duplicates.
+
+This module is only imported when a .gitignore is generated.
+"""
+from typing import Dict, Tuple
+
+# Named pattern sets
+PATTERN_SETS: Dict[str, Tuple[str, ...]] = {
+    "root": (
+        "# General",
+        ".DS_Store",
+        ".env",
+        ".env.local",
+        ".env.development.local",
+        ".env.test.local",
+        ".env.production.local",
+        "",
+        "# Logs",
+        "logs",
+        "*.log",
+        "npm-debug.log*",
+        "yarn-debug.log*",
+        "yarn-error.log*",
+        "",
+        "# Editor directories and files",
+        ".idea",
+        ".vscode",
+        "*.suo",
+        "*.ntvs*",
+        "*.njsproj",
+        "*.sln",
+        "*.sw?",
+        "*.sublime-*",
+        ".project",
+        "",
+        "# Deployment",
+        "/dist",
+        "/build",
+        "/out",
+        ".vercel",
+        ".netlify",
+    ),
+    "node-web": (
+        "# Dependencies",
+        "/node_modules",
+        "/.pnp",
+        ".pnp.js",
+        "/package-lock.json",
+        "/yarn.lock",
+        "/yarn-error.log",
+        "",
+        "# Testing",
+        "/coverage",
+        "",
+        "# Production",
+        "/build",
+        "/dist",
+        "/out",
+        "/.next",
+        "/.nuxt",
+        "/.svelte-kit",
+        "",
+        "# Environment variables",
+        ".env",
+        ".env.local",
+        ".env.development.local",
+        ".env.test.local",
+        ".env.production.local",
+        "",
+        "# Misc",
+        ".DS_Store",
+        ".turbo",
+        "",
+        "# Logs",
+        "npm-debug.log*",
+        "yarn-debug.log*",
+        "yarn-error.log*",
+    ),
+    "node-mobile": (
+        "# Dependencies",
+        "/node_modules",
+        "/.pnp",
+        ".pnp.js",
+        "/package-lock.json",
+        "/yarn.lock",
+        "/yarn-error.log",
+        "",
+        "# Testing",
+        "/coverage",
+        "",
+        "# Production",
+        "/build",
+        "/dist",
+        "",
+        "# Configuration",
+        ".expo/",
+        ".expo-shared/",
+        "metro.config.*",
+        "",
+        "# Generated files",
+        "*.jsbundle",
+        "*.tsbuildinfo",
+        ".DS_Store",
+        "",
+        "# Environment variables",
+        ".env",
+        ".env.local",
+        "",
+        "# Logs",
+        "npm-debug.log*",
+        "yarn-debug.log*",
+        "yarn-error.log*",
+        "",
+        "# Native",
+        "*.orig.*",
+        "*.jks",
+        "*.p8",
+        "*.p12",
+        "*.key",
+        "*.mobileprovision",
+        "*.orig.*",
+        "",
+        "# Android",
+        "/android/app/debug",
+        "/android/app/release",
+        ".gradle",
+        "local.properties",
+        "*.iml",
+        "",
+        "# iOS",
+        "/ios/Pods/",
+        "/ios/build/",
+        "*.pbxuser",
+        "!default.pbxuser",
+        "*.mode1v3",
+        "!default.mode1v3",
+        "*.mode2v3",
+        "!default.mode2v3",
+        "*.perspectivev3",
+        "!default.perspectivev3",
+        "xcuserdata",
+        "*.xccheckout",
+        "*.moved-aside",
+        "DerivedData",
+        "*.hmap",
+        "*.ipa",
+        "*.xcuserstate",
+        "project.xcworkspace",
+    ),
+    "node-desktop": (
+        "# Dependencies",
+        "/node_modules",
+        "/.pnp",
+        ".pnp.js",
+        "/package-lock.json",
+        "/yarn.lock",
+        "/yarn-error.log",
+        "",
+        "# Testing",
+        "/coverage",
+        "",
+        "# Production",
+        "/build",
+        "/dist",
+        "/out",
+        "/out-tsc",
+        "",
+        "# Generated files",
+        "/.webpack",
+        "/.quasar",
+        "",
+        "# Logs",
+        "npm-debug.log*",
+        "yarn-debug.log*",
+        "yarn-error.log*",
+        "",
+        "# OS specific",
+        ".DS_Store",
+        "desktop.ini",
+        "thumbs.db",
+        "",
+        "# Environment variables",
+        ".env",
+        ".env.local",
+    ),
+    "python-web": (
+        "# Byte-compiled / optimized / DLL files",
+        "__pycache__/",
+        "*.py[cod]",
+        "*$py.class",
+        "",
+        "# C extensions",
+        "*.so",
+        "",
+        "# Distribution / packaging",
+        ".Python",
+        "build/",
+        "develop-eggs/",
+        "dist/",
+        "downloads/",
+        "eggs/",
+        ".eggs/",
+        "lib/",
+        "lib64/",
+        "parts/",
+        "sdist/",
+        "var/",
+        "wheels/",
+        "*.egg-info/",
+        ".installed.cfg",
+        "*.egg",
+        "",
+        "# PyInstaller",
+        "*.manifest",
+        "*.spec",
+        "",
+        "# Installer logs",
+        "pip-log.txt",
+        "pip-delete-this-directory.txt",
+        "",
+        "# Unit test / coverage reports",
+        "htmlcov/",
+        ".tox/",
+        ".coverage",
+        ".coverage.*",
+        ".cache",
+        "nosetests.xml",
+        "coverage.xml",
+        "*.cover",
+        ".hypothesis/",
+        "",
+        "# Translations",
+        "*.mo",
+        "*.pot",
+        "",
+        "# Django stuff:",
+        "*.log",
+        "local_settings.py",
+        "db.sqlite3",
+        "db.sqlite3-journal",
+        "media/",
+        "",
+        "# Flask stuff:",
+        "instance/",
+        ".webassets-cache",
+        "",
+        "# Scrapy stuff:",
+        ".scrapy",
+        "",
+        "# Sphinx documentation",
+        "docs/_build/",
+        "",
+        "# PyBuilder",
+        "target/",
+        "",
+        "# Jupyter Notebook",
+        ".ipynb_checkpoints",
+        "",
+        "# pyenv",
+        ".python-version",
+        "",
+        "# celery beat schedule file",
+        "celerybeat-schedule",
+        "",
+        "# SageMath parsed files",
+        "*.sage.py",
+        "",
+        "# Environments",
+        ".env",
+        ".venv",
+        "env/",
+        "venv/",
+        "ENV/",
+        "env.bak/",
+        "venv.bak/",
+        "",
+        "# Spyder project settings",
+        ".spyderproject",
+        ".spyproject",
+        "",
+        "# Rope project settings",
+        ".ropeproject",
+        "",
+        "# mkdocs documentation",
+        "/site",
+        "",
+        "# mypy",
+        ".mypy_cache/",
+        ".dmypy.json",
+        "dmypy.json",
+        "",
+        "# Pyre type checker",
+        ".pyre/",
+    ),
+    "python-gui": (
+        "# Byte-compiled / optimized / DLL files",
+        "__pycache__/",
+        "*.py[cod]",
+        "*$py.class",
+        "",
+        "# C extensions",
+        "*.so",
+        "",
+        "# Distribution / packaging",
+        ".Python",
+        "build/",
+        "develop-eggs/",
+        "dist/",
+        "downloads/",
+        "eggs/",
+        ".eggs/",
+        "lib/",
+        "lib64/",
+        "parts/",
+        "sdist/",
+        "var/",
+        "wheels/",
+        "*.egg-info/",
+        ".installed.cfg",
+        "*.egg",
+        "",
+        "# Environments",
+        ".env",
+        ".venv",
+        "env/",
+        "venv/",
+        "ENV/",
+        "env.bak/",
+        "venv.bak/",
+        "",
+        "# Buildozer",
+        ".buildozer/",
+        "bin/",
+        "",
+        "# Briefcase",
+        "iOS/",
+        "macOS/",
+        "windows/",
+        "android/",
+        "linux/",
+    ),
+    "java": (
+        "# Compiled class file",
+        "*.class",
+        "",
+        "# Log file",
+        "*.log",
+        "",
+        "# BlueJ files",
+        "*.ctxt",
+        "",
+        "# Mobile Tools for Java (J2ME)",
+        ".mtj.tmp/",
+        "",
+        "# Package Files #",
+        "*.jar",
+        "*.war",
+        "*.nar",
+        "*.ear",
+        "*.zip",
+        "*.tar.gz",
+        "*.rar",
+        "",
+        "# virtual machine crash logs",
+        "hs_err_pid*",
+        "replay_pid*",
+        "",
+        "# Maven",
+        "target/",
+        "pom.xml.tag",
+        "pom.xml.releaseBackup",
+        "pom.xml.versionsBackup",
+        "pom.xml.next",
+        "release.properties",
+        "dependency-reduced-pom.xml",
+        "buildNumber.properties",
+        ".mvn/timing.properties",
+        ".mvn/wrapper/maven-wrapper.jar",
+        "",
+        "# Gradle",
+        ".gradle",
+        "**/build/",
+        "!src/**/build/",
+        "gradle-app.setting",
+        "!gradle-wrapper.jar",
+        ".gradletasknamecache",
+        "",
+        "# IntelliJ IDEA",
+        ".idea/",
+        "*.iws",
+        "*.iml",
+        "*.ipr",
+        "out/",
+        "!**/src/main/**/out/",
+        "!**/src/test/**/out/",
+        "",
+        "# Eclipse",
+        ".settings/",
+        ".classpath",
+        ".project",
+        ".metadata",
+        "bin/",
+        "tmp/",
+        "*.tmp",
+        "*.bak",
+        "*.swp",
+        "*~.nib",
+        ".loadpath",
+        ".recommenders",
+        "",
+        "# Spring Boot",
+        ".spring-boot-devtools",
+    ),
+    "go": (
+        "# Binaries for programs and plugins",
+        "*.exe",
+        "*.exe~",
+        "*.dll",
+        "*.so",
+        "*.dylib",
+        "",
+        "# Test binary, built with `go test -c`",
+        "*.test",
+        "",
+        "# Output of the go coverage tool, specifically when used with LiteIDE",
+        "*.out",
+        "",
+        "# Dependency directories (remove the comment below to include it)",
+        "vendor/",
+        "",
+        "# Go workspace file",
+        "go.work",
+        "",
+        "# IDE files",
+        ".idea/",
+        ".vscode/",
+        "*.iml",
+        "*.swp",
+        "*.swo",
+        "",
+        "# OS specific",
+        ".DS_Store",
+    ),
+    "php": (
+        "# Laravel/Symfony",
+        "/vendor/",
+        "node_modules/",
+        "npm-debug.log",
+        "yarn-error.log",
+        "",
+        "# Laravel specific",
+        "public/storage",
+        "public/hot",
+        "storage/*.key",
+        ".env",
+        ".env.backup",
+        "Homestead.yaml",
+        "Homestead.json",
+        "/.vagrant",
+        ".phpunit.result.cache",
+        "",
+        "# Symfony specific",
+        "/public/bundles/",
+        "/var/",
+        "/bin/*",
+        "!bin/console",
+        "!bin/symfony_requirements",
+        "/app/config/parameters.yml",
+        "/phpunit.xml",
+        "/.web-server-pid",
+        "",
+        "# Composer",
+        "composer.phar",
+        "/vendor/",
+        "",
+        "# IDE",
+        "/.idea",
+        "/.vscode",
+        "*.sublime-project",
+        "*.sublime-workspace",
+    ),
+    "ruby": (
+        "# Ruby/Rails",
+        "*.rbc",
+        "capybara-*.html",
+        ".rspec",
+        "/db/*.sqlite3",
+        "/db/*.sqlite3-journal",
+        "/db/*.sqlite3-[0-9]*",
+        "/public/system",
+        "/coverage/",
+        "/spec/tmp",
+        "*.orig",
+        "rerun.txt",
+        "pickle-email-*.html",
+        "",
+        "# Ignore all logfiles and tempfiles.",
+        "/log/*",
+        "/tmp/*",
+        "!/log/.keep",
+        "!/tmp/.keep",
+        "",
+        "# Environment configurations",
+        "/.env",
+        "/.bundle",
+        "/vendor/bundle",
+        "",
+        "# RVM",
+        ".rvmrc",
+        "",
+        "# Rails specific",
+        "/config/master.key",
+        "/config/credentials/*.key",
+        "/config/master.key",
+        "/public/packs",
+        "/public/packs-test",
+        "/public/assets",
+        "/storage/*",
+        "!/storage/.keep",
+        ".byebug_history",
+        "/node_modules",
+        "/yarn-error.log",
+        "yarn-debug.log*",
+        ".yarn-integrity",
+    ),
+    "rust": (
+        "# Generated files",
+        "/target/",
+        "**/*.rs.bk",
+        "Cargo.lock",
+        "",
+        "# These are backup files generated by rustfmt",
+        "**/*.rs.bk",
+        "",
+        "# MSVC Windows builds of rustc generate these, which store debugging information",
+        "*.pdb",
+        "",
+        "# IDE",
+        ".idea/",
+        ".vscode/",
+        "*.iml",
+    ),
+    "dart": (
+        "# Miscellaneous",
+        "*.class",
+        "*.log",
+        "*.pyc",
+        "*.swp",
+        ".DS_Store",
+        ".atom/",
+        ".buildlog/",
+        ".history",
+        ".svn/",
+        "migrate_working_dir/",
+        "",
+        "# IntelliJ related",
+        "*.iml",
+        "*.ipr",
+        "*.iws",
+        ".idea/",
+        "",
+        "# Visual Studio Code related",
+        ".classpath",
+        ".project",
+        ".settings/",
+        ".vscode/",
+        "",
+        "# Flutter/Dart/Pub related",
+        "**/doc/api/",
+        "**/ios/Flutter/.last_build_id",
+        ".dart_tool/",
+        ".flutter-plugins",
+        ".flutter-plugins-dependencies",
+        ".packages",
+        ".pub-cache/",
+        ".pub/",
+        "/build/",
+        "/windows/flutter/ephemeral/",
+        "",
+        "# Symbolication related",
+        "app.*.symbols",
+        "",
+        "# Obfuscation related",
+        "app.*.map.json",
+        "",
+        "# Android related",
+        "**/android/**/gradle-wrapper.jar",
+        "**/android/.gradle",
+        "**/android/captures/",
+        "**/android/gradlew",
+        "**/android/gradlew.bat",
+        "**/android/local.properties",
+        "**/android/**/GeneratedPluginRegistrant.java",
+        "**/android/key.properties",
+        "",
+        "# iOS/XCode related",
+        "**/ios/**/*.mode1v3",
+        "**/ios/**/*.mode2v3",
+        "**/ios/**/*.moved-aside",
+        "**/ios/**/*.pbxuser",
+        "**/ios/**/*.perspectivev3",
+        "**/ios/**/*sync/",
+        "**/ios/**/.sconsign.dblite",
+        "**/ios/**/.tags*",
+        "**/ios/**/.vagrant/",
+        "**/ios/**/DerivedData/",
+        "**/ios/**/Icon?",
+        "**/ios/**/Pods/",
+        "**/ios/**/.symlinks/",
+        "**/ios/**/profile",
+        "**/ios/**/xcuserdata",
+        "**/ios/.generated/",
+        "**/ios/Flutter/App.framework",
+        "**/ios/Flutter/Flutter.framework",
+        "**/ios/Flutter/Generated.xcconfig",
+        "**/ios/Flutter/app.flx",
+        "**/ios/Flutter/app.zip",
+        "**/ios/Flutter/flutter_assets/",
+        "**/ios/ServiceDefinitions.json",
+        "**/ios/Runner/GeneratedPluginRegistrant.*",
+    ),
+    "dotnet": (
+        "# Visual Studio files",
+        ".vs/",
+        "*.user",
+        "*.userosscache",
+        "*.suo",
+        "*.userprefs",
+        "*.dbmdl",
+        "*.dbproj.schemaview",
+        "*.jfm",
+        "*.pfx",
+        "*.publishsettings",
+        "",
+        "# Build results",
+        "[Dd]ebug/",
+        "[Dd]ebugPublic/",
+        "[Rr]elease/",
+        "[Rr]eleases/",
+        "x64/",
+        "x86/",
+        "[Ww][Ii][Nn]32/",
+        "[Aa][Rr][Mm]/",
+        "[Aa][Rr][Mm]64/",
+        "bld/",
+        "[Bb]in/",
+        "[Oo]bj/",
+        "[Ll]og/",
+        "[Ll]ogs/",
+        "",
+        "# NuGet Packages",
+        "*.nupkg",
+        "# NuGet Symbol Packages",
+        "*.snupkg",
+        "# The packages folder can be ignored because of Package Restore",
+        "**/[Pp]ackages/*",
+        "# except build/, which is used as an MSBuild target.",
+        "!**/[Pp]ackages/build/",
+        "*.nuget.props",
+        "*.nuget.targets",
+        "",
+        "# MSTest test Results",
+        "[Tt]est[Rr]esult*/",
+        "[Bb]uild[Ll]og.*",
+        "",
+        "# .NET Core",
+        "project.lock.json",
+        "project.fragment.lock.json",
+        "artifacts/",
+    ),
+    "generic-javascript": (
+        "# Dependencies",
+        "/node_modules",
+        "/.pnp",
+        ".pnp.js",
+        "",
+        "# Testing",
+        "/coverage",
+        "",
+        "# Production",
+        "/build",
+        "/dist",
+        "",
+        "# Misc",
+        ".DS_Store",
+        ".env.local",
+        ".env.development.local",
+        ".env.test.local",
+        ".env.production.local",
+        "",
+        "# Logs",
+        "npm-debug.log*",
+        "yarn-debug.log*",
+        "yarn-error.log*",
+    ),
+    "generic-python": (
+        "# Byte-compiled / optimized / DLL files",
+        "__pycache__/",
+        "*.py[cod]",
+        "*$py.class",
+        "",
+        "# Distribution / packaging",
+        "dist/",
+        "build/",
+        "*.egg-info/",
+        "",
+        "# Virtual environments",
+        "venv/",
+        "env/",
+        ".env/",
+        ".venv/",
+        "",
+        "# Unit test / coverage reports",
+        "htmlcov/",
+        ".tox/",
+        ".coverage",
+        ".coverage.*",
+        ".cache",
+        "nosetests.xml",
+        "coverage.xml",
+        "*.cover",
+        ".hypothesis/",
+        "",
+        "# Environments",
+        ".env",
+        ".env.local",
+    ),
+    "generic-java": (
+        "# Compiled class file",
+        "*.class",
+        "",
+        "# Log file",
+        "*.log",
+        "",
+        "# Package Files",
+        "*.jar",
+        "*.war",
+        "*.nar",
+        "*.ear",
+        "*.zip",
+        "*.tar.gz",
+        "*.rar",
+        "",
+        "# Maven",
+        "target/",
+        "",
+        "# Gradle",
+        ".gradle",
+        "build/",
+        "",
+        "# IDE",
+        ".idea/",
+        ".eclipse/",
+    ),
+    "generic": (
+        "# OS files",
+        ".DS_Store",
+        "Thumbs.db",
+        "Desktop.ini",
+        "",
+        "# Editor files",
+        ".vscode/",
+        ".idea/",
+        "*.swp",
+        "*.swo",
+        "",
+        "# Logs",
+        "*.log",
+        "",
+        "# Environment variables",
+        ".env",
+        ".env.local",
+    ),
+    "js-workspace": (
+        "# Dependencies of the workspace modules",
+        "node_modules/",
+        "",
+        "# Lockfile of the workspace",
+        "!/package-lock.json",
+        "!/pnpm-lock.yaml",
+    ),
+    "database-postgres": (
+        "*.dump",
+        "*.sql",
+    ),
+    "database-mongodb": (
+        "*.bson",
+        "*.mongodump",
+    ),
+    "database-sqlite": (
+        "*.sqlite",
+        "*.sqlite3",
+        "*.db",
+    ),
+}
+
+# Templates of the project root .gitignore
+ROOT_TEMPLATE = ("root",)
+
+# Template added to the root .gitignore of a JavaScript workspace
+WORKSPACE_TEMPLATE = ("js-workspace",)
+
+# Templates by language, then framework ("*" applies to every framework of the language)
+TEMPLATES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "javascript": {
+        "react": ("node-web",),
+        "nextjs": ("node-web",),
+        "angular": ("node-web",),
+        "vuejs": ("node-web",),
+        "svelte": ("node-web",),
+        "express": ("node-web",),
+        "nestjs": ("node-web",),
+        "react-native": ("node-mobile",),
+        "expo": ("node-mobile",),
+        "electron": ("node-desktop",),
+        "tauri": ("node-desktop",),
+    },
+    "python": {
+        "django": ("python-web",),
+        "flask": ("python-web",),
+        "fastapi": ("python-web",),
+        "kivy": ("python-gui",),
+        "beeware": ("python-gui",),
+    },
+    "java": {
+        "spring-boot": ("java",),
+        "quarkus": ("java",),
+        "micronaut": ("java",),
+    },
+    "go": {"*": ("go",)},
+    "php": {
+        "laravel": ("php",),
+        "symfony": ("php",),
+    },
+    "ruby": {
+        "rails": ("ruby",),
+        "sinatra": ("ruby",),
+    },
+    "rust": {"*": ("rust",)},
+    "dart": {"*": ("dart",)},
+    ".net": {"*": ("dotnet",)},
+}
+
+# Templates used when no framework template matches, by language
+GENERIC_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    "javascript": ("generic-javascript",),
+    "python": ("generic-python",),
+    "java": ("generic-java",),
+}
+
+# Template used for languages without a generic template
+DEFAULT_TEMPLATE = ("generic",)
+
+# Templates by database type
+DATABASE_TEMPLATES: Dict[str, Tuple[str, ...]] = {
+    "postgres": ("database-postgres",),
+    "mongodb": ("database-mongodb",),
+    "sqlite": ("database-sqlite",),
+}
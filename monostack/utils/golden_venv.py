@@ -0,0 +1,330 @@
+"""
+Module keeping a library of "golden" virtual environments.
+
+A golden environment is built once per interpreter and requirement set. New
+modules then get a clone of it, made with reflinks or hardlinks when the
+filesystem supports them (regular copies otherwise), and relocated by
+rewriting the paths embedded in pyvenv.cfg, scripts and .pth files. This
+replaces a full pip install.
+
+The least recently cloned environments are evicted once the library grows past
+its size limit, after each build and with `monostack cache prune`.
+"""
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent processes are not coordinated
+    fcntl = None
+
+from .cache_dir import get_cache_dir
+from .file_clone import FileCloner
+
+# Default maximum size of the library before least recently used environments are evicted
+DEFAULT_MAX_SIZE = 2 * 1024 ** 3
+
+# Files of site-packages are replaced rather than edited by pip, so clones can share them
+HARDLINK_SAFE_DIRECTORIES = {"site-packages"}
+
+def normalize_requirements(requirements: Iterable[str]) -> List[str]:
+    """Return a requirement set in a canonical, sorted form."""
+    return sorted({requirement.strip().lower().replace("_", "-") for requirement in requirements if requirement.strip()})
+
+def find_venvs(directory: str) -> Dict[str, str]:
+    """Map the relative path of each virtual environment in a directory to its absolute path."""
+    venvs = {}
+    for root, dirs, files in os.walk(directory):
+        if "pyvenv.cfg" in files:
+            venvs[os.path.relpath(root, directory)] = os.path.abspath(root)
+            dirs[:] = []
+            continue
+        dirs[:] = [d for d in dirs if d != "node_modules"]
+    return venvs
+
+def relocate_venv(venv_path: str, old_path: str) -> int:
+    """
+    Rewrite the absolute paths of a virtual environment moved or copied from old_path.
+    
+    pyvenv.cfg, the scripts (shebangs and activate scripts) and the .pth files of
+    site-packages are rewritten. Files are replaced rather than edited in place,
+    so a clone never writes through a hardlink shared with its template.
+    
+    Args:
+        venv_path: The new location of the environment
+        old_path: The location the environment was created at
+        
+    Returns:
+        Number of rewritten files
+    """
+    old = os.fsencode(old_path)
+    new = os.fsencode(venv_path)
+    if old == new:
+        return 0
+        
+    candidates = [os.path.join(venv_path, "pyvenv.cfg")]
+    scripts_dir = os.path.join(venv_path, "Scripts" if os.name == 'nt' else "bin")
+    if os.path.isdir(scripts_dir):
+        candidates.extend(os.path.join(scripts_dir, name) for name in os.listdir(scripts_dir))
+    candidates.extend(glob.glob(os.path.join(venv_path, "lib", "python*", "site-packages", "*.pth")))
+    candidates.extend(glob.glob(os.path.join(venv_path, "Lib", "site-packages", "*.pth")))
+    
+    rewritten = 0
+    for path in candidates:
+        if os.path.islink(path) or not os.path.isfile(path):
+            continue
+        with open(path, "rb") as f:
+            content = f.read()
+        if old not in content or b"\0" in content[:1024]:
+            continue
+            
+        temporary_path = f"{path}.relocate"
+        with open(temporary_path, "wb") as f:
+            f.write(content.replace(old, new))
+        shutil.copymode(path, temporary_path)
+        os.replace(temporary_path, path)
+        rewritten += 1
+    return rewritten
+
+class GoldenVenvLibrary:
+    """
+    Library of template virtual environments keyed by interpreter and requirement set,
+    with LRU eviction and file locking like the scaffold cache.
+    """
+    def __init__(self, library_dir: Optional[str] = None, max_size: Optional[int] = None):
+        """
+        Initialize the GoldenVenvLibrary.
+        
+        Args:
+            library_dir: Directory of the library (default: <monostack cache>/golden-venvs)
+            max_size: Maximum total size in bytes before environments are evicted (default: 2 GB)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.library_dir = library_dir or get_cache_dir("golden-venvs")
+        self.max_size = max_size if max_size is not None else DEFAULT_MAX_SIZE
+        self.entries_dir = os.path.join(self.library_dir, "entries")
+        self.locks_dir = os.path.join(self.library_dir, "locks")
+        self.tmp_dir = os.path.join(self.library_dir, "tmp")
+        self.file_cloner = FileCloner(HARDLINK_SAFE_DIRECTORIES)
+        
+    @staticmethod
+    def is_supported() -> bool:
+        """Check whether clones can be relocated on this platform (script launchers on Windows embed paths)."""
+        return os.name != 'nt'
+        
+    def make_key(self, requirements: Iterable[str]) -> str:
+        """
+        Compute the key of a golden environment.
+        
+        Args:
+            requirements: The packages installed in the environment
+            
+        Returns:
+            Hex digest identifying the interpreter and the requirement set
+        """
+        material = {
+            "python": sys.version,
+            "executable": os.path.realpath(sys.executable),
+            "requirements": normalize_requirements(requirements),
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+        
+    def has(self, key: str) -> bool:
+        """Check whether the library holds a golden environment."""
+        return os.path.isfile(os.path.join(self.entries_dir, key, "meta.json"))
+        
+    def build(self, key: str, requirements: Iterable[str], create: Callable[[str], None]) -> bool:
+        """
+        Build a golden environment and add it to the library.
+        
+        Args:
+            key: The key from make_key()
+            requirements: The packages installed in the environment
+            create: Function creating the environment, with the requirements installed, at a given path
+            
+        Returns:
+            True if the library now holds the environment
+        """
+        entry_dir = os.path.join(self.entries_dir, key)
+        if self.has(key):
+            return True
+            
+        os.makedirs(self.entries_dir, exist_ok=True)
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix=f"{key[:12]}-", dir=self.tmp_dir)
+        try:
+            venv_path = os.path.join(staging_dir, "venv")
+            create(venv_path)
+            size, files = self._measure(venv_path)
+            with open(os.path.join(staging_dir, "meta.json"), "w") as f:
+                json.dump({
+                    "key": key,
+                    "requirements": normalize_requirements(requirements),
+                    "python": sys.version,
+                    "origin": venv_path,
+                    "size": size,
+                    "files": files,
+                    "created": time.time(),
+                }, f, indent=2)
+                
+            try:
+                os.rename(staging_dir, entry_dir)
+            except OSError:
+                # Another process built the same environment first
+                if not self.has(key):
+                    raise
+            self.logger.info(f"Added a golden virtual environment for {', '.join(normalize_requirements(requirements))}")
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            
+        # The new environment is the most recently used, so it is only evicted if it exceeds the limit alone
+        self.prune(keep=key)
+        return True
+            
+    def clone(self, key: str, venv_path: str) -> bool:
+        """
+        Create a relocated clone of a golden environment.
+        
+        Args:
+            key: The key from make_key()
+            venv_path: Location of the new environment (must not exist)
+            
+        Returns:
+            True if the environment was cloned, False if it is not in the library
+        """
+        entry_dir = os.path.join(self.entries_dir, key)
+        # A shared lock keeps prune() from evicting the environment while it is copied
+        with self._lock(key, exclusive=False):
+            try:
+                with open(os.path.join(entry_dir, "meta.json"), "r") as f:
+                    meta = json.load(f)
+            except (OSError, ValueError):
+                return False
+                
+            self.file_cloner.copy_tree(os.path.join(entry_dir, "venv"), venv_path)
+            # The modification time of the metadata file records the last use for LRU eviction
+            os.utime(os.path.join(entry_dir, "meta.json"))
+        rewritten = relocate_venv(venv_path, meta["origin"])
+        self.logger.debug(f"Cloned golden environment {key[:12]} to {venv_path} ({rewritten} files relocated)")
+        return True
+        
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        List the golden environments, most recently used first.
+        
+        Returns:
+            List of metadata dictionaries with an extra last_used timestamp
+        """
+        entries = []
+        if not os.path.isdir(self.entries_dir):
+            return entries
+            
+        for key in os.listdir(self.entries_dir):
+            meta_path = os.path.join(self.entries_dir, key, "meta.json")
+            try:
+                with open(meta_path, "r") as f:
+                    meta = json.load(f)
+                meta["last_used"] = os.path.getmtime(meta_path)
+            except (OSError, ValueError):
+                continue
+            if "size" not in meta:
+                # Environments built before their size was recorded
+                meta["size"], meta["files"] = self._measure(os.path.join(self.entries_dir, key, "venv"))
+            entries.append(meta)
+            
+        entries.sort(key=lambda meta: meta["last_used"], reverse=True)
+        return entries
+        
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize the content of the library.
+        
+        Returns:
+            Dictionary with the library directory, the number of environments, and the total and maximum size
+        """
+        entries = self.entries()
+        return {
+            "library_dir": self.library_dir,
+            "entries": len(entries),
+            "size": sum(meta["size"] for meta in entries),
+            "max_size": self.max_size,
+        }
+        
+    def prune(self, max_size: Optional[int] = None, keep: Optional[str] = None) -> int:
+        """
+        Evict the least recently used environments until the library fits in max_size.
+        
+        Environments currently being cloned by another process are skipped.
+        
+        Args:
+            max_size: Size limit in bytes (default: the library's max_size)
+            keep: Key of an environment that must not be evicted
+            
+        Returns:
+            Number of evicted environments
+        """
+        limit = self.max_size if max_size is None else max_size
+        entries = self.entries()
+        total = sum(meta["size"] for meta in entries)
+        evicted = 0
+        
+        for meta in reversed(entries):
+            if total <= limit:
+                break
+            if meta["key"] == keep:
+                continue
+            try:
+                os.makedirs(self.tmp_dir, exist_ok=True)
+                with self._lock(meta["key"], exclusive=True, blocking=False):
+                    trash_dir = tempfile.mkdtemp(prefix="evicted-", dir=self.tmp_dir)
+                    os.rename(os.path.join(self.entries_dir, meta["key"]), os.path.join(trash_dir, "entry"))
+                shutil.rmtree(trash_dir, ignore_errors=True)
+                total -= meta["size"]
+                evicted += 1
+                self.logger.debug(f"Evicted golden environment {meta['key'][:12]} ({', '.join(meta['requirements'])})")
+            except BlockingIOError:
+                self.logger.debug(f"Golden environment {meta['key'][:12]} is in use, not evicting it")
+            except OSError as e:
+                self.logger.warning(f"Could not evict golden environment {meta['key'][:12]}: {str(e)}")
+                
+        return evicted
+        
+    @contextmanager
+    def _lock(self, key: str, exclusive: bool, blocking: bool = True) -> Iterator[None]:
+        """Hold a shared or exclusive lock on a golden environment across processes."""
+        if fcntl is None:
+            yield
+            return
+            
+        os.makedirs(self.locks_dir, exist_ok=True)
+        with open(os.path.join(self.locks_dir, f"{key}.lock"), "a") as lock_file:
+            operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            if not blocking:
+                operation |= fcntl.LOCK_NB
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+                
+    def _measure(self, directory: str) -> Tuple[int, int]:
+        """Return the total size in bytes and the number of files of a directory."""
+        size = 0
+        files = 0
+        for root, dirs, names in os.walk(directory):
+            for name in names:
+                try:
+                    size += os.lstat(os.path.join(root, name)).st_size
+                    files += 1
+                except OSError:
+                    continue
+        return size, files
@@ -0,0 +1,186 @@
+"""
+Module describing installation commands as structured steps.
+
+An entry of install_commands.json is either a shell command string or a list
+of steps, each an argument vector run without a shell:
+
+    [
+        {"run": ["rm", "-rf", "${module}"]},
+        {"run": ["mkdir", "${module}"], "creates": ["${module}"]},
+        {"run": ["npm", "init", "-y"], "cwd": "${module}", "creates": ["${module}/package.json"]},
+        {"run": ["npm", "install", "express"], "cwd": "${module}", "cache": true}
+    ]
+
+- ``cwd``: directory of the step, relative to the project directory (default: the project directory)
+- ``env``: environment variables added for the step
+- ``creates``: paths the step produces, relative to the project directory; the
+  step is skipped when they all exist already
+- ``cache``: store the module directory after the step in the scaffold cache,
+  so later generations restore it instead of running the steps up to it
+
+Simple shell strings, plain commands chained with ``&&`` and ``cd``, are
+converted to steps automatically by convert_command().
+"""
+import os
+import shlex
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
+
+from .trash import SAFE_NAME_PATTERN
+
+# Keys of a step in install_commands.json
+STEP_KEYS = {"run", "cwd", "env", "creates", "cache"}
+
+# Commands that only make sense inside a shell
+SHELL_BUILTINS = {"source", ".", "export", "set", "unset", "alias", "eval", "exec", "exit", "ulimit", "umask"}
+
+# Characters of a word that the shell would expand
+EXPANSION_CHARACTERS = set("$`*?[]{}~")
+
+class InstallStep(NamedTuple):
+    """A command of an installation, run without a shell."""
+    argv: List[str]
+    cwd: str = "."
+    env: Optional[Dict[str, str]] = None
+    creates: Optional[List[str]] = None
+    cache: bool = False
+
+def parse_steps(entries: Any) -> List[InstallStep]:
+    """
+    Parse the steps of an install_commands.json entry.
+    
+    Args:
+        entries: The list of step objects
+        
+    Returns:
+        The InstallSteps
+        
+    Raises:
+        ValueError: If the entry is not a list of valid steps
+    """
+    if not isinstance(entries, list) or not entries:
+        raise ValueError("installation steps must be a non-empty list")
+    steps = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            raise ValueError(f"step {index + 1} must be an object")
+        unknown = set(entry) - STEP_KEYS
+        if unknown:
+            raise ValueError(f"step {index + 1} has unknown keys: {', '.join(sorted(unknown))}")
+        argv = entry.get("run")
+        if not isinstance(argv, list) or not argv or not all(isinstance(argument, str) for argument in argv):
+            raise ValueError(f"step {index + 1} needs a \"run\" list of strings")
+        env = entry.get("env") or None
+        if env is not None and not all(isinstance(value, str) for value in env.values()):
+            raise ValueError(f"step {index + 1} has non-string environment values")
+        steps.append(InstallStep(list(argv), entry.get("cwd", "."), dict(env) if env else None,
+                                 list(entry["creates"]) if entry.get("creates") else None,
+                                 bool(entry.get("cache", False))))
+    return steps
+
+def convert_command(command: str) -> Optional[List[InstallStep]]:
+    """
+    Convert a shell command made of plain commands chained with ``&&`` to steps.
+    
+    ``cd`` sets the directory of the following steps and ``mkdir`` creates its
+    arguments. Anything else the shell would interpret (pipes, redirections,
+    variables, globs, builtins such as source) prevents the conversion.
+    
+    Args:
+        command: The rendered installation command
+        
+    Returns:
+        The equivalent steps, or None if the command needs a shell
+    """
+    lexer = shlex.shlex(command, posix=True, punctuation_chars=True)
+    lexer.whitespace_split = True
+    try:
+        tokens = list(lexer)
+    except ValueError:
+        return None
+    if any(EXPANSION_CHARACTERS & set(token) for token in tokens):
+        return None
+        
+    segments: List[List[str]] = [[]]
+    for token in tokens:
+        if token == "&&":
+            segments.append([])
+        elif token and all(character in lexer.punctuation_chars for character in token):
+            # |, ||, ;, &, redirections and subshells
+            return None
+        else:
+            segments[-1].append(token)
+            
+    steps = []
+    cwd = "."
+    for argv in segments:
+        if not argv or argv[0] in SHELL_BUILTINS or "=" in argv[0]:
+            return None
+        if argv[0] == "cd":
+            if len(argv) != 2:
+                return None
+            cwd = os.path.normpath(os.path.join(cwd, argv[1]))
+            continue
+        creates = None
+        if argv[0] == "mkdir":
+            creates = [os.path.normpath(os.path.join(cwd, path)) for path in argv[1:] if not path.startswith("-")]
+        steps.append(InstallStep(argv, cwd, creates=creates))
+    return steps or None
+
+def render_steps(steps: List[InstallStep], render: Callable[[str], str]) -> List[InstallStep]:
+    """
+    Substitute the variables of steps (e.g. ${module}).
+    
+    Args:
+        steps: The steps of install_commands.json
+        render: Function rendering a string of the steps
+        
+    Returns:
+        The rendered steps
+    """
+    return [
+        step._replace(
+            argv=[render(argument) for argument in step.argv],
+            cwd=render(step.cwd),
+            env={name: render(value) for name, value in step.env.items()} if step.env else None,
+            creates=[render(path) for path in step.creates] if step.creates else None
+        )
+        for step in steps
+    ]
+
+def format_step(step: InstallStep) -> str:
+    """Return the shell form of a step's command, with its environment variables."""
+    assignments = [f"{name}={shlex.quote(value)}" for name, value in sorted((step.env or {}).items())]
+    return " ".join(assignments + [shlex.join(step.argv)])
+
+def format_steps(steps: List[InstallStep]) -> str:
+    """
+    Return the shell command equivalent to steps, run from the project directory.
+    
+    The text identifies the steps in the scaffold cache keys and the run history,
+    and a converted command formats back to its original form.
+    """
+    parts = []
+    cwd = "."
+    for step in steps:
+        if os.path.normpath(step.cwd) != cwd:
+            parts.append(f"cd {shlex.quote(os.path.relpath(step.cwd, cwd))}")
+            cwd = os.path.normpath(step.cwd)
+        parts.append(format_step(step))
+    return " && ".join(parts)
+
+def command_text(entry: Union[str, List[Any]]) -> str:
+    """Return the shell form of an install_commands.json entry, a command string or steps."""
+    return entry if isinstance(entry, str) else format_steps(parse_steps(entry))
+
+def removed_names(step: InstallStep) -> Optional[List[str]]:
+    """Return the names an ``rm -rf <names>`` step removes from its directory, if it is one."""
+    if len(step.argv) < 3 or step.argv[0] != "rm" or step.argv[1] not in ("-rf", "-fr"):
+        return None
+    names = step.argv[2:]
+    if any(not SAFE_NAME_PATTERN.match(name) or name in (".", "..") for name in names):
+        return None
+    return names
+
+def outputs_exist(step: InstallStep, base_dir: str) -> bool:
+    """Return whether every output of a step exists, so the step can be skipped."""
+    return bool(step.creates) and all(os.path.lexists(os.path.join(base_dir, path)) for path in step.creates)
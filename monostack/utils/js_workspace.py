@@ -0,0 +1,136 @@
+"""
+Module grouping the JavaScript modules of a project into a single workspace.
+
+Every JavaScript module normally installs its own node_modules, hundreds of MB
+of mostly the same packages. With --js-workspace, the project root gets a
+package.json declaring the modules as npm workspaces (a pnpm-workspace.yaml
+with pnpm), and the dependencies of every module are installed once, hoisted
+at the root:
+
+- the ``npm install`` runs of the modules only record their dependencies
+  (``--package-lock-only``), without downloading them
+- the scaffolders that can skip their installation are told to (e.g.
+  ``--skip-install``), and the node_modules the others install are moved to the trash
+- ``pnpm install`` (its content-addressed store links every package once) or
+  ``npm install`` then runs at the root, after the last module installation
+
+The Docker Compose services keep building from their module directory: a
+module's Dockerfile may copy its whole directory (``COPY . .``), so building
+from the project root would silently put the monorepo in the image. The
+images install from the module's package.json, without the workspace lockfile.
+"""
+import os
+import re
+import json
+import shutil
+from typing import Any, Dict, List
+
+from .package_store import NPM_INSTALL_PATTERN, NPX_PATTERN
+
+# Languages whose modules join the workspace
+WORKSPACE_LANGUAGES = {"javascript"}
+
+# Option of the scaffolders run with npx that skips the installation of the dependencies
+SKIP_INSTALL_OPTIONS = {
+    "@nestjs/cli": "--skip-install",
+    "@angular/cli": "--skip-install",
+    "create-next-app": "--skip-install",
+    "create-expo-app": "--no-install",
+    "@react-native-community/cli": "--skip-install",
+}
+
+# Lockfiles of the modules, replaced by the lockfile of the workspace
+MODULE_LOCKFILES = ["package-lock.json", "npm-shrinkwrap.json", "pnpm-lock.yaml"]
+
+def workspace_modules(choices: Dict[str, Any]) -> List[str]:
+    """
+    Return the modules of a project that share a JavaScript workspace.
+    
+    Args:
+        choices: User's technology choices
+        
+    Returns:
+        The JavaScript modules, or an empty list when there are fewer than two of them
+    """
+    modules = [module for module, choice in choices.items()
+               if module != "database" and choice.get("language") in WORKSPACE_LANGUAGES]
+    return modules if len(modules) > 1 else []
+
+def defer_installs(command: str) -> str:
+    """
+    Make the local npm installs of a module command only record their dependencies.
+    
+    Global installs (``-g``, e.g. the ionic CLI) still run, and the scaffolders of
+    SKIP_INSTALL_OPTIONS get their option skipping the installation.
+    
+    Args:
+        command: The rendered installation command
+        
+    Returns:
+        The command with ``--package-lock-only`` added to its local npm installs
+    """
+    def defer(match: "re.Match") -> str:
+        arguments = match.group("args").split()
+        if any(flag in arguments for flag in ("-g", "--global", "--package-lock-only")):
+            return match.group(0)
+        return f"{match.group(0)[:match.start('args') - match.start()]} --package-lock-only{match.group('args')}"
+        
+    def skip_install(match: "re.Match") -> str:
+        arguments = match.group("args").split()
+        packages = [argument.rpartition("@")[0] if argument.rfind("@") > 0 else argument for argument in arguments]
+        option = next((SKIP_INSTALL_OPTIONS[package] for package in packages if package in SKIP_INSTALL_OPTIONS), None)
+        if option is None or option in arguments:
+            return match.group(0)
+        return f"{match.group(0).rstrip()} {option}{match.group(0)[len(match.group(0).rstrip()):]}"
+        
+    return NPX_PATTERN.sub(skip_install, NPM_INSTALL_PATTERN.sub(defer, command))
+
+def select_package_manager(offline: bool = False) -> str:
+    """Return the package manager installing the workspace: pnpm when installed, npm offline or without it."""
+    return "pnpm" if not offline and shutil.which("pnpm") else "npm"
+
+def package_name(base_dir: str) -> str:
+    """Return the npm package name of the workspace root, derived from the project directory."""
+    name = re.sub(r"[^a-z0-9._-]+", "-", os.path.basename(os.path.abspath(base_dir)).lower())
+    return name.strip("-._") or "workspace"
+
+def write_workspace_manifest(base_dir: str, modules: List[str], package_manager: str) -> List[str]:
+    """
+    Write the root package.json declaring the modules as workspaces, and pnpm-workspace.yaml for pnpm.
+    
+    Args:
+        base_dir: The base directory for the project
+        modules: The module directories of the workspace
+        package_manager: "npm" or "pnpm"
+        
+    Returns:
+        Paths of the written files, relative to the project directory
+    """
+    manifest: Dict[str, Any] = {"name": package_name(base_dir), "private": True}
+    if package_manager == "npm":
+        manifest["workspaces"] = modules
+    with open(os.path.join(base_dir, "package.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    written = ["package.json"]
+    
+    if package_manager == "pnpm":
+        with open(os.path.join(base_dir, "pnpm-workspace.yaml"), "w") as f:
+            f.write("packages:\n")
+            f.writelines(f"  - '{module}'\n" for module in modules)
+        written.append("pnpm-workspace.yaml")
+    return written
+
+def remove_module_lockfiles(module_dir: str) -> List[str]:
+    """Remove the lockfiles of a module, which the workspace lockfile replaces, returning their names."""
+    removed = []
+    for name in MODULE_LOCKFILES:
+        path = os.path.join(module_dir, name)
+        if os.path.isfile(path):
+            os.remove(path)
+            removed.append(name)
+    return removed
+
+def install_command(package_manager: str) -> str:
+    """Return the command installing the dependencies of every workspace module at the root."""
+    return "pnpm install" if package_manager == "pnpm" else "npm install"
@@ -0,0 +1,61 @@
+"""
+Module providing bounded in-memory capture of command output.
+"""
+from collections import deque
+from typing import Optional, TextIO
+
+class TailBuffer:
+    """
+    Keeps the text written to it, or only its last ``max_chars`` characters when a
+    limit is set, and optionally tees everything to a log file.
+    """
+    def __init__(self, max_chars: Optional[int] = None, log_file: Optional[TextIO] = None):
+        """
+        Initialize the TailBuffer.
+
+        Args:
+            max_chars: Maximum number of characters kept in memory (None for no limit)
+            log_file: Optional open file receiving the full stream
+        """
+        self.max_chars = max_chars
+        self.log_file = log_file
+        self.total_chars = 0
+        self._chunks = deque()
+        self._size = 0
+
+    def write(self, text: str) -> None:
+        """Append text, dropping the oldest characters beyond the limit."""
+        if not text:
+            return
+        if self.log_file is not None:
+            self.log_file.write(text)
+
+        self.total_chars += len(text)
+        if self.max_chars is not None and len(text) >= self.max_chars:
+            # The new chunk alone fills the buffer
+            self._chunks.clear()
+            text = text[-self.max_chars:] if self.max_chars else ""
+            self._size = 0
+
+        self._chunks.append(text)
+        self._size += len(text)
+
+        if self.max_chars is not None:
+            while self._size > self.max_chars:
+                excess = self._size - self.max_chars
+                head = self._chunks[0]
+                if len(head) <= excess:
+                    self._chunks.popleft()
+                    self._size -= len(head)
+                else:
+                    self._chunks[0] = head[excess:]
+                    self._size -= excess
+
+    @property
+    def truncated(self) -> bool:
+        """Whether some of the written text was dropped from memory."""
+        return self.total_chars > self._size
+
+    def getvalue(self) -> str:
+        """Return the text kept in memory."""
+        return ''.join(self._chunks)
@@ -0,0 +1,223 @@
+"""
+Module prefetching the packages of the installation commands, for offline generation.
+
+The store holds a pip wheelhouse and an npm cache. `monostack prefetch` fills
+them from install_commands.json, and `--offline` rewrites the installations to
+use them instead of the package indexes:
+
+- ``pip install`` becomes ``pip install --no-index --find-links <wheelhouse>``
+- ``npm install``, ``npm create`` and ``npx`` get ``--offline --cache <npm cache>``
+
+The dependencies that scaffolders run with npx or ``npm create`` install
+themselves (react for create-react-app, the Angular packages for @angular/cli...)
+do not appear in the command, so the prefetch also runs these installation
+commands once in a scratch directory, with the npm cache of the store. Files
+scaffolders fetch outside of npm (e.g. degit's GitHub tarballs) are not stored.
+"""
+import os
+import re
+import sys
+import time
+import shlex
+import shutil
+import logging
+import tempfile
+import subprocess
+from string import Template
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .cache_dir import get_cache_dir
+from .install_steps import command_text
+
+PIP_INSTALL_PATTERN = re.compile(r"\bpip3?\s+install\b(?P<args>[^&;|]*)")
+NPM_INSTALL_PATTERN = re.compile(r"\bnpm\s+(?:install|i|add)\b(?P<args>[^&;|]*)")
+NPM_CREATE_PATTERN = re.compile(r"\bnpm\s+(?:create|init)\b(?P<args>[^&;|]*)")
+NPX_PATTERN = re.compile(r"\bnpx\b(?P<args>[^&;|]*)")
+
+# Seconds a scaffolder may run while prefetching its dependencies
+SCAFFOLD_TIMEOUT = 900
+
+def _positional_arguments(arguments: str) -> List[str]:
+    """Return the arguments that are not options nor shell variables."""
+    return [argument for argument in arguments.split() if not argument.startswith("-") and "$" not in argument]
+
+def _create_package(initializer: str) -> str:
+    """Return the package run by `npm create <initializer>` (vue@latest -> create-vue@latest)."""
+    if initializer.startswith("@"):
+        scope, _, name = initializer.partition("/")
+        return f"{scope}/create-{name}" if name else f"{scope}/create"
+    return f"create-{initializer}"
+
+def extract_packages(command: str) -> Dict[str, List[str]]:
+    """
+    Work out the packages an installation command downloads.
+    
+    Args:
+        command: The installation command
+        
+    Returns:
+        Dictionary with the "pip" requirements and "npm" packages of the command
+    """
+    packages = {"pip": [], "npm": []}
+    for match in PIP_INSTALL_PATTERN.finditer(command):
+        packages["pip"].extend(_positional_arguments(match.group("args")))
+    for match in NPM_INSTALL_PATTERN.finditer(command):
+        packages["npm"].extend(_positional_arguments(match.group("args")))
+    for match in NPM_CREATE_PATTERN.finditer(command):
+        arguments = _positional_arguments(match.group("args"))
+        if arguments:
+            packages["npm"].append(_create_package(arguments[0]))
+    for match in NPX_PATTERN.finditer(command):
+        arguments = _positional_arguments(match.group("args"))
+        if arguments:
+            packages["npm"].append(arguments[0])
+    return packages
+
+def runs_scaffolder(command: str) -> bool:
+    """Return whether an installation command runs a package with npx or `npm create`."""
+    return any(_positional_arguments(match.group("args"))
+               for pattern in (NPX_PATTERN, NPM_CREATE_PATTERN) for match in pattern.finditer(command))
+
+class PackageStore:
+    """
+    A local pip wheelhouse and npm cache, filled ahead of time and used by offline generations.
+    """
+    def __init__(self, store_dir: Optional[str] = None):
+        """
+        Initialize the PackageStore.
+        
+        Args:
+            store_dir: Directory of the store (default: <monostack cache>/prefetch)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.store_dir = store_dir or get_cache_dir("prefetch")
+        self.wheelhouse_dir = os.path.join(self.store_dir, "wheelhouse")
+        self.npm_cache_dir = os.path.join(self.store_dir, "npm")
+        
+    def collect(self, catalog, module: Optional[str] = None, language: Optional[str] = None,
+                framework: Optional[str] = None) -> List[Tuple[str, Tuple[str, ...]]]:
+        """
+        List the downloads needed by the installation commands of a catalog.
+        
+        Args:
+            catalog: The TechnologyCatalog
+            module: Only consider this module
+            language: Only consider this language
+            framework: Only consider this framework
+            
+        Returns:
+            Sorted, de-duplicated list of (package manager, packages) downloads;
+            the packages of a command are downloaded together so they resolve consistently,
+            and the commands running scaffolders are ("scaffold", (command,)) downloads
+        """
+        downloads = set()
+        for module_name in catalog.modules():
+            if module and module_name != module:
+                continue
+            for language_name in catalog.languages(module_name):
+                if language and language_name != language:
+                    continue
+                for framework_name in catalog.frameworks(module_name, language_name):
+                    if framework and framework_name != framework:
+                        continue
+                    command = command_text(catalog.command(module_name, language_name, framework_name) or "")
+                    for manager, packages in extract_packages(command).items():
+                        if packages:
+                            downloads.add((manager, tuple(sorted(set(packages)))))
+                    if runs_scaffolder(command):
+                        downloads.add(("scaffold", (Template(command).safe_substitute(module=module_name),)))
+        return sorted(downloads)
+        
+    def prefetch(self, downloads: List[Tuple[str, Tuple[str, ...]]],
+                 concurrency: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Download packages into the store, several downloads at once.
+        
+        Args:
+            downloads: (package manager, packages) pairs from collect()
+            concurrency: Maximum number of concurrent downloads (default: 8)
+            
+        Returns:
+            One dictionary per download with the manager, packages, success, duration and error
+        """
+        os.makedirs(self.wheelhouse_dir, exist_ok=True)
+        os.makedirs(self.npm_cache_dir, exist_ok=True)
+        with ThreadPoolExecutor(max_workers=concurrency or 8) as executor:
+            return list(executor.map(lambda download: self._prefetch_one(*download), downloads))
+            
+    def _prefetch_one(self, manager: str, packages: Tuple[str, ...]) -> Dict[str, Any]:
+        """Run a single download and report its outcome."""
+        start = time.monotonic()
+        result = {"manager": manager, "packages": list(packages), "success": True, "error": None}
+        try:
+            if manager == "pip":
+                self._run([sys.executable, "-m", "pip", "download", "--quiet", "--prefer-binary",
+                           "--dest", self.wheelhouse_dir, *packages])
+            elif manager == "scaffold":
+                # The scaffolder downloads what it installs into the npm cache of the store
+                scratch_dir = tempfile.mkdtemp(prefix="prefetch-")
+                try:
+                    self._run(packages[0], shell=True, executable="/bin/bash", cwd=scratch_dir,
+                              stdin=subprocess.DEVNULL, timeout=SCAFFOLD_TIMEOUT,
+                              env=dict(os.environ, npm_config_cache=self.npm_cache_dir, npm_config_yes="true"))
+                finally:
+                    shutil.rmtree(scratch_dir, ignore_errors=True)
+            else:
+                # Installing into a scratch prefix caches the whole dependency tree, not just the tarballs
+                scratch_dir = tempfile.mkdtemp(prefix="prefetch-")
+                try:
+                    self._run(["npm", "install", "--prefix", scratch_dir, "--cache", self.npm_cache_dir,
+                               "--no-save", "--no-package-lock", "--no-audit", "--no-fund", "--ignore-scripts",
+                               *packages])
+                finally:
+                    shutil.rmtree(scratch_dir, ignore_errors=True)
+        except (OSError, subprocess.SubprocessError) as e:
+            result["success"] = False
+            stderr = getattr(e, "stderr", None)
+            result["error"] = stderr.strip() if isinstance(stderr, str) and stderr.strip() else str(e)
+            self.logger.warning(f"Could not prefetch {manager} packages {' '.join(packages)}: {result['error']}")
+        result["duration"] = time.monotonic() - start
+        return result
+        
+    def _run(self, command: Union[str, List[str]], **kwargs: Any) -> None:
+        """Run a download command, raising CalledProcessError with its output on failure."""
+        subprocess.run(command, check=True, capture_output=True, text=True, **kwargs)
+        
+    def offline_command(self, command: str) -> str:
+        """
+        Rewrite an installation command so pip and npm only use the store.
+        
+        Args:
+            command: The installation command
+            
+        Returns:
+            The command with offline options added to its pip and npm invocations
+        """
+        wheelhouse = shlex.quote(self.wheelhouse_dir)
+        npm_cache = shlex.quote(self.npm_cache_dir)
+        command = PIP_INSTALL_PATTERN.sub(
+            lambda match: f"{match.group(0)[:match.start('args') - match.start()]} --no-index "
+                          f"--find-links {wheelhouse}{match.group('args')}", command)
+        for pattern in (NPM_INSTALL_PATTERN, NPM_CREATE_PATTERN, NPX_PATTERN):
+            command = pattern.sub(
+                lambda match: f"{match.group(0)[:match.start('args') - match.start()]} --offline "
+                              f"--cache {npm_cache}{match.group('args')}", command)
+        return command
+        
+    def offline_environment(self) -> Dict[str, str]:
+        """
+        Return the environment variables making nested pip, uv and npm invocations use the store.
+        
+        Installers such as create-react-app run npm themselves, and virtual
+        environments install their requirements outside of the shell command.
+        """
+        return {
+            "PIP_NO_INDEX": "1",
+            "PIP_FIND_LINKS": self.wheelhouse_dir,
+            "UV_NO_INDEX": "1",
+            "UV_FIND_LINKS": self.wheelhouse_dir,
+            "UV_OFFLINE": "1",
+            "npm_config_cache": self.npm_cache_dir,
+            "npm_config_offline": "true",
+        }
@@ -0,0 +1,191 @@
+"""
+Module recording the module installations in a local SQLite database.
+
+Every installation command run stores its duration, exit status, output size
+and toolchain versions. The history gives the scheduler expected durations, so
+the slowest installations start first, lets --plan show an ETA, and backs the
+`stats` command.
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+from typing import Any, Dict, List, Optional, Sequence
+
+from .cache_dir import get_cache_dir
+
+# Number of recent successful runs an estimate is based on
+ESTIMATE_WINDOW = 20
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started_at REAL NOT NULL,
+    module TEXT NOT NULL,
+    language TEXT NOT NULL,
+    framework TEXT NOT NULL,
+    command TEXT NOT NULL,
+    duration REAL NOT NULL,
+    returncode INTEGER NOT NULL,
+    output_size INTEGER NOT NULL,
+    toolchain TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_framework ON runs (module, language, framework, started_at);
+"""
+
+def percentile(values: Sequence[float], fraction: float) -> Optional[float]:
+    """
+    Compute a percentile with linear interpolation between the closest ranks.
+    
+    Args:
+        values: The samples
+        fraction: The percentile as a fraction (0.5 for the median, 0.95 for p95)
+        
+    Returns:
+        The percentile, or None without samples
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+class RunHistory:
+    """
+    SQLite store of the installation runs, shared by concurrent monostack processes.
+    
+    Errors are logged and never propagated: a missing or locked history only
+    means the scheduler falls back to default estimates.
+    """
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        Initialize the RunHistory.
+        
+        Args:
+            db_path: Path of the database (default: <monostack cache>/history/runs.sqlite3)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.db_path = db_path or get_cache_dir("history", "runs.sqlite3")
+        self._initialized = False
+        
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection, creating the database and its schema on first use."""
+        if not self._initialized:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        connection = sqlite3.connect(self.db_path, timeout=30)
+        if not self._initialized:
+            # WAL lets batch workers record runs while others read estimates
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            self._initialized = True
+        return connection
+        
+    def record(self, module: str, language: str, framework: str, command: str, duration: float,
+               returncode: int, output_size: int = 0, toolchain: Optional[Dict[str, str]] = None,
+               started_at: Optional[float] = None) -> bool:
+        """
+        Record an installation run.
+        
+        Args:
+            module: The module type (backend, frontend-web, etc.)
+            language: The module's language
+            framework: The module's framework
+            command: The rendered installation command
+            duration: Wall-clock duration in seconds
+            returncode: Exit status of the command
+            output_size: Number of characters written to stdout and stderr
+            toolchain: Versions of the toolchains the command uses
+            started_at: Unix time the run started at (default: now minus the duration)
+            
+        Returns:
+            True if the run was recorded
+        """
+        try:
+            connection = self._connect()
+            try:
+                with connection:
+                    connection.execute(
+                        "INSERT INTO runs (started_at, module, language, framework, command, duration, returncode, "
+                        "output_size, toolchain) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (started_at if started_at is not None else time.time() - duration, module, language,
+                         framework, command, duration, returncode, output_size,
+                         json.dumps(toolchain or {}, sort_keys=True))
+                    )
+            finally:
+                connection.close()
+            return True
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not record the {module} run in {self.db_path}: {str(e)}")
+            return False
+            
+    def durations(self, module: str, language: str, framework: str, limit: int = ESTIMATE_WINDOW) -> List[float]:
+        """Return the durations of the most recent successful runs of a technology."""
+        try:
+            connection = self._connect()
+            try:
+                rows = connection.execute(
+                    "SELECT duration FROM runs WHERE module = ? AND language = ? AND framework = ? "
+                    "AND returncode = 0 ORDER BY started_at DESC LIMIT ?",
+                    (module, language, framework, limit)
+                ).fetchall()
+            finally:
+                connection.close()
+            return [row[0] for row in rows]
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not read the run history in {self.db_path}: {str(e)}")
+            return []
+            
+    def estimate(self, module: str, language: str, framework: str) -> Optional[float]:
+        """
+        Estimate the duration of an installation from its recent successful runs.
+        
+        Returns:
+            The median duration in seconds, or None if the technology never ran
+        """
+        return percentile(self.durations(module, language, framework), 0.5)
+        
+    def framework_stats(self) -> List[Dict[str, Any]]:
+        """
+        Summarize the history per module, language and framework.
+        
+        Returns:
+            List of dictionaries with the module, language, framework, number of runs
+            and failures, p50 and p95 of the successful durations and the last run time,
+            slowest p50 first
+        """
+        try:
+            connection = self._connect()
+            try:
+                rows = connection.execute(
+                    "SELECT module, language, framework, duration, returncode, started_at FROM runs"
+                ).fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not read the run history in {self.db_path}: {str(e)}")
+            return []
+            
+        groups: Dict[tuple, Dict[str, Any]] = {}
+        for module, language, framework, duration, returncode, started_at in rows:
+            group = groups.setdefault((module, language, framework), {
+                "module": module, "language": language, "framework": framework,
+                "runs": 0, "failures": 0, "durations": [], "last_run": started_at,
+            })
+            group["runs"] += 1
+            group["last_run"] = max(group["last_run"], started_at)
+            if returncode == 0:
+                group["durations"].append(duration)
+            else:
+                group["failures"] += 1
+                
+        stats = []
+        for group in groups.values():
+            durations = group.pop("durations")
+            group["p50"] = percentile(durations, 0.5)
+            group["p95"] = percentile(durations, 0.95)
+            stats.append(group)
+        stats.sort(key=lambda group: group["p50"] if group["p50"] is not None else -1, reverse=True)
+        return stats
@@ -0,0 +1,285 @@
+"""
+Module implementing a content-addressed cache of generated module scaffolds.
+
+A scaffold is the directory produced by a module's installation command. It is
+keyed by the rendered command, the module name and the versions of the
+toolchains the command uses, so a cache hit restores exactly what the installer
+would have produced with the same tools.
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent processes are not coordinated
+    fcntl = None
+
+from .cache_dir import get_cache_dir
+from .toolchain import ToolchainProber
+from .file_clone import FileCloner
+from .golden_venv import find_venvs, relocate_venv
+
+# Default maximum size of the cache before least recently used entries are evicted
+DEFAULT_MAX_SIZE = 5 * 1024 ** 3
+
+# Dependency directories whose files are never edited in place by monostack,
+# and which are therefore safe to share with the cache through hardlinks
+HARDLINK_SAFE_DIRECTORIES = {"node_modules", "vendor", "target", ".dart_tool", ".gradle", ".pub-cache",
+                             "site-packages"}
+
+class ScaffoldCache:
+    """
+    Stores and restores module scaffolds, with LRU eviction and file locking so
+    several monostack processes can share the same cache.
+    """
+    def __init__(self, cache_dir: Optional[str] = None, max_size: Optional[int] = None):
+        """
+        Initialize the ScaffoldCache.
+
+        Args:
+            cache_dir: Directory of the cache (default: <monostack cache>/scaffolds)
+            max_size: Maximum total size in bytes before entries are evicted (default: 5 GB)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.cache_dir = cache_dir or get_cache_dir("scaffolds")
+        self.max_size = max_size if max_size is not None else DEFAULT_MAX_SIZE
+        self.entries_dir = os.path.join(self.cache_dir, "entries")
+        self.locks_dir = os.path.join(self.cache_dir, "locks")
+        self.tmp_dir = os.path.join(self.cache_dir, "tmp")
+        self.toolchain_prober = ToolchainProber()
+        self.file_cloner = FileCloner(HARDLINK_SAFE_DIRECTORIES)
+
+    def make_key(self, module: str, command: str) -> str:
+        """
+        Compute the cache key of a scaffold.
+
+        Args:
+            module: The module name (backend, frontend-web, etc.)
+            command: The rendered installation command
+
+        Returns:
+            Hex digest identifying the scaffold
+        """
+        material = {
+            "module": module,
+            "command": command,
+            "toolchain": self.toolchain_prober.versions_for_command(command),
+        }
+        return hashlib.sha256(json.dumps(material, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def restore(self, key: str, target_dir: str) -> bool:
+        """
+        Restore a cached scaffold into target_dir, replacing its current content.
+
+        Args:
+            key: The cache key from make_key()
+            target_dir: The module directory to restore
+
+        Returns:
+            True on a cache hit, False if the scaffold is not cached or could not be restored
+        """
+        entry_dir = os.path.join(self.entries_dir, key)
+        if not os.path.isdir(entry_dir):
+            return False
+
+        try:
+            with self._lock(key, exclusive=False):
+                if not os.path.isdir(entry_dir):
+                    return False
+                with open(os.path.join(entry_dir, "meta.json"), "r") as f:
+                    meta = json.load(f)
+
+                if os.path.lexists(target_dir):
+                    shutil.rmtree(target_dir)
+                self.file_cloner.copy_tree(os.path.join(entry_dir, "tree"), target_dir)
+
+                # Virtual environments embed the absolute path they were created at
+                for relative_path, origin in meta.get("venvs", {}).items():
+                    relocate_venv(os.path.join(target_dir, relative_path), origin)
+
+                # The modification time of the metadata file records the last use for LRU eviction
+                os.utime(os.path.join(entry_dir, "meta.json"))
+
+            self.logger.info(f"Restored {target_dir} from the scaffold cache")
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"Could not restore scaffold {key[:12]} from cache: {str(e)}")
+            return False
+
+    def store(self, key: str, source_dir: str, module: str, command: str) -> bool:
+        """
+        Store a freshly generated scaffold in the cache.
+
+        Args:
+            key: The cache key from make_key()
+            source_dir: The module directory produced by the installation command
+            module: The module name
+            command: The rendered installation command
+
+        Returns:
+            True if the scaffold is now cached, False otherwise
+        """
+        entry_dir = os.path.join(self.entries_dir, key)
+        if os.path.isdir(entry_dir):
+            return True
+        if not os.path.isdir(source_dir):
+            return False
+
+        try:
+            os.makedirs(self.entries_dir, exist_ok=True)
+            os.makedirs(self.tmp_dir, exist_ok=True)
+            staging_dir = tempfile.mkdtemp(prefix=f"{key[:12]}-", dir=self.tmp_dir)
+
+            try:
+                self.file_cloner.copy_tree(source_dir, os.path.join(staging_dir, "tree"))
+                size, files = self._measure(os.path.join(staging_dir, "tree"))
+                meta = {
+                    "key": key,
+                    "module": module,
+                    "command": command,
+                    "toolchain": self.toolchain_prober.versions_for_command(command),
+                    "size": size,
+                    "files": files,
+                    "venvs": find_venvs(source_dir),
+                    "created": time.time(),
+                }
+                with open(os.path.join(staging_dir, "meta.json"), "w") as f:
+                    json.dump(meta, f, indent=2)
+
+                # Publish atomically: readers either see the complete entry or nothing
+                with self._lock(key, exclusive=True):
+                    if not os.path.isdir(entry_dir):
+                        os.rename(staging_dir, entry_dir)
+            finally:
+                if os.path.isdir(staging_dir):
+                    shutil.rmtree(staging_dir, ignore_errors=True)
+
+            self.logger.info(f"Stored {module} scaffold in the cache ({size / 1024 ** 2:.1f} MB)")
+            self.prune()
+            return True
+
+        except Exception as e:
+            self.logger.warning(f"Could not store scaffold for {module} in cache: {str(e)}")
+            return False
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """
+        List the cached scaffolds, most recently used first.
+
+        Returns:
+            List of metadata dictionaries with an extra last_used timestamp
+        """
+        entries = []
+        if not os.path.isdir(self.entries_dir):
+            return entries
+
+        for key in os.listdir(self.entries_dir):
+            meta_path = os.path.join(self.entries_dir, key, "meta.json")
+            try:
+                with open(meta_path, "r") as f:
+                    meta = json.load(f)
+                meta["last_used"] = os.path.getmtime(meta_path)
+                entries.append(meta)
+            except (OSError, ValueError):
+                continue
+
+        entries.sort(key=lambda meta: meta["last_used"], reverse=True)
+        return entries
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Summarize the content of the cache.
+
+        Returns:
+            Dictionary with the number of entries, total and maximum size, and per-module totals
+        """
+        entries = self.entries()
+        modules: Dict[str, Dict[str, int]] = {}
+        for meta in entries:
+            module = modules.setdefault(meta["module"], {"entries": 0, "size": 0})
+            module["entries"] += 1
+            module["size"] += meta["size"]
+
+        return {
+            "cache_dir": self.cache_dir,
+            "entries": len(entries),
+            "size": sum(meta["size"] for meta in entries),
+            "max_size": self.max_size,
+            "modules": modules,
+        }
+
+    def prune(self, max_size: Optional[int] = None) -> int:
+        """
+        Evict the least recently used scaffolds until the cache fits in max_size.
+
+        Entries currently being restored by another process are skipped.
+
+        Args:
+            max_size: Size limit in bytes (default: the cache's max_size)
+
+        Returns:
+            Number of evicted entries
+        """
+        limit = self.max_size if max_size is None else max_size
+        entries = self.entries()
+        os.makedirs(self.tmp_dir, exist_ok=True)
+        total = sum(meta["size"] for meta in entries)
+        evicted = 0
+
+        for meta in reversed(entries):
+            if total <= limit:
+                break
+            try:
+                with self._lock(meta["key"], exclusive=True, blocking=False):
+                    entry_dir = os.path.join(self.entries_dir, meta["key"])
+                    trash_dir = tempfile.mkdtemp(prefix="evicted-", dir=self.tmp_dir)
+                    os.rename(entry_dir, os.path.join(trash_dir, "entry"))
+                shutil.rmtree(trash_dir, ignore_errors=True)
+                total -= meta["size"]
+                evicted += 1
+                self.logger.debug(f"Evicted scaffold {meta['key'][:12]} ({meta['module']})")
+            except BlockingIOError:
+                self.logger.debug(f"Scaffold {meta['key'][:12]} is in use, not evicting it")
+            except OSError as e:
+                self.logger.warning(f"Could not evict scaffold {meta['key'][:12]}: {str(e)}")
+
+        return evicted
+
+    @contextmanager
+    def _lock(self, key: str, exclusive: bool, blocking: bool = True) -> Iterator[None]:
+        """Hold a shared or exclusive lock on a cache entry across processes."""
+        if fcntl is None:
+            yield
+            return
+
+        os.makedirs(self.locks_dir, exist_ok=True)
+        with open(os.path.join(self.locks_dir, f"{key}.lock"), "a") as lock_file:
+            operation = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            if not blocking:
+                operation |= fcntl.LOCK_NB
+            fcntl.flock(lock_file, operation)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _measure(self, directory: str) -> Tuple[int, int]:
+        """Return the total size in bytes and the number of files of a directory."""
+        size = 0
+        files = 0
+        for root, dirs, names in os.walk(directory):
+            for name in names:
+                try:
+                    size += os.lstat(os.path.join(root, name)).st_size
+                    files += 1
+                except OSError:
+                    continue
+        return size, files
@@ -0,0 +1,112 @@
+"""
+Module measuring the startup cost of the monostack CLI.
+
+Startup budget: ``python -m monostack --help`` must finish within
+STARTUP_BUDGET_MS on a developer machine, and must not import the heavy
+modules listed in HEAVY_MODULES. benchmarks/bench_startup.py checks the
+budget, and the test suite checks that the heavy modules stay lazy.
+"""
+import os
+import sys
+import time
+import subprocess
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Wall-clock budget of `python -m monostack --help`, in milliseconds
+STARTUP_BUDGET_MS = 150
+
+# Modules that must only be imported on the code paths that use them
+HEAVY_MODULES = [
+    "yaml",
+    "inquirer",
+    "colorama",
+    "asyncio",
+    "monostack.core.project_generator",
+    "monostack.core.user_interface",
+    "monostack.templates.hello_world",
+    "monostack.utils.gitignore_generator",
+]
+
+def run_import_time(argv: Sequence[str] = ("--help",)) -> Tuple[List[Tuple[str, int, int, int]], float]:
+    """
+    Run the CLI in a fresh interpreter with -X importtime.
+
+    Args:
+        argv: Arguments passed to the CLI
+
+    Returns:
+        Tuple of the imports as (module, self us, cumulative us, depth) in import
+        order, and the wall-clock time of the whole run in milliseconds
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "monostack", *argv],
+        cwd=project_root,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    imports = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        imports.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return imports, wall_ms
+
+def profile_startup(argv: Sequence[str] = ("--help",), top: int = 20) -> str:
+    """
+    Build an -X importtime style report of the CLI startup.
+
+    Args:
+        argv: Arguments passed to the CLI
+        top: Number of top-level imports listed, slowest first
+
+    Returns:
+        The report
+    """
+    imports, wall_ms = run_import_time(argv)
+    top_level = sorted((entry for entry in imports if entry[3] == 0), key=lambda entry: entry[2], reverse=True)
+    total_us = sum(entry[2] for entry in top_level)
+    loaded = {entry[0] for entry in imports}
+
+    lines = [
+        f"Startup profile of 'monostack {' '.join(argv)}'",
+        f"  Wall time:    {wall_ms:.1f} ms (budget: {STARTUP_BUDGET_MS} ms)",
+        f"  Import time:  {total_us / 1000:.1f} ms in {len(imports)} modules",
+        "",
+        f"  {'cumulative':>12}  {'self':>10}  module",
+    ]
+    for name, self_us, cumulative_us, _ in top_level[:top]:
+        lines.append(f"  {cumulative_us / 1000:>9.1f} ms  {self_us / 1000:>7.1f} ms  {name}")
+
+    eager = [name for name in HEAVY_MODULES if name in loaded]
+    lines.append("")
+    lines.append(f"  Heavy modules imported eagerly: {', '.join(eager) if eager else 'none'}")
+    return "\n".join(lines)
+
+def measure_startup(runs: int = 10, argv: Sequence[str] = ("--help",)) -> Dict[str, Optional[float]]:
+    """
+    Measure the wall-clock startup time of the CLI over several runs.
+
+    Returns:
+        Dictionary with the min, median and max times in milliseconds
+    """
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-m", "monostack", *argv], cwd=project_root,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    return {
+        "min": timings[0] if timings else None,
+        "median": timings[len(timings) // 2] if timings else None,
+        "max": timings[-1] if timings else None,
+    }
@@ -0,0 +1,148 @@
+"""
+Module detecting which toolchains an installation command uses and probing their versions.
+"""
+import os
+import re
+import shlex
+import shutil
+import logging
+import threading
+import subprocess
+from typing import Dict, List, Optional, Tuple
+
+# Toolchains whose version affects the output of a command, by executable name
+TOOLCHAINS_BY_EXECUTABLE = {
+    "npx": ["node", "npm"],
+    "npm": ["node", "npm"],
+    "node": ["node"],
+    "ionic": ["node", "npm"],
+    "cordova": ["node", "npm"],
+    "mvn": ["mvn"],
+    "mn": ["mn"],
+    "sbt": ["sbt"],
+    "grails": ["grails"],
+    "cargo": ["cargo"],
+    "create-tauri-app": ["cargo"],
+    "go": ["go"],
+    "composer": ["composer", "php"],
+    "wp": ["php"],
+    "python": ["python"],
+    "pip": ["python"],
+    "django-admin": ["python", "django-admin"],
+    "gem": ["ruby", "gem"],
+    "bundle": ["ruby", "bundle"],
+    "rails": ["ruby", "rails"],
+    "hanami": ["ruby", "hanami"],
+    "padrino": ["ruby", "padrino"],
+    "trailblazer": ["ruby"],
+    "bridgetown": ["ruby", "bridgetown"],
+    "dotnet": ["dotnet"],
+    "flutter": ["flutter"],
+}
+
+# Arguments printing the version of a toolchain, when not --version
+VERSION_ARGUMENTS = {
+    "go": ["version"],
+}
+
+# Shell operators separating the commands of an installation chain
+COMMAND_SEPARATOR = re.compile(r"&&|\|\||;|\|")
+
+# Shell variable assignment prefix, e.g. VALID_NAME=...
+ASSIGNMENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*=")
+
+class ToolchainProber:
+    """
+    Finds the toolchains used by shell commands and caches their versions.
+
+    A cached version is only reused while the toolchain's executable is the same file,
+    unchanged since it was probed, so a long-running server sees toolchain upgrades.
+    """
+    _versions: Dict[str, Tuple[Optional[Tuple[str, int]], str]] = {}
+    _lock = threading.Lock()
+
+    def __init__(self):
+        """Initialize the ToolchainProber with a logger."""
+        self.logger = logging.getLogger(__name__)
+
+    def executables(self, command: str) -> List[str]:
+        """
+        List the executables started by a shell command chain, in order.
+
+        Args:
+            command: The shell command (e.g. "rm -rf backend && npx --yes ...")
+
+        Returns:
+            List of executable names without duplicates
+        """
+        names = []
+        for segment in COMMAND_SEPARATOR.split(command):
+            try:
+                tokens = shlex.split(segment)
+            except ValueError:
+                tokens = segment.split()
+            tokens = [token for token in tokens if not ASSIGNMENT.match(token)]
+            if tokens and tokens[0] not in names:
+                names.append(tokens[0])
+        return names
+
+    def toolchains(self, command: str) -> List[str]:
+        """Return the toolchains whose version affects the output of a command."""
+        names = []
+        for executable in self.executables(command):
+            for toolchain in TOOLCHAINS_BY_EXECUTABLE.get(executable, []):
+                if toolchain not in names:
+                    names.append(toolchain)
+        return names
+
+    def version(self, toolchain: str) -> str:
+        """
+        Return the version string of a toolchain, probing it again only when its executable changed.
+
+        Args:
+            toolchain: Executable name of the toolchain (e.g. npm)
+
+        Returns:
+            First line printed by the version command, or "missing"/"unknown"
+        """
+        stamp = self._stamp(toolchain)
+        with self._lock:
+            cached = self._versions.get(toolchain)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+
+        if stamp is None:
+            version = "missing"
+        else:
+            arguments = VERSION_ARGUMENTS.get(toolchain, ["--version"])
+            try:
+                result = subprocess.run([toolchain, *arguments], capture_output=True, text=True, timeout=60)
+                output = (result.stdout or result.stderr).strip()
+                version = output.splitlines()[0] if output else "unknown"
+            except (OSError, subprocess.SubprocessError) as e:
+                self.logger.debug(f"Could not probe the version of {toolchain}: {str(e)}")
+                version = "unknown"
+
+        with self._lock:
+            self._versions[toolchain] = (stamp, version)
+        return version
+
+    def _stamp(self, toolchain: str) -> Optional[Tuple[str, int]]:
+        """Return the resolved path and modification time of a toolchain's executable, or None if missing."""
+        path = shutil.which(toolchain)
+        if path is None:
+            return None
+        path = os.path.realpath(path)
+        try:
+            return path, os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+
+    def versions_for_command(self, command: str) -> Dict[str, str]:
+        """
+        Probe the versions of every toolchain used by a command.
+
+        Returns:
+            Dictionary mapping each toolchain to its version
+        """
+        return {toolchain: self.version(toolchain) for toolchain in self.toolchains(command)}
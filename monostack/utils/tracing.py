@@ -0,0 +1,215 @@
+"""
+Module providing lightweight span tracing of the generation phases.
+
+Tracing is disabled by default and costs a global lookup per traced call. Once
+enabled (``--trace out.json``), every span records its start, duration, thread
+and attributes (module, framework, bytes written, cache hit...), and the
+tracer writes them as a Chrome trace-event file, which Perfetto
+(https://ui.perfetto.dev) and chrome://tracing can load.
+"""
+import os
+import json
+import time
+import inspect
+import functools
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+# The active tracer, None while tracing is disabled
+_tracer: Optional["Tracer"] = None
+_local = threading.local()
+
+class Span:
+    """
+    A timed operation with attributes.
+    """
+    def __init__(self, name: str, attributes: Dict[str, Any]):
+        """
+        Initialize the Span.
+        
+        Args:
+            name: Name of the operation (e.g. initialize_project)
+            attributes: Initial attributes of the span
+        """
+        self.name = name
+        self.attributes = dict(attributes)
+        self.thread_id = threading.get_ident()
+        self.start = 0.0
+        self.end = 0.0
+        
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute of the span."""
+        self.attributes[key] = value
+        
+    def add(self, key: str, amount: int) -> None:
+        """Add to a counter attribute of the span (e.g. bytes_written)."""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+class NoopSpan:
+    """
+    Span returned while tracing is disabled; its methods do nothing.
+    """
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Ignore the attribute."""
+        
+    def add(self, key: str, amount: int) -> None:
+        """Ignore the counter."""
+
+NOOP_SPAN = NoopSpan()
+
+class Tracer:
+    """
+    Collects the spans of every thread of the process.
+    """
+    def __init__(self):
+        """Initialize the Tracer; span timestamps are relative to its creation."""
+        self.origin = time.perf_counter()
+        self.spans: List[Span] = []
+        self._thread_names: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """
+        Time a block of code as a span, nested in the current span of the thread.
+        
+        Args:
+            name: Name of the operation
+            attributes: Initial attributes of the span
+            
+        Yields:
+            The Span, to add attributes known only once the work is done
+        """
+        span = Span(name, attributes)
+        stack = _span_stack()
+        stack.append(span)
+        span.start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.set_attribute("error", type(e).__name__)
+            raise
+        finally:
+            span.end = time.perf_counter()
+            stack.pop()
+            with self._lock:
+                self.spans.append(span)
+                self._thread_names.setdefault(span.thread_id, threading.current_thread().name)
+                
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Convert the spans to the Chrome trace-event format.
+        
+        Returns:
+            Dictionary with the "traceEvents" list: one complete ("X") event per
+            span, plus metadata events naming the process and its threads
+        """
+        pid = os.getpid()
+        with self._lock:
+            spans = sorted(self.spans, key=lambda span: span.start)
+            thread_names = dict(self._thread_names)
+            
+        # Chrome expects small thread ids; number the threads in order of first appearance
+        thread_ids: Dict[int, int] = {}
+        for span in spans:
+            thread_ids.setdefault(span.thread_id, len(thread_ids) + 1)
+            
+        events = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "monostack"}}]
+        for thread_id, tid in thread_ids.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": thread_names.get(thread_id, str(thread_id))}})
+        for span in spans:
+            events.append({
+                "name": span.name,
+                "cat": "monostack",
+                "ph": "X",
+                "ts": round((span.start - self.origin) * 1e6, 3),
+                "dur": round((span.end - span.start) * 1e6, 3),
+                "pid": pid,
+                "tid": thread_ids[span.thread_id],
+                "args": span.attributes,
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+        
+    def write(self, path: str) -> None:
+        """Write the spans to a Chrome trace-event JSON file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f, default=str)
+
+def _span_stack() -> List[Span]:
+    """Return the stack of open spans of the current thread."""
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+def enable_tracing() -> Tracer:
+    """Start collecting spans in a new process-wide Tracer and return it."""
+    global _tracer
+    _tracer = Tracer()
+    return _tracer
+
+def disable_tracing() -> Optional[Tracer]:
+    """Stop collecting spans and return the Tracer that was active, if any."""
+    global _tracer
+    tracer, _tracer = _tracer, None
+    return tracer
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the active Tracer, or None while tracing is disabled."""
+    return _tracer
+
+@contextmanager
+def trace_span(name: str, **attributes: Any) -> Iterator[Any]:
+    """
+    Time a block of code as a span if tracing is enabled.
+    
+    Yields:
+        The Span, or NOOP_SPAN while tracing is disabled
+    """
+    tracer = _tracer
+    if tracer is None:
+        yield NOOP_SPAN
+        return
+    with tracer.span(name, **attributes) as span:
+        yield span
+
+def current_span() -> Any:
+    """Return the innermost open span of the current thread, or NOOP_SPAN."""
+    if _tracer is None:
+        return NOOP_SPAN
+    stack = _span_stack()
+    return stack[-1] if stack else NOOP_SPAN
+
+def traced(name: str, *argument_names: str) -> Callable:
+    """
+    Decorate a function so each call is a span.
+    
+    Args:
+        name: Name of the spans
+        argument_names: Arguments of the function recorded as span attributes
+        
+    Returns:
+        The decorator; boolean results are recorded as the "success" attribute
+    """
+    def decorator(function: Callable) -> Callable:
+        signature = inspect.signature(function)
+        
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracer = _tracer
+            if tracer is None:
+                return function(*args, **kwargs)
+                
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            attributes = {key: arguments[key] for key in argument_names if key in arguments}
+            with tracer.span(name, **attributes) as span:
+                result = function(*args, **kwargs)
+                if isinstance(result, bool):
+                    span.set_attribute("success", result)
+                return result
+        return wrapper
+    return decorator
@@ -0,0 +1,303 @@
+"""
+Module removing directories without making the caller wait for the deletion.
+
+Installation commands start with ``rm -rf ${module}``: on regeneration, that
+deletes a previous node_modules, target or venv, often hundreds of thousands
+of inodes, before the installer can start. Instead, the directory is renamed
+into a trash directory on the same filesystem, which is instantaneous, and
+deleted by background threads walking it with os.scandir in parallel.
+
+The deletion threads are not daemons: a process, batch worker or server waits
+for its deletions before exiting. Trash directories are recorded in the monostack
+cache, so `monostack gc` can finish the deletions of processes that were killed
+or crashed before completing them.
+"""
+import os
+import re
+import stat
+import shutil
+import logging
+import tempfile
+import threading
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent processes are not coordinated
+    fcntl = None
+
+from .cache_dir import get_cache_dir
+
+# Name of the trash directory created next to the projects
+TRASH_DIR_NAME = ".monostack-trash"
+
+# Leading "rm -rf <names> && <rest>" of an installation command
+RM_PREFIX_PATTERN = re.compile(r"^\s*rm\s+(?:-rf|-fr|-r\s+-f|-f\s+-r)\s+(?P<paths>[^&;|]+?)\s*&&\s*(?P<rest>.+)$",
+                               re.DOTALL)
+# Plain names of the working directory; anything with variables, globs or slashes is left to the shell
+SAFE_NAME_PATTERN = re.compile(r"^[\w.-]+$")
+
+# Subdirectories up to this depth are deleted as separate parallel jobs (node_modules/<package>)
+PARALLEL_DEPTH = 2
+
+def split_rm_prefix(command: str) -> Optional[Tuple[List[str], str]]:
+    """
+    Split the leading ``rm -rf`` of an installation command.
+    
+    Args:
+        command: The rendered installation command
+        
+    Returns:
+        The removed names and the rest of the command, or None if the command does
+        not start with a removal of plain names
+    """
+    match = RM_PREFIX_PATTERN.match(command)
+    if not match:
+        return None
+    names = match.group("paths").split()
+    if any(not SAFE_NAME_PATTERN.match(name) or name in (".", "..") for name in names):
+        return None
+    return names, match.group("rest")
+
+def _delete_tree(path: str) -> int:
+    """Delete a directory tree depth-first with os.scandir, returning the number of files removed."""
+    removed = 0
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    removed += _delete_tree(entry.path)
+                else:
+                    removed += _unlink(entry.path)
+        os.rmdir(path)
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        # Read-only directories (some npm packages) cannot have their entries removed
+        os.chmod(path, stat.S_IRWXU)
+        shutil.rmtree(path, ignore_errors=True)
+    return removed
+
+def _unlink(path: str) -> int:
+    """Remove a file or symbolic link, returning 1 if it was removed."""
+    try:
+        os.unlink(path)
+        return 1
+    except FileNotFoundError:
+        return 0
+
+class Trash:
+    """
+    Moves directories into trash directories and deletes them in the background.
+    """
+    def __init__(self, workers: Optional[int] = None, registry_path: Optional[str] = None):
+        """
+        Initialize the Trash.
+        
+        Args:
+            workers: Number of threads deleting trashed trees (default: twice the CPU count, at most 16)
+            registry_path: File listing the trash directories in use (default: <monostack cache>/trash-dirs)
+        """
+        self.logger = logging.getLogger(__name__)
+        self.workers = workers or min(16, 2 * (os.cpu_count() or 1))
+        self.registry_path = registry_path or get_cache_dir("trash-dirs")
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        
+    def discard(self, path: str, trash_dir: str) -> bool:
+        """
+        Move a directory into a trash directory and start deleting it in the background.
+        
+        Args:
+            path: The directory to remove
+            trash_dir: Trash directory, which must be on the same filesystem
+            
+        Returns:
+            True if the directory was moved, False if it was left in place for the caller
+            to remove: missing, empty, a symbolic link or on another filesystem
+        """
+        if not os.path.isdir(path) or os.path.islink(path):
+            return False
+        with os.scandir(path) as entries:
+            if next(entries, None) is None:
+                # Removing an empty directory is as fast as renaming it
+                return False
+                
+        try:
+            os.makedirs(trash_dir, exist_ok=True)
+            self._register(trash_dir)
+            entry_dir = tempfile.mkdtemp(prefix=f"{os.path.basename(path)}-", dir=trash_dir)
+            os.rename(path, os.path.join(entry_dir, os.path.basename(path)))
+        except OSError as e:
+            # e.g. EXDEV when the trash directory is on another filesystem
+            self.logger.debug(f"Could not move {path} to {trash_dir}: {str(e)}")
+            return False
+            
+        self.logger.debug(f"Moved {path} to the trash, deleting it in the background")
+        thread = threading.Thread(target=self.delete, args=(entry_dir,), name="monostack-trash")
+        with self._lock:
+            self._pending = [pending for pending in self._pending if pending.is_alive()]
+            self._pending.append(thread)
+        thread.start()
+        return True
+        
+    def delete(self, path: str) -> int:
+        """
+        Delete a directory tree, its first levels of subdirectories in parallel.
+        
+        Args:
+            path: The directory to delete
+            
+        Returns:
+            Number of files removed
+        """
+        # Walk the first levels here, so the worker threads only delete independent subtrees
+        removed = 0
+        directories = []
+        level = [path]
+        for _ in range(PARALLEL_DEPTH):
+            directories.extend(level)
+            next_level = []
+            for directory in level:
+                try:
+                    with os.scandir(directory) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                next_level.append(entry.path)
+                            else:
+                                removed += _unlink(entry.path)
+                except OSError:
+                    continue
+            level = next_level
+        subtrees = level
+        
+        if subtrees:
+            futures = []
+            for subtree in subtrees:
+                try:
+                    futures.append(self._get_executor().submit(_delete_tree, subtree))
+                except RuntimeError:
+                    # The interpreter is exiting and joining this thread: no new work can be scheduled
+                    removed += _delete_tree(subtree)
+            wait(futures)
+            removed += sum(future.result() for future in futures if not future.exception())
+            
+        # The directories of the first levels are empty now; remove them deepest first
+        for directory in reversed(directories):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                shutil.rmtree(directory, ignore_errors=True)
+        return removed
+        
+    def pending(self) -> int:
+        """Return the number of trashed directories still being deleted."""
+        with self._lock:
+            return sum(1 for thread in self._pending if thread.is_alive())
+            
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the background deletions.
+        
+        Args:
+            timeout: Maximum number of seconds to wait for each deletion (default: no limit)
+            
+        Returns:
+            True if every deletion finished
+        """
+        with self._lock:
+            threads = list(self._pending)
+        for thread in threads:
+            thread.join(timeout)
+        return self.pending() == 0
+        
+    def collect_garbage(self) -> Dict[str, int]:
+        """
+        Delete the content of every known trash directory, including what processes that
+        exited early left behind, and forget the trash directories that no longer exist.
+        
+        Returns:
+            Dictionary with the number of trash directories, deleted entries and files removed
+        """
+        summary = {"trash_dirs": 0, "entries": 0, "files": 0}
+        for trash_dir in self.trash_dirs():
+            if not os.path.isdir(trash_dir):
+                continue
+            summary["trash_dirs"] += 1
+            for name in os.listdir(trash_dir):
+                summary["files"] += self.delete(os.path.join(trash_dir, name))
+                summary["entries"] += 1
+            try:
+                os.rmdir(trash_dir)
+            except OSError:
+                # In use by another generation
+                pass
+                
+        # Other processes may have registered trash directories meanwhile: only the deleted ones are forgotten
+        with self._registry_lock():
+            kept = [trash_dir for trash_dir in self.trash_dirs() if os.path.isdir(trash_dir)]
+            staging_fd, staging_path = tempfile.mkstemp(prefix=".trash-dirs-",
+                                                        dir=os.path.dirname(self.registry_path))
+            try:
+                with os.fdopen(staging_fd, "w") as f:
+                    f.writelines(f"{trash_dir}\n" for trash_dir in kept)
+                os.replace(staging_path, self.registry_path)
+            except OSError:
+                os.unlink(staging_path)
+                raise
+        return summary
+        
+    def trash_dirs(self) -> List[str]:
+        """Return the trash directories recorded in the registry."""
+        try:
+            with open(self.registry_path, "r") as f:
+                return list(dict.fromkeys(line.strip() for line in f if line.strip()))
+        except FileNotFoundError:
+            return []
+            
+    def _register(self, trash_dir: str) -> None:
+        """Record a trash directory in the registry, for the gc command."""
+        trash_dir = os.path.abspath(trash_dir)
+        with self._registry_lock():
+            if trash_dir in self.trash_dirs():
+                return
+            with open(self.registry_path, "a") as f:
+                f.write(f"{trash_dir}\n")
+                
+    @contextmanager
+    def _registry_lock(self) -> Iterator[None]:
+        """Hold an exclusive lock on the registry, across threads and processes."""
+        os.makedirs(os.path.dirname(self.registry_path), exist_ok=True)
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+                
+            with open(f"{self.registry_path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Return the pool of deletion threads, created on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="monostack-trash")
+            return self._executor
+
+# Shared by every ProjectGenerator of the process
+_trash: Optional[Trash] = None
+_trash_lock = threading.Lock()
+
+def get_trash() -> Trash:
+    """Return the process-wide Trash."""
+    global _trash
+    with _trash_lock:
+        if _trash is None:
+            _trash = Trash()
+        return _trash
@@ -0,0 +1,225 @@
+"""
+Module providing the strategies used to create Python virtual environments.
+
+Backends, fastest first:
+
+- uv: ``uv venv`` then ``uv pip install pip``, both served from uv's cache
+- venv: stdlib ``venv --without-pip``, then pip is seeded from the interpreter's
+  bundled pip wheel, extracted once to the monostack cache and cloned into each
+  environment (reflinks when the filesystem supports them), which stays usable
+  without the cache
+- virtualenv: ``virtualenv`` with its app-data seeding cache
+"""
+import os
+import sys
+import glob
+import time
+import shutil
+import logging
+import zipfile
+import tempfile
+import subprocess
+import importlib.util
+from typing import Dict, List, Optional
+
+from .cache_dir import get_cache_dir
+from .file_clone import FileCloner
+
+# Environment variable selecting a backend instead of the fastest available one
+VENV_BACKEND_ENV = "MONOSTACK_VENV_BACKEND"
+
+def venv_python(venv_path: str) -> str:
+    """Return the path of the Python executable of a virtual environment."""
+    if os.name == 'nt':
+        return os.path.join(venv_path, "Scripts", "python.exe")
+    return os.path.join(venv_path, "bin", "python")
+
+class VenvBackend:
+    """
+    Base class of the virtual environment creation strategies.
+    """
+    name = ""
+    
+    def __init__(self):
+        """Initialize the VenvBackend with a logger."""
+        self.logger = logging.getLogger(__name__)
+        
+    def is_available(self) -> bool:
+        """Check whether the backend can be used on this machine."""
+        raise NotImplementedError
+        
+    def create(self, venv_path: str) -> Dict[str, float]:
+        """
+        Create a virtual environment with pip available.
+        
+        Args:
+            venv_path: Directory of the new environment
+            
+        Returns:
+            Duration in seconds of each creation phase (e.g. create, seed)
+            
+        Raises:
+            subprocess.CalledProcessError: If a creation command fails
+        """
+        raise NotImplementedError
+        
+    def install_command(self, venv_path: str, packages: List[str]) -> List[str]:
+        """Return the command installing packages into a virtual environment."""
+        return [venv_python(venv_path), "-m", "pip", "install", *packages]
+        
+    def _run(self, command: List[str]) -> None:
+        """Run a command, raising CalledProcessError with its output on failure."""
+        subprocess.run(command, check=True, capture_output=True, text=True)
+
+class UvBackend(VenvBackend):
+    """
+    Creates environments with uv.
+    """
+    name = "uv"
+    
+    def is_available(self) -> bool:
+        """Check whether uv is installed."""
+        return shutil.which("uv") is not None
+        
+    def create(self, venv_path: str) -> Dict[str, float]:
+        """Create the environment with uv venv, then install pip into it from uv's cache."""
+        timings = {}
+        start = time.monotonic()
+        self._run(["uv", "venv", "--quiet", "--python", sys.executable, venv_path])
+        timings["create"] = time.monotonic() - start
+        
+        start = time.monotonic()
+        self._run(["uv", "pip", "install", "--quiet", "--python", venv_python(venv_path), "pip"])
+        timings["seed"] = time.monotonic() - start
+        return timings
+        
+    def install_command(self, venv_path: str, packages: List[str]) -> List[str]:
+        """Install packages with uv pip."""
+        return ["uv", "pip", "install", "--python", venv_python(venv_path), *packages]
+
+class StdlibVenvBackend(VenvBackend):
+    """
+    Creates environments with the stdlib venv module and a clone of a pre-extracted pip.
+    """
+    name = "venv"
+    
+    def is_available(self) -> bool:
+        """Check whether the interpreter ships a pip wheel to seed environments with."""
+        return self._bundled_pip_wheel() is not None
+        
+    def create(self, venv_path: str) -> Dict[str, float]:
+        """Create the environment without pip, then clone the cached pip into it."""
+        timings = {}
+        start = time.monotonic()
+        self._run([sys.executable, "-m", "venv", "--without-pip", venv_path])
+        timings["create"] = time.monotonic() - start
+        
+        start = time.monotonic()
+        if os.name == 'nt':
+            self._run([venv_python(venv_path), "-m", "ensurepip", "--default-pip"])
+        else:
+            self._seed_pip(venv_path)
+        timings["seed"] = time.monotonic() - start
+        return timings
+        
+    def _bundled_pip_wheel(self) -> Optional[str]:
+        """Return the pip wheel bundled with the interpreter's ensurepip, if any."""
+        spec = importlib.util.find_spec("ensurepip")
+        if spec is None or not spec.origin:
+            return None
+        wheels = sorted(glob.glob(os.path.join(os.path.dirname(spec.origin), "_bundled", "pip-*.whl")))
+        return wheels[-1] if wheels else None
+        
+    def _seed_pip(self, venv_path: str) -> None:
+        """Clone the cached pip into the site-packages of the environment and add pip scripts."""
+        pip_dir = self._extracted_pip()
+        version = f"{sys.version_info.major}.{sys.version_info.minor}"
+        site_packages = os.path.join(venv_path, "lib", f"python{version}", "site-packages")
+        os.makedirs(site_packages, exist_ok=True)
+        cloner = FileCloner()
+        for name in os.listdir(pip_dir):
+            cloner.copy_tree(os.path.join(pip_dir, name), os.path.join(site_packages, name))
+            
+        script = f"#!{venv_python(venv_path)}\nimport sys\nfrom pip._internal.cli.main import main\nsys.exit(main())\n"
+        for name in ["pip", f"pip{sys.version_info.major}", f"pip{version}"]:
+            script_path = os.path.join(venv_path, "bin", name)
+            with open(script_path, "w") as f:
+                f.write(script)
+            os.chmod(script_path, 0o755)
+            
+    def _extracted_pip(self) -> str:
+        """Extract the bundled pip wheel to the cache once and return its directory."""
+        wheel = self._bundled_pip_wheel()
+        pip_dir = get_cache_dir("venv", os.path.basename(wheel)[:-len(".whl")])
+        if os.path.isdir(pip_dir):
+            return pip_dir
+            
+        parent_dir = os.path.dirname(pip_dir)
+        os.makedirs(parent_dir, exist_ok=True)
+        staging_dir = tempfile.mkdtemp(prefix="pip-", dir=parent_dir)
+        try:
+            with zipfile.ZipFile(wheel) as archive:
+                archive.extractall(staging_dir)
+            try:
+                os.rename(staging_dir, pip_dir)
+            except OSError:
+                # Another process extracted it first
+                if not os.path.isdir(pip_dir):
+                    raise
+        finally:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        self.logger.debug(f"Extracted {os.path.basename(wheel)} to {pip_dir}")
+        return pip_dir
+
+class VirtualenvBackend(VenvBackend):
+    """
+    Creates environments with virtualenv, seeded from its app-data cache.
+    """
+    name = "virtualenv"
+    
+    def is_available(self) -> bool:
+        """Check whether virtualenv is installed for this interpreter."""
+        return importlib.util.find_spec("virtualenv") is not None
+        
+    def create(self, venv_path: str) -> Dict[str, float]:
+        """Create the environment with virtualenv; seeding happens during creation."""
+        start = time.monotonic()
+        self._run([sys.executable, "-m", "virtualenv", "--quiet", "--app-data", get_cache_dir("virtualenv"),
+                   "--no-setuptools", "--no-wheel", venv_path])
+        return {"create": time.monotonic() - start}
+
+# Backends in order of preference, fastest first
+BACKENDS = [UvBackend, StdlibVenvBackend, VirtualenvBackend]
+
+def available_backends() -> List[VenvBackend]:
+    """Return an instance of every backend usable on this machine, fastest first."""
+    return [backend for backend in (cls() for cls in BACKENDS) if backend.is_available()]
+
+def select_backend(name: Optional[str] = None) -> VenvBackend:
+    """
+    Select the backend used to create virtual environments.
+    
+    Args:
+        name: Backend name (uv, venv or virtualenv); "auto" or None picks the fastest
+              available one, unless $MONOSTACK_VENV_BACKEND names one
+              
+    Returns:
+        The backend
+        
+    Raises:
+        ValueError: If the requested backend is unknown or not available
+    """
+    name = name if name and name != "auto" else os.environ.get(VENV_BACKEND_ENV, "auto")
+    if name == "auto":
+        backends = available_backends()
+        if not backends:
+            raise ValueError("No virtual environment backend is available (install uv or virtualenv)")
+        return backends[0]
+        
+    for cls in BACKENDS:
+        if cls.name == name:
+            backend = cls()
+            if not backend.is_available():
+                raise ValueError(f"The {name} virtual environment backend is not available")
+            return backend
+    raise ValueError(f"Unknown virtual environment backend: {name}")
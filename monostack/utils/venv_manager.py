@@ -1,43 +1,154 @@
 import os
+import re
+import time
+import shutil
 import logging
 import subprocess
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, NamedTuple, Union
+
+from .venv_backends import VenvBackend, select_backend, venv_python
+from .golden_venv import GoldenVenvLibrary
+
+# Installation commands creating a virtual environment in the module directory, e.g.
+# "mkdir m && cd m && python -m venv venv && source venv/bin/activate && pip install flask"
+VENV_COMMAND_PATTERN = re.compile(
+    r"^(?P<prefix>.*&&\s*cd\s+(?P<directory>[^\s&;|]+))\s*&&\s*python3?\s+-m\s+venv\s+(?P<name>[\w.-]+)"
+    r"\s*&&\s*source\s+(?P=name)/bin/activate"
+    r"(?:\s*&&\s*pip3?\s+install\s+(?P<packages>[\w.\[\],=<>~ -]+?))?"
+    r"(?:\s*&&\s*(?P<rest>.+))?\s*$"
+)
+
+class VenvCommand(NamedTuple):
+    """An installation command split around its virtual environment creation."""
+    prefix: str
+    directory: str
+    venv_name: str
+    requirements: List[str]
+    rest: Optional[str]
+
+def split_venv_command(command: str) -> Optional[VenvCommand]:
+    """
+    Split an installation command that creates a virtual environment and installs packages into it.
+    
+    Args:
+        command: The rendered installation command
+        
+    Returns:
+        The parts of the command, or None if it does not follow the
+        "cd <dir> && python -m venv <name> && source <name>/bin/activate" form
+    """
+    match = VENV_COMMAND_PATTERN.match(command.strip())
+    if not match:
+        return None
+    requirements = (match.group("packages") or "").split()
+    if any(requirement.startswith("-") for requirement in requirements):
+        return None
+    return VenvCommand(match.group("prefix"), match.group("directory"), match.group("name"),
+                       requirements, match.group("rest"))
 
 class VenvManager:
     """
     Manages creation and usage of virtual environments for different project types.
     Provides isolation for project dependencies.
     """
-    def __init__(self):
-        """Initialize the VenvManager with a logger."""
+    def __init__(self, backend: Optional[Union[str, VenvBackend]] = None, golden: bool = True,
+                 golden_dir: Optional[str] = None):
+        """
+        Initialize the VenvManager.
+        
+        Args:
+            backend: Name of the creation backend (uv, venv, virtualenv or auto for the fastest available),
+                     or a VenvBackend instance
+            golden: Whether environments with requirements are cloned from the golden environment library
+            golden_dir: Directory of the golden environment library (default: <monostack cache>/golden-venvs)
+        """
         self.logger = logging.getLogger(__name__)
+        self._backend: Optional[VenvBackend] = backend if isinstance(backend, VenvBackend) else None
+        self.backend_name = self._backend.name if self._backend else backend
+        self.reports: Dict[str, Dict[str, Any]] = {}
+        self.golden_library = GoldenVenvLibrary(golden_dir) if golden and GoldenVenvLibrary.is_supported() else None
     
-    def create_venv(self, project_path: str, venv_name: str = "venv") -> bool:
+    @property
+    def backend(self) -> VenvBackend:
+        """The creation backend, selected on first use."""
+        if self._backend is None:
+            self._backend = select_backend(self.backend_name)
+            self.logger.debug(f"Using the {self._backend.name} virtual environment backend")
+        return self._backend
+    
+    def find_venv(self, project_path: str, venv_name: str = "venv") -> Optional[str]:
         """
-        Create a virtual environment in the specified project directory.
+        Find a usable virtual environment in a project directory.
+        
+        The named environment is preferred, but one created by the installation
+        command under another name (e.g. .venv or env) is found as well.
+        
+        Args:
+            project_path: The project directory path
+            venv_name: Preferred name of the virtual environment directory
+            
+        Returns:
+            Path of the environment, or None if the project has none
+        """
+        candidates = [venv_name]
+        try:
+            candidates.extend(sorted(name for name in os.listdir(project_path) if name != venv_name))
+        except OSError:
+            return None
+        
+        for name in candidates:
+            venv_path = os.path.join(project_path, name)
+            if os.path.isfile(os.path.join(venv_path, "pyvenv.cfg")) and os.path.exists(venv_python(venv_path)):
+                return venv_path
+        return None
+    
+    def create_venv(self, project_path: str, venv_name: str = "venv",
+                    requirements: Optional[List[str]] = None) -> bool:
+        """
+        Create a virtual environment in the specified project directory, unless it already has one.
+        
+        Environments with requirements are cloned from the golden environment library,
+        which builds each interpreter and requirement set once. Without the library, or
+        if cloning fails, the environment is created and the requirements are installed.
+        The backend used and the duration of each phase are recorded in
+        ``self.reports[project_path]``.
         
         Args:
             project_path: The project directory path
             venv_name: Name of the virtual environment directory
+            requirements: Optional packages to install in the new environment
             
         Returns:
             True if successful, False otherwise
         """
+        start = time.monotonic()
         try:
+            existing = self.find_venv(project_path, venv_name)
+            if existing:
+                self.logger.info(f"Reusing the virtual environment at {existing}")
+                self.reports[project_path] = {"path": existing, "backend": None, "reused": True,
+                                              "phases": {"detect": time.monotonic() - start}}
+                return True
+            
             venv_path = os.path.join(project_path, venv_name)
-            self.logger.info(f"Creating virtual environment at {venv_path}")
+            phases = {"detect": time.monotonic() - start}
+            backend = self.backend
             
-            # Use virtualenv to create the environment
-            result = subprocess.run(
-                f"python -m virtualenv {venv_path}",
-                shell=True,
-                check=True,
-                cwd=project_path,
-                capture_output=True,
-                text=True
-            )
+            if requirements and self.golden_library and self._clone_golden(venv_path, requirements, phases):
+                backend_name = "golden"
+            else:
+                self.logger.info(f"Creating virtual environment at {venv_path} with {backend.name}")
+                phases.update(backend.create(venv_path))
+                if requirements:
+                    install_start = time.monotonic()
+                    self._install(venv_path, requirements)
+                    phases["install"] = time.monotonic() - install_start
+                backend_name = backend.name
             
-            self.logger.debug(f"Virtual environment created at {venv_path}")
+            self.reports[project_path] = {"path": venv_path, "backend": backend_name, "reused": False,
+                                          "phases": phases}
+            self.logger.info(f"Virtual environment created at {venv_path} in {time.monotonic() - start:.2f}s "
+                              f"({', '.join(f'{phase} {duration:.2f}s' for phase, duration in phases.items())})")
             return True
             
         except subprocess.CalledProcessError as e:
@@ -48,6 +159,38 @@ class VenvManager:
             self.logger.error(f"Unexpected error creating virtual environment: {str(e)}")
             return False
     
+    def _clone_golden(self, venv_path: str, requirements: List[str], phases: Dict[str, float]) -> bool:
+        """Clone the golden environment of a requirement set, building it first if needed."""
+        try:
+            key = self.golden_library.make_key(requirements)
+            if not self.golden_library.has(key):
+                build_start = time.monotonic()
+                self.logger.info(f"Building a golden virtual environment for {' '.join(requirements)}")
+                self.golden_library.build(key, requirements, lambda path: self._create_with(path, requirements))
+                phases["build"] = time.monotonic() - build_start
+            
+            clone_start = time.monotonic()
+            if not self.golden_library.clone(key, venv_path):
+                return False
+            phases["clone"] = time.monotonic() - clone_start
+            self.logger.info(f"Cloned virtual environment at {venv_path} from the golden library")
+            return True
+            
+        except Exception as e:
+            self.logger.warning(f"Could not clone a golden virtual environment, creating it instead: {str(e)}")
+            shutil.rmtree(venv_path, ignore_errors=True)
+            return False
+    
+    def _create_with(self, venv_path: str, requirements: List[str]) -> None:
+        """Create an environment with the backend and install requirements into it."""
+        self.backend.create(venv_path)
+        self._install(venv_path, requirements)
+    
+    def _install(self, venv_path: str, requirements: List[str]) -> None:
+        """Install requirements into an environment, raising CalledProcessError on failure."""
+        subprocess.run(self.backend.install_command(venv_path, requirements), check=True,
+                       capture_output=True, text=True)
+    
     def install_requirements(self, project_path: str, requirements: List[str], 
                              venv_name: str = "venv") -> bool:
         """
@@ -62,27 +205,21 @@ class VenvManager:
             True if successful, False otherwise
         """
         try:
-            venv_path = os.path.join(project_path, venv_name)
+            venv_path = self.find_venv(project_path, venv_name) or os.path.join(project_path, venv_name)
             requirements_str = " ".join(requirements)
             
-            # Source the virtual environment and install packages
-            if os.name == 'nt':  # Windows
-                activate_script = os.path.join(venv_path, "Scripts", "activate")
-                command = f"{activate_script} && pip install {requirements_str}"
-            else:  # Unix-like
-                activate_script = os.path.join(venv_path, "bin", "activate")
-                command = f"source {activate_script} && pip install {requirements_str}"
-            
             self.logger.info(f"Installing packages: {requirements_str}")
-            result = subprocess.run(
-                command,
-                shell=True,
+            start = time.monotonic()
+            subprocess.run(
+                self.backend.install_command(venv_path, requirements),
                 check=True,
                 cwd=project_path,
                 capture_output=True,
                 text=True
             )
             
+            report = self.reports.setdefault(project_path, {"path": venv_path, "phases": {}})
+            report["phases"]["install"] = time.monotonic() - start
             self.logger.debug(f"Packages installed successfully: {requirements_str}")
             return True
             
@@ -94,6 +231,14 @@ class VenvManager:
             self.logger.error(f"Unexpected error installing packages: {str(e)}")
             return False
     
+    def venv_environment(self, venv_path: str) -> Dict[str, str]:
+        """Return the environment variables of a shell where a virtual environment is activated."""
+        env = dict(os.environ)
+        env.pop("PYTHONHOME", None)
+        env["VIRTUAL_ENV"] = venv_path
+        env["PATH"] = os.pathsep.join([os.path.dirname(venv_python(venv_path)), env.get("PATH", "")])
+        return env
+    
     def run_in_venv(self, project_path: str, command: str, venv_name: str = "venv") -> subprocess.CompletedProcess:
         """
         Run a command within the virtual environment.
@@ -1,11 +1,41 @@
 import unittest
 import os
 import json
+import glob
+import zipfile
+import sys
 import shutil
+import time
+import tempfile
+import threading
+import asyncio
+import subprocess
 import logging
+import yaml
+from unittest import mock
 
 from monostack.config.config_manager import ConfigManager
+from monostack.config.catalog import get_catalog, load_catalog
 from monostack.core.project_generator import ProjectGenerator
+from monostack.core.task_graph import TaskGraph
+from monostack.core.batch_runner import BatchRunner
+from monostack.core.speculative import SpeculativeInstaller
+from monostack.core.server import GenerationServer, send_request
+from monostack.utils.async_command_runner import AsyncCommandRunner
+from monostack.utils.command_runner import CommandRunner
+from monostack.utils.scaffold_cache import ScaffoldCache
+from monostack.utils.file_index import FileIndex
+from monostack.utils.venv_manager import VenvManager
+from monostack.utils.gitignore_generator import GitignoreGenerator, PatternMerger
+from monostack.utils.gitignore_matcher import GitignoreMatcher
+from monostack.utils.package_store import PackageStore
+from monostack.utils.run_history import RunHistory
+from monostack.utils.tracing import enable_tracing, disable_tracing
+from monostack.utils.accelerators import Accelerator
+from monostack.utils.ecosystem_caches import CLOCK_SLACK, MAVEN_LOCKING_OPTIONS, EcosystemCaches
+from monostack.utils.js_workspace import defer_installs, workspace_modules
+from monostack.utils.install_steps import convert_command, format_steps, parse_steps
+from monostack.utils.trash import TRASH_DIR_NAME, Trash, split_rm_prefix
 
 # Disable logging for tests
 logging.basicConfig(level=logging.ERROR)
@@ -31,6 +61,31 @@ class TestMonostack(unittest.TestCase):
         self.assertIn("backend", technologies)
         self.assertIn("frontend-web", technologies)
     
+    def test_technology_catalog(self):
+        """Test the indexed catalog and its compiled cache."""
+        catalog = self.config_manager.load_catalog()
+        self.assertIs(catalog, ConfigManager().load_catalog())
+        self.assertIn("spring-boot", catalog.frameworks("backend", "java"))
+        self.assertIn(("backend", "express"), catalog.frameworks_for_language("javascript"))
+        self.assertIn("backend", [module for module, _ in catalog.languages_for_framework("spring-boot")])
+        self.assertEqual(catalog.command("databases", "redis", "install"),
+                         catalog.technologies["databases"]["redis"]["install"])
+        
+        source_path = os.path.join(self.base_dir, "install_commands.json")
+        cache_dir = os.path.join(self.base_dir, "catalog")
+        with open(source_path, "w") as f:
+            json.dump({"backend": {"go": {"gin": "go mod init ${module}"}}}, f)
+        self.assertEqual(load_catalog(source_path, cache_dir).command("backend", "go", "gin"), "go mod init ${module}")
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        
+        # A changed source invalidates the compiled catalog
+        with open(source_path, "w") as f:
+            json.dump({"backend": {"go": {"gin": "go mod init app", "fiber": "go mod init fiber"}}}, f)
+        os.utime(source_path, ns=(0, 0))
+        catalog = get_catalog(source_path, cache_dir)
+        self.assertEqual(catalog.command("backend", "go", "gin"), "go mod init app")
+        self.assertEqual(len(catalog), 2)
+    
     def test_load_docker_compose_template(self):
         """Test loading Docker Compose template."""
         template_content = self.config_manager.load_docker_compose_template()
@@ -71,9 +126,883 @@ class TestMonostack(unittest.TestCase):
             self.assertTrue(os.path.exists(os.path.join(self.base_dir, "infra", "docker-compose.yml")))
             self.assertTrue(os.path.exists(os.path.join(self.base_dir, "docs", "README.md")))
             
+            # Without Hello World examples, their generator is never loaded
+            self.assertIsNone(self.project_generator._hello_world_generator)
+            
         finally:
             # Restore the original command runner
             self.project_generator.command_runner.run = original_run
 
+    def test_install_modules_in_parallel(self):
+        """Test that module installations run concurrently and report per-module results."""
+        choices = {
+            "backend": {"language": "python", "framework": "flask"},
+            "frontend-web": {"language": "javascript", "framework": "react"},
+            "frontend-mobile": {"language": "javascript", "framework": "react-native"},
+            "frontend-desktop": {"language": "javascript", "framework": "electron"}
+        }
+        
+        def slow_initialize(base_dir, module, choice, install_commands, verbose=False, workspace=False):
+            time.sleep(0.3)
+            return module != "frontend-mobile"
+        
+        self.project_generator.initialize_project = slow_initialize
+        
+        start = time.monotonic()
+        with mock.patch.object(self.project_generator, "initialize_git_repo", return_value=True):
+            self.assertTrue(self.project_generator.create_project_structure(self.base_dir, choices))
+        elapsed = time.monotonic() - start
+        results = self.project_generator.module_results
+        
+        self.assertLess(elapsed, 0.9)
+        self.assertEqual(list(results.keys()), list(choices.keys()))
+        self.assertEqual(results["frontend-mobile"]["status"], "failed")
+        self.assertTrue(results["backend"]["success"])
+        
+        # With a single job and fail-fast, modules after the failing one are cancelled
+        self.assertFalse(self.project_generator.create_project_structure(self.base_dir, choices, jobs=1,
+                                                                         fail_fast=True))
+        results = self.project_generator.module_results
+        self.assertEqual(results["frontend-mobile"]["status"], "failed")
+        self.assertEqual(results["frontend-desktop"]["status"], "cancelled")
+
+    def test_task_graph_scheduling(self):
+        """Test that tasks start as soon as their own dependencies are done."""
+        events = []
+        
+        def step(name, delay=0.0):
+            def action():
+                time.sleep(delay)
+                events.append(name)
+                return True
+            return action
+        
+        graph = TaskGraph()
+        graph.add_task("install:backend", step("install:backend", 0.3), estimate=60.0, heavy=True)
+        graph.add_task("install:frontend-web", step("install:frontend-web", 0.05), estimate=30.0, heavy=True)
+        graph.add_task("hello-world:frontend-web", step("hello-world:frontend-web"),
+                       dependencies=["install:frontend-web"])
+        graph.add_task("docs", step("docs"))
+        graph.add_task("git", step("git"), dependencies=list(graph.tasks))
+        
+        path, total = graph.critical_path()
+        self.assertEqual(path, ["install:backend", "git"])
+        self.assertAlmostEqual(total, 60.1)
+        self.assertIn("Critical path", graph.format_plan())
+        
+        self.assertTrue(graph.run())
+        self.assertLess(events.index("hello-world:frontend-web"), events.index("install:backend"))
+        self.assertEqual(events[-1], "git")
+        
+        with self.assertRaises(ValueError):
+            graph.add_task("broken", step("broken"), dependencies=["missing"])
+
+    def test_run_history_scheduling(self):
+        """Test recording installations and starting the longest expected ones first."""
+        run_history = RunHistory(os.path.join(self.base_dir, "history.sqlite3"))
+        for duration in [10.0, 20.0, 30.0, 40.0]:
+            run_history.record("backend", "python", "flask", "pip install flask", duration, 0)
+        run_history.record("backend", "python", "flask", "pip install flask", 5.0, 1)
+        self.assertEqual(run_history.estimate("backend", "python", "flask"), 25.0)
+        self.assertIsNone(run_history.estimate("backend", "go", "gin"))
+        stats = run_history.framework_stats()
+        self.assertEqual((stats[0]["runs"], stats[0]["failures"], stats[0]["p50"]), (5, 1, 25.0))
+        self.assertAlmostEqual(stats[0]["p95"], 38.5)
+        
+        # Installations are recorded, failed ones included
+        project_generator = ProjectGenerator(run_history=run_history)
+        install_commands = {"frontend-web": {"javascript": {"ok": "mkdir -p ${module} && echo done",
+                                                            "broken": "exit 3"}}}
+        self.assertTrue(project_generator.initialize_project(
+            self.base_dir, "frontend-web", {"language": "javascript", "framework": "ok"}, install_commands))
+        self.assertFalse(project_generator.initialize_project(
+            self.base_dir, "frontend-web", {"language": "javascript", "framework": "broken"}, install_commands))
+        recorded = {group["framework"]: group for group in run_history.framework_stats()}
+        self.assertEqual((recorded["ok"]["runs"], recorded["ok"]["failures"]), (1, 0))
+        self.assertEqual((recorded["broken"]["runs"], recorded["broken"]["failures"]), (1, 1))
+        self.assertEqual(project_generator.estimate_install("backend", {"language": "python", "framework": "flask"}),
+                         25.0)
+        
+        # With a single job, the install expected to take longest starts first
+        started = []
+        graph = TaskGraph()
+        for name, estimate in [("install:a", 5.0), ("install:b", 50.0), ("install:c", 20.0)]:
+            graph.add_task(name, lambda name=name: started.append(name) or True, estimate=estimate, heavy=True)
+        self.assertEqual(graph.estimate_duration(jobs=1), 75.0)
+        self.assertEqual(graph.estimate_duration(), 50.0)
+        self.assertIn("ETA: 75.0s", graph.format_plan(jobs=1))
+        self.assertTrue(graph.run(jobs=1))
+        self.assertEqual(started, ["install:b", "install:c", "install:a"])
+    
+    def test_async_command_runner(self):
+        """Test concurrent draining of both streams and process group timeouts."""
+        runner = AsyncCommandRunner()
+        chatty = f"{sys.executable} -c \"import sys; sys.stderr.write('e' * 500000); print('done')\""
+        
+        results = asyncio.run(runner.run_many({"chatty": chatty, "failing": "exit 3"}, show_output=False))
+        self.assertEqual(results["chatty"].returncode, 0)
+        self.assertEqual(len(results["chatty"].stderr), 500000)
+        self.assertEqual(results["chatty"].stdout.strip(), "done")
+        self.assertEqual(results["failing"].returncode, 3)
+        
+        start = time.monotonic()
+        with self.assertRaises(subprocess.TimeoutExpired):
+            asyncio.run(runner.run("sleep 30 & sleep 30", timeout=0.5, show_output=False))
+        self.assertLess(time.monotonic() - start, 5)
+        
+        # Ctrl-C does not reach the process groups of the commands, so the task graph terminates them
+        def interrupt(futures, return_when):
+            while not AsyncCommandRunner._live_pids:
+                time.sleep(0.01)
+            raise KeyboardInterrupt
+            
+        command_runner = CommandRunner(quiet=True)
+        graph = TaskGraph()
+        graph.add_task("install:backend", lambda: command_runner.run("sleep 30", check=False).returncode == 0,
+                       heavy=True)
+        start = time.monotonic()
+        with mock.patch("monostack.core.task_graph.wait", side_effect=interrupt), \
+                self.assertRaises(KeyboardInterrupt):
+            graph.run()
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertFalse(AsyncCommandRunner._live_pids)
+
+    def test_bounded_output_capture(self):
+        """Test that only the output tail is kept in memory while the full output goes to a log file."""
+        log_dir = os.path.join(self.base_dir, "logs")
+        runner = CommandRunner(output_tail_kb=1, log_dir=log_dir)
+        command = f"{sys.executable} -c \"print('x' * 100000); print('last line')\""
+        
+        result = runner.run(command, show_output=False, label="backend")
+        self.assertTrue(result.truncated)
+        self.assertEqual(len(result.stdout), 1024)
+        self.assertTrue(result.stdout.endswith("last line\n"))
+        self.assertTrue(result.log_path.startswith(log_dir))
+        with open(result.log_path) as f:
+            self.assertGreater(len(f.read()), 100000)
+
+    def test_scaffold_cache(self):
+        """Test storing, restoring and evicting module scaffolds."""
+        cache = ScaffoldCache(cache_dir=os.path.join(self.base_dir, "cache"))
+        module_dir = os.path.join(self.base_dir, "backend")
+        os.makedirs(os.path.join(module_dir, "node_modules", "express"))
+        with open(os.path.join(module_dir, "package.json"), "w") as f:
+            f.write('{"name": "backend"}')
+        with open(os.path.join(module_dir, "node_modules", "express", "index.js"), "w") as f:
+            f.write("module.exports = {};")
+        
+        command = "rm -rf backend && mkdir backend && touch backend/package.json"
+        key = cache.make_key("backend", command)
+        self.assertEqual(key, cache.make_key("backend", command))
+        self.assertNotEqual(key, cache.make_key("frontend-web", command))
+        self.assertFalse(cache.restore(key, module_dir))
+        self.assertTrue(cache.store(key, module_dir, "backend", command))
+        
+        shutil.rmtree(module_dir)
+        self.assertTrue(cache.restore(key, module_dir))
+        with open(os.path.join(module_dir, "package.json")) as f:
+            self.assertEqual(f.read(), '{"name": "backend"}')
+        self.assertTrue(os.path.exists(os.path.join(module_dir, "node_modules", "express", "index.js")))
+        
+        stats = cache.stats()
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["modules"]["backend"]["entries"], 1)
+        self.assertEqual(cache.prune(max_size=0), 1)
+        self.assertFalse(cache.restore(key, module_dir))
+        
+        # Only the directories inside the scaffold decide what is hardlinked, not those above it
+        cache = ScaffoldCache(cache_dir=os.path.join(self.base_dir, "target", "cache"))
+        module_dir = os.path.join(self.base_dir, "target", "backend")
+        os.makedirs(os.path.join(module_dir, "node_modules"))
+        for name in ["README.md", os.path.join("node_modules", "index.js")]:
+            with open(os.path.join(module_dir, name), "w") as f:
+                f.write("content")
+        self.assertTrue(cache.store(key, module_dir, "backend", command))
+        self.assertEqual(os.stat(os.path.join(module_dir, "README.md")).st_nlink, 1)
+        shutil.rmtree(module_dir)
+        self.assertTrue(cache.restore(key, module_dir))
+        self.assertEqual(os.stat(os.path.join(module_dir, "README.md")).st_nlink, 1)
+        self.assertEqual(os.stat(os.path.join(module_dir, "node_modules", "index.js")).st_nlink, 2)
+
+    def test_toolchain_upgrade(self):
+        """Test that a toolchain upgrade changes the scaffold cache key within the same process."""
+        bin_dir = os.path.join(self.base_dir, "bin")
+        os.makedirs(bin_dir)
+        go = os.path.join(bin_dir, "go")
+        cache = ScaffoldCache(cache_dir=os.path.join(self.base_dir, "cache"))
+        keys = []
+        with mock.patch.dict(os.environ, {"PATH": bin_dir + os.pathsep + os.environ.get("PATH", "")}):
+            for version, mtime in [("go1.21.0", 1000000000), ("go1.22.0", 1000000100)]:
+                with open(go, "w") as f:
+                    f.write(f"#!/bin/sh\necho {version}\n")
+                os.chmod(go, 0o755)
+                os.utime(go, (mtime, mtime))
+                self.assertEqual(cache.toolchain_prober.version("go"), version)
+                keys.append(cache.make_key("backend", "go mod init backend"))
+        self.assertNotEqual(keys[0], keys[1])
+    
+    def test_file_index(self):
+        """Test that the file index skips ignored directories and answers name and glob lookups."""
+        module_dir = os.path.join(self.base_dir, "frontend-web")
+        for relative_path in ["src/App.js", "src/components/App.js", "node_modules/react/App.js",
+                              "src/main/java/com/example/DemoApplication.java"]:
+            path = os.path.join(module_dir, relative_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            open(path, "w").close()
+        
+        index = FileIndex(module_dir, {"node_modules"})
+        self.assertEqual(index.find("App.js"), os.path.join(module_dir, "src", "App.js"))
+        self.assertEqual(len(index.find_all("App.js")), 2)
+        self.assertEqual([os.path.basename(p) for p in index.glob("*Application.java")], ["DemoApplication.java"])
+        self.assertIsNone(index.find("missing.js"))
+
+    def test_gitignore_merging(self):
+        """Test that gitignore patterns are merged without duplicates."""
+        merger = PatternMerger()
+        merger.add_existing("node_modules\n# Keep this log\n!keep.log\n")
+        merger.add(["# Dependencies", "node_modules", "", "# Logs", "*.log", "keep.log"])
+        self.assertEqual(merger.getvalue(), "node_modules\n# Keep this log\n!keep.log\n\n# Logs\n*.log\nkeep.log\n")
+        
+        choices = {
+            "backend": {"language": "javascript", "framework": "express"},
+            "frontend-web": {"language": "javascript", "framework": "react"},
+            "database": {"type": "sqlite"}
+        }
+        self.assertTrue(GitignoreGenerator().add_root_gitignore(self.base_dir, choices))
+        with open(os.path.join(self.base_dir, ".gitignore")) as f:
+            content = f.read()
+        patterns = [line for line in content.splitlines() if line and not line.startswith("#")]
+        self.assertEqual(len(patterns), len(set(patterns)))
+        self.assertIn("/node_modules", patterns)
+        self.assertIn("# DATABASE - sqlite", content)
+        self.assertNotIn("# FRONTEND-WEB", content)
+    
+    def test_gitignore_matcher(self):
+        """Test matching and walking with compiled gitignore rules."""
+        matcher = GitignoreMatcher(["/node_modules", "*.log", "!keep.log", "build/", "docs/**/*.tmp", "a/**", "!a/b"],
+                                   self.base_dir)
+        self.assertTrue(matcher.is_ignored("node_modules/react/index.js", False))
+        self.assertFalse(matcher.is_ignored("src/node_modules", True))
+        self.assertTrue(matcher.is_ignored("src/debug.log", False))
+        self.assertFalse(matcher.is_ignored("src/keep.log", False))
+        self.assertTrue(matcher.is_ignored("src/build/out.js", False))
+        self.assertFalse(matcher.is_ignored("src/build", False))
+        self.assertTrue(matcher.is_ignored("docs/api/v1/page.tmp", False))
+        self.assertFalse(matcher.is_ignored("a/b", False))
+        self.assertTrue(matcher.is_ignored("a/c", False))
+        
+        for path in ["node_modules/react/index.js", "src/App.js", "src/debug.log", "build/main.js", "lib/keep.log"]:
+            os.makedirs(os.path.dirname(os.path.join(self.base_dir, path)), exist_ok=True)
+            open(os.path.join(self.base_dir, path), "w").close()
+        with open(os.path.join(self.base_dir, "lib", ".gitignore"), "w") as f:
+            f.write("*.log\n")
+        
+        walked = {os.path.relpath(os.path.join(dirpath, name), self.base_dir)
+                  for dirpath, dirnames, filenames in matcher.walk(nested=True) for name in filenames}
+        self.assertEqual(walked, {"src/App.js", "lib/.gitignore"})
+        
+        # Bracket expressions, including the empty and unterminated ones, match as in git
+        patterns = ["[]", "[]a]", "[!]]x", "b[c", "[d-f].txt", "[!g]h"]
+        repo_dir = os.path.join(self.base_dir, "brackets")
+        os.makedirs(repo_dir)
+        subprocess.run(["git", "init", "-q"], cwd=repo_dir, check=True)
+        with open(os.path.join(repo_dir, ".gitignore"), "w") as f:
+            f.write("\n".join(patterns) + "\n")
+        matcher = GitignoreMatcher(patterns, repo_dir)
+        for path in ["[]", "a", "]", "[", "zx", "]x", "b[c", "bc", "e.txt", "g.txt", "gh", "ih", "[]a]"]:
+            ignored = subprocess.run(["git", "check-ignore", "-q", "--", path], cwd=repo_dir).returncode == 0
+            self.assertEqual(matcher.is_ignored(path, False), ignored, path)
+    
+    def test_fast_import_commit(self):
+        """Test creating the initial commit with git fast-import."""
+        for path, content in [(".gitignore", "/node_modules\n*.log\n"), ("README.md", "# App\n"),
+                              ("node_modules/react/index.js", ""), ("backend/.gitignore", "venv/\n"),
+                              ("backend/app.py", "print('hello')\n"), ("backend/venv/bin/python", ""),
+                              ("backend/debug.log", "")]:
+            os.makedirs(os.path.dirname(os.path.join(self.base_dir, path)), exist_ok=True)
+            with open(os.path.join(self.base_dir, path), "w") as f:
+                f.write(content)
+        
+        identity = {"GIT_AUTHOR_NAME": "Test", "GIT_AUTHOR_EMAIL": "test@example.com",
+                    "GIT_COMMITTER_NAME": "Test", "GIT_COMMITTER_EMAIL": "test@example.com"}
+        with mock.patch.dict(os.environ, identity):
+            self.assertTrue(self.project_generator.initialize_git_repo(self.base_dir, fast_commit=True))
+        
+        tracked = subprocess.run(["git", "ls-files"], cwd=self.base_dir, capture_output=True, text=True).stdout.split()
+        self.assertEqual(tracked, [".gitignore", "README.md", "backend/.gitignore", "backend/app.py"])
+        status = subprocess.run(["git", "status", "--porcelain"], cwd=self.base_dir, capture_output=True, text=True)
+        self.assertEqual(status.stdout, "")
+    
+    def test_venv_backends(self):
+        """Test creating a virtual environment and reusing an existing one."""
+        venv_manager = VenvManager(backend="venv")
+        self.assertTrue(venv_manager.create_venv(self.base_dir))
+        report = venv_manager.reports[self.base_dir]
+        self.assertEqual(report["backend"], "venv")
+        self.assertFalse(report["reused"])
+        self.assertIn("seed", report["phases"])
+        
+        python = os.path.join(self.base_dir, "venv", "bin", "python")
+        pip_version = subprocess.run([python, "-m", "pip", "--version"], capture_output=True, text=True)
+        self.assertEqual(pip_version.returncode, 0)
+        # pip lives in the environment, which does not depend on the monostack cache
+        site_packages = glob.glob(os.path.join(self.base_dir, "venv", "lib", "python*", "site-packages"))[0]
+        self.assertIn(site_packages, pip_version.stdout)
+        self.assertFalse(glob.glob(os.path.join(site_packages, "*.pth")))
+        
+        # An environment created by the installation command under another name is reused
+        os.rename(os.path.join(self.base_dir, "venv"), os.path.join(self.base_dir, ".venv"))
+        self.assertTrue(venv_manager.create_venv(self.base_dir))
+        self.assertTrue(venv_manager.reports[self.base_dir]["reused"])
+        self.assertFalse(os.path.exists(os.path.join(self.base_dir, "venv")))
+    
+    def test_golden_venv_clone(self):
+        """Test cloning virtual environments with requirements from a golden environment."""
+        def fake_install(venv_path, requirements):
+            site_packages = glob.glob(os.path.join(venv_path, "lib", "python*", "site-packages"))[0]
+            with open(os.path.join(site_packages, "fakepkg.py"), "w") as f:
+                f.write("VALUE = 42\n")
+        
+        venv_manager = VenvManager(backend="venv", golden_dir=os.path.join(self.base_dir, "golden"))
+        with mock.patch.object(venv_manager, "_install", side_effect=fake_install) as install:
+            for module in ["api", "worker"]:
+                project_path = os.path.join(self.base_dir, module)
+                self.assertTrue(venv_manager.create_venv(project_path, "venv", ["FakePkg"]))
+                self.assertEqual(venv_manager.reports[project_path]["backend"], "golden")
+            self.assertEqual(install.call_count, 1)
+        self.assertIn("build", venv_manager.reports[os.path.join(self.base_dir, "api")]["phases"])
+        self.assertNotIn("build", venv_manager.reports[os.path.join(self.base_dir, "worker")]["phases"])
+        
+        venv_path = os.path.join(self.base_dir, "worker", "venv")
+        with open(os.path.join(venv_path, "pyvenv.cfg")) as f:
+            self.assertNotIn(os.path.join(self.base_dir, "golden"), f.read())
+        with open(os.path.join(venv_path, "bin", "pip")) as f:
+            self.assertEqual(f.readline().strip(), f"#!{venv_path}/bin/python")
+        
+        python = os.path.join(venv_path, "bin", "python")
+        result = subprocess.run([python, "-c", "import sys, fakepkg; print(sys.prefix, fakepkg.VALUE)"],
+                                capture_output=True, text=True)
+        self.assertEqual(result.stdout.split(), [venv_path, "42"])
+        pip_version = subprocess.run([python, "-m", "pip", "--version"], capture_output=True, text=True)
+        self.assertEqual(pip_version.returncode, 0)
+        
+        # The least recently cloned environments are evicted above the size limit
+        def create(path):
+            os.makedirs(path)
+            with open(os.path.join(path, "pyvenv.cfg"), "w") as f:
+                f.write("x" * 1000)
+        library = venv_manager.golden_library
+        fake_key, other_key = library.make_key(["FakePkg"]), library.make_key(["OtherPkg"])
+        self.assertTrue(library.build(other_key, ["OtherPkg"], create))
+        self.assertTrue(library.clone(fake_key, os.path.join(self.base_dir, "clone")))
+        self.assertEqual(library.stats()["entries"], 2)
+        self.assertEqual(library.prune(max_size=library.entries()[0]["size"]), 1)
+        self.assertTrue(library.has(fake_key))
+        self.assertFalse(library.has(other_key))
+        
+        # Building past the limit evicts every other environment
+        library.max_size = 1
+        self.assertTrue(library.build(other_key, ["OtherPkg"], create))
+        self.assertEqual([meta["key"] for meta in library.entries()], [other_key])
+    
+    def test_offline_package_store(self):
+        """Test prefetching the packages of the installation commands and installing them offline."""
+        package_store = PackageStore(store_dir=os.path.join(self.base_dir, "store"))
+        self.config_manager.load_catalog()
+        downloads = package_store.collect(self.config_manager.catalog, module="backend")
+        self.assertIn(("pip", ("fastapi", "uvicorn")), downloads)
+        self.assertIn(("npm", ("express",)), downloads)
+        self.assertEqual(package_store.collect(self.config_manager.catalog, language="python", framework="flask"),
+                         [("pip", ("flask",))])
+        
+        with mock.patch.object(package_store, "_run") as run:
+            results = package_store.prefetch([("pip", ("flask",)), ("npm", ("express",))])
+        self.assertTrue(all(result["success"] for result in results))
+        pip_command, npm_command = sorted((call.args[0] for call in run.call_args_list), key=lambda c: c[0] == "npm")
+        self.assertIn(package_store.wheelhouse_dir, pip_command)
+        self.assertEqual(npm_command[:2], ["npm", "install"])
+        self.assertIn(package_store.npm_cache_dir, npm_command)
+        
+        # Scaffolders install packages not named in their command, so they are run once into the store
+        command = "rm -rf frontend-web && npx --yes create-react-app frontend-web --template typescript"
+        scaffold = ("scaffold", (command,))
+        self.assertIn(scaffold, package_store.collect(self.config_manager.catalog, framework="react"))
+        with mock.patch.object(package_store, "_run") as run:
+            self.assertTrue(package_store.prefetch([scaffold])[0]["success"])
+        self.assertEqual(run.call_args.args[0], command)
+        self.assertEqual(run.call_args.kwargs["env"]["npm_config_cache"], package_store.npm_cache_dir)
+        
+        # A stand-in wheelhouse with a single pure Python wheel
+        with zipfile.ZipFile(os.path.join(package_store.wheelhouse_dir, "fakepkg-1.0-py3-none-any.whl"), "w") as wheel:
+            wheel.writestr("fakepkg.py", "VALUE = 42\n")
+            wheel.writestr("fakepkg-1.0.dist-info/METADATA", "Metadata-Version: 2.1\nName: fakepkg\nVersion: 1.0\n")
+            wheel.writestr("fakepkg-1.0.dist-info/WHEEL", "Wheel-Version: 1.0\nRoot-Is-Purelib: true\nTag: py3-none-any\n")
+            wheel.writestr("fakepkg-1.0.dist-info/RECORD", "")
+        
+        command = package_store.offline_command("python -m venv venv && source venv/bin/activate && pip install fakepkg")
+        self.assertIn(f"pip install --no-index --find-links {package_store.wheelhouse_dir} fakepkg", command)
+        self.assertEqual(package_store.offline_command("npm init -y && npm install express"),
+                         f"npm init --offline --cache {package_store.npm_cache_dir} -y && "
+                         f"npm install --offline --cache {package_store.npm_cache_dir} express")
+        
+        result = subprocess.run(command, shell=True, executable="/bin/bash", cwd=self.base_dir,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertTrue(glob.glob(os.path.join(self.base_dir, "venv", "lib", "python*", "site-packages", "fakepkg.py")))
+    
+    def test_speculative_install(self):
+        """Test committing modules installed during the prompts and discarding cancelled ones."""
+        install_commands = {
+            "backend": {"python": {"fake": "rm -rf ${module} && mkdir ${module} && cd ${module} && "
+                                           "python -m venv venv && source venv/bin/activate && touch main.py"}},
+            "frontend-web": {"javascript": {"fake": "rm -rf ${module} && mkdir ${module} && touch ${module}/index.js"}},
+        }
+        choices = {"backend": {"language": "python", "framework": "fake"},
+                   "frontend-web": {"language": "javascript", "framework": "fake"}}
+        project_dir = os.path.join(self.base_dir, "app")
+        
+        # Discarding terminates a running installation instead of waiting for it
+        slow_commands = {"frontend-web": {"javascript": {"fake": "mkdir ${module} && sleep 30"}}}
+        cancelled = SpeculativeInstaller(self.project_generator, project_dir, slow_commands)
+        self.assertIs(cancelled.staging_generator.run_history, self.project_generator.run_history)
+        self.assertEqual(cancelled.staging_generator.js_workspace, self.project_generator.js_workspace)
+        cancelled.start("frontend-web", choices["frontend-web"])
+        staging_dir = cancelled.staging_dir
+        deadline = time.monotonic() + 10
+        while not os.path.isdir(os.path.join(staging_dir, "frontend-web")) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        start = time.monotonic()
+        cancelled.discard()
+        self.assertLess(time.monotonic() - start, 10)
+        self.assertFalse(os.path.exists(staging_dir))
+        self.assertFalse(os.path.exists(project_dir))
+        
+        speculative = SpeculativeInstaller(self.project_generator, project_dir, install_commands)
+        for module, choice in choices.items():
+            speculative.start(module, choice)
+        with mock.patch.object(self.project_generator.config_manager, "load_technologies",
+                               return_value=install_commands), \
+             mock.patch.object(self.project_generator, "initialize_project") as initialize_project:
+            self.assertTrue(self.project_generator.create_project_structure(project_dir, choices,
+                                                                            speculative=speculative))
+        speculative.discard()
+        initialize_project.assert_not_called()
+        
+        self.assertTrue(os.path.isfile(os.path.join(project_dir, "frontend-web", "index.js")))
+        self.assertTrue(os.path.isfile(os.path.join(project_dir, "backend", "main.py")))
+        with open(os.path.join(project_dir, "backend", "venv", "pyvenv.cfg")) as f:
+            self.assertIn(os.path.join(project_dir, "backend", "venv"), f.read())
+        self.assertEqual(self.project_generator.module_results["backend"]["venv"]["path"],
+                         os.path.join(project_dir, "backend", "venv"))
+        self.assertEqual(os.listdir(self.base_dir), ["app"])
+    
+    def test_tracing(self):
+        """Test the spans recorded around the generation phases and their Chrome trace output."""
+        install_commands = {"backend": {"python": {"fake": "mkdir -p ${module} && echo installed"}}}
+        choices = {"backend": {"language": "python", "framework": "fake"}}
+        trace_path = os.path.join(self.base_dir, "trace.json")
+        
+        tracer = enable_tracing()
+        try:
+            with mock.patch.object(self.project_generator.config_manager, "load_technologies",
+                                   return_value=install_commands):
+                self.assertTrue(self.project_generator.create_project_structure(self.base_dir, choices))
+            tracer.write(trace_path)
+        finally:
+            disable_tracing()
+            
+        with open(trace_path) as f:
+            events = [event for event in json.load(f)["traceEvents"] if event["ph"] == "X"]
+        spans = {event["name"]: event for event in events}
+        commands = [event for event in events if event["name"] == "command"]
+        for name in ("initialize_project", "command", "add_gitignore", "add_root_gitignore",
+                     "generate_docker_compose", "task:install:backend"):
+            self.assertIn(name, spans)
+        self.assertEqual(spans["initialize_project"]["args"]["framework"], "fake")
+        self.assertFalse(spans["initialize_project"]["args"]["cache_hit"])
+        self.assertTrue(spans["initialize_project"]["args"]["success"])
+        install_command = next(event for event in commands if "echo installed" in event["args"]["command"])
+        self.assertEqual(install_command["args"]["returncode"], 0)
+        self.assertTrue(all("returncode" in event["args"] for event in commands))
+        self.assertGreater(spans["generate_docker_compose"]["args"]["bytes_written"], 0)
+        
+        # Spans nest within the task that ran them, on the same thread
+        task = spans["task:install:backend"]
+        install = spans["initialize_project"]
+        self.assertEqual(task["tid"], install["tid"])
+        self.assertLessEqual(task["ts"], install["ts"])
+        self.assertGreaterEqual(task["ts"] + task["dur"], install["ts"] + install["dur"])
+    
+    def test_simulated_toolchain(self):
+        """Test installing a module with the simulated toolchain of the generation benchmark."""
+        from benchmarks import fake_toolchain
+        env = fake_toolchain.install(os.path.join(self.base_dir, "bin"), "fast", ["frontend-web"])
+        choice = {"language": "javascript", "framework": "react"}
+        with mock.patch.dict(os.environ, env):
+            self.assertTrue(self.project_generator.initialize_project(
+                self.base_dir, "frontend-web", choice, self.config_manager.load_technologies()))
+            
+        node_modules = os.path.join(self.base_dir, "frontend-web", "node_modules")
+        files = sum(len(names) for _, _, names in os.walk(node_modules))
+        self.assertEqual(files, fake_toolchain.FAST["npx"]["files"])
+        self.assertTrue(os.path.isfile(os.path.join(self.base_dir, "frontend-web", "package.json")))
+    
+    def test_generation_server(self):
+        """Test serving generation requests over a Unix socket, with progress events and config reloads."""
+        config_dir = os.path.join(self.base_dir, "config")
+        os.makedirs(config_dir)
+        shutil.copy(os.path.join(self.config_manager.config_dir, "docker_compose_template.yml"), config_dir)
+        commands_path = os.path.join(config_dir, "install_commands.json")
+        with open(commands_path, "w") as f:
+            json.dump({"backend": {"python": {"fake": "mkdir -p ${module} && touch ${module}/first"}}}, f)
+        
+        # Unix socket paths are limited to about a hundred characters
+        socket_dir = tempfile.mkdtemp(prefix="monostack-")
+        self.addCleanup(shutil.rmtree, socket_dir, True)
+        server = GenerationServer(os.path.join(socket_dir, "serve.sock"), settings={"history": False},
+                                  output_dir=self.base_dir, max_installs=1, config_dir=config_dir)
+        server.warm_up()
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.assertTrue(server.ready.wait(5))
+        
+        try:
+            request = {"name": "app", "choices": {"backend": {"language": "python", "framework": "fake"}}}
+            events = list(send_request(server.socket_path, request))
+            self.assertEqual([event["event"] for event in events[:2]], ["accepted", "started"])
+            self.assertIn({"event": "task", "task": "install:backend", "status": "running"}, events)
+            self.assertEqual(events[-1]["event"], "done")
+            self.assertEqual(events[-1]["status"], "ok")
+            self.assertTrue(events[-1]["modules"]["backend"]["success"])
+            self.assertTrue(os.path.isfile(os.path.join(self.base_dir, "app", "backend", "first")))
+            
+            # The installation commands are reloaded once changed on disk
+            with open(commands_path, "w") as f:
+                json.dump({"backend": {"python": {"fake": "mkdir -p ${module} && touch ${module}/second"}}}, f)
+            os.utime(commands_path, ns=(time.time_ns() + 10 ** 9,) * 2)
+            request["name"] = "app2"
+            events = list(send_request(server.socket_path, request))
+            self.assertEqual(events[0]["reloaded"], ["install_commands.json"])
+            self.assertEqual(events[-1]["status"], "ok")
+            self.assertTrue(os.path.isfile(os.path.join(self.base_dir, "app2", "backend", "second")))
+            
+            self.assertEqual(os.stat(server.socket_path).st_mode & 0o077, 0)
+            
+            events = list(send_request(server.socket_path, {"name": "broken"}))
+            self.assertEqual(events[-1]["event"], "error")
+            
+            # Projects are only generated inside the output directory
+            for options in [{"base_dir": socket_dir}, {"base_dir": os.path.join(self.base_dir, "..", "escaped")}]:
+                events = list(send_request(server.socket_path, dict(request, name="app3", options=options)))
+                self.assertEqual(events[-1]["event"], "error")
+            events = list(send_request(server.socket_path, dict(request, name="../escaped")))
+            self.assertEqual(events[-1]["event"], "error")
+            self.assertFalse(os.path.exists(os.path.join(os.path.dirname(self.base_dir), "escaped")))
+        finally:
+            server.shutdown()
+            thread.join(5)
+        self.assertFalse(os.path.exists(server.socket_path))
+    
+    def test_trash_rm_prefix(self):
+        """Test replacing a module directory through the trash instead of rm -rf."""
+        self.assertEqual(split_rm_prefix("rm -rf ${module} && mkdir ${module}"), None)
+        self.assertEqual(split_rm_prefix("rm -rf backend build && cd backend"), (["backend", "build"], "cd backend"))
+        self.assertIsNone(split_rm_prefix("rm -rf $HOME && echo"))
+        self.assertIsNone(split_rm_prefix("rm -rf ../backend && echo"))
+        
+        project_dir = os.path.join(self.base_dir, "app")
+        for package in range(3):
+            package_dir = os.path.join(project_dir, "backend", "node_modules", f"pkg{package}", "lib")
+            os.makedirs(package_dir)
+            for index in range(5):
+                with open(os.path.join(package_dir, f"{index}.js"), "w") as f:
+                    f.write("module.exports = {}")
+        with open(os.path.join(project_dir, "backend", "old"), "w") as f:
+            f.write("old")
+            
+        trash = Trash(workers=2, registry_path=os.path.join(self.base_dir, "trash-dirs"))
+        project_generator = ProjectGenerator(trash=trash)
+        command = "rm -rf ${module} && mkdir -p ${module} && touch ${module}/new"
+        install_commands = {"backend": {"python": {"fake": command}}}
+        choice = {"language": "python", "framework": "fake"}
+        self.assertTrue(project_generator.initialize_project(project_dir, "backend", choice, install_commands))
+        self.assertTrue(os.path.isfile(os.path.join(project_dir, "backend", "new")))
+        self.assertFalse(os.path.exists(os.path.join(project_dir, "backend", "old")))
+        self.assertFalse(os.path.exists(os.path.join(project_dir, "backend", "node_modules")))
+        
+        trash_dir = os.path.join(self.base_dir, TRASH_DIR_NAME)
+        self.assertTrue(trash.wait(10))
+        self.assertEqual(os.listdir(trash_dir), [])
+        self.assertEqual(trash.trash_dirs(), [trash_dir])
+        
+        # Leftovers of an interrupted run are deleted by the gc command
+        os.makedirs(os.path.join(trash_dir, "backend-x", "backend", "node_modules"))
+        summary = trash.collect_garbage()
+        self.assertEqual((summary["trash_dirs"], summary["entries"]), (1, 1))
+        self.assertFalse(os.path.exists(trash_dir))
+        self.assertEqual(trash.trash_dirs(), [])
+        
+        # A trash directory registered by another process during the collection is kept
+        other_dir = os.path.join(self.base_dir, "other", TRASH_DIR_NAME)
+        def delete_during_registration(path):
+            os.makedirs(other_dir)
+            Trash(registry_path=trash.registry_path)._register(other_dir)
+            return 0
+        os.makedirs(os.path.join(trash_dir, "backend-y"))
+        trash._register(trash_dir)
+        with mock.patch.object(trash, "delete", side_effect=delete_during_registration):
+            trash.collect_garbage()
+        self.assertEqual(trash.trash_dirs(), [trash_dir, other_dir])
+        shutil.rmtree(os.path.join(trash_dir, "backend-y"))
+        
+        # A process exiting right after trashing a directory finishes deleting it
+        os.makedirs(os.path.join(project_dir, "web", "node_modules", "pkg"))
+        script = (f"from monostack.utils.trash import Trash; "
+                  f"Trash(registry_path={trash.registry_path!r}).discard({os.path.join(project_dir, 'web')!r}, "
+                  f"{trash_dir!r})")
+        subprocess.run([sys.executable, "-c", script], check=True)
+        self.assertEqual(os.listdir(trash_dir), [])
+
+    def test_install_steps(self):
+        """Test running structured installation steps, converted commands and cached steps."""
+        command = "rm -rf backend && mkdir backend && cd backend && npm init -y && npm install express"
+        steps = convert_command(command)
+        self.assertEqual([step.argv[0] for step in steps], ["rm", "mkdir", "npm", "npm"])
+        self.assertEqual(steps[2].cwd, "backend")
+        self.assertEqual(steps[1].creates, ["backend"])
+        self.assertEqual(format_steps(steps), command)
+        for shell_command in ["ls | wc -l", "echo $HOME", "cd backend && source venv/bin/activate", "ls > out"]:
+            self.assertIsNone(convert_command(shell_command))
+        with self.assertRaises(ValueError):
+            parse_steps([{"run": "npm install"}])
+        
+        def install_commands(last_step):
+            return {"backend": {"shell": {"touch": [
+                {"run": ["rm", "-rf", "${module}"]},
+                {"run": ["mkdir", "${module}"], "creates": ["${module}"]},
+                {"run": ["touch", "first"], "cwd": "${module}", "cache": True},
+                {"run": ["false"], "creates": ["${module}/first"]},
+                {"run": ["sh", "-c", f"echo {last_step} >> log"], "cwd": "${module}", "env": {"STEP": "last"}},
+            ]}}}
+        
+        scaffold_cache = ScaffoldCache(cache_dir=os.path.join(self.base_dir, "cache"))
+        project_generator = ProjectGenerator(scaffold_cache=scaffold_cache)
+        choice = {"language": "shell", "framework": "touch"}
+        self.assertTrue(project_generator.initialize_project(self.base_dir, "backend", choice, install_commands("one")))
+        reports = project_generator.step_reports["backend"]
+        self.assertEqual([report["status"] for report in reports], ["ok", "ok", "ok", "skipped", "ok"])
+        self.assertTrue(all(report["duration"] >= 0 for report in reports))
+        self.assertEqual(reports[4]["step"], "STEP=last sh -c 'echo one >> log'")
+        
+        # A changed last step restores the module directory left by the cached step
+        self.assertTrue(project_generator.initialize_project(self.base_dir, "backend", choice, install_commands("two")))
+        reports = project_generator.step_reports["backend"]
+        self.assertEqual([report["status"] for report in reports], ["cached", "cached", "cached", "skipped", "ok"])
+        with open(os.path.join(self.base_dir, "backend", "log")) as f:
+            self.assertEqual(f.read(), "two\n")
+    
+    def test_accelerators(self):
+        """Test the ecosystem profiles adding flags and environment variables to installations."""
+        maven_repository = os.path.join(self.base_dir, "m2")
+        os.makedirs(os.path.join(maven_repository, "org"))
+        accelerator = Accelerator(maven_repository=maven_repository)
+        self.assertEqual(accelerator.accelerate("cd web && npm install --no-fund express"),
+                         "cd web && npm install --no-audit --prefer-offline --no-fund express")
+        self.assertEqual(accelerator.accelerate("mvn archetype:generate -DartifactId=backend", warm=True),
+                         "mvn -T 1C -o archetype:generate -DartifactId=backend")
+        self.assertEqual(accelerator.accelerate("mvn archetype:generate"), "mvn -T 1C archetype:generate")
+        self.assertEqual(accelerator.environment("go mod init backend")["GOFLAGS"].split()[-1], "-mod=mod")
+        self.assertEqual(Accelerator(["go"]).accelerate("pip install flask"), "pip install flask")
+        with self.assertRaises(ValueError):
+            Accelerator(["gradle"])
+        
+        from benchmarks import fake_toolchain
+        env = fake_toolchain.install(os.path.join(self.base_dir, "bin"), "fast", ["backend"])
+        project_generator = ProjectGenerator(accelerator=accelerator)
+        command = "mkdir -p ${module} && cd ${module} && npm install express"
+        install_commands = {"backend": {"javascript": {"express": command}}}
+        choice = {"language": "javascript", "framework": "express"}
+        with mock.patch.dict(os.environ, env), \
+             mock.patch.object(project_generator.command_runner, "run",
+                               wraps=project_generator.command_runner.run) as run:
+            self.assertTrue(project_generator.initialize_project(self.base_dir, "backend", choice, install_commands))
+        argv = run.call_args.args[0]
+        self.assertEqual(argv, ["npm", "install", "--no-audit", "--no-fund", "--prefer-offline", "express"])
+        self.assertEqual(run.call_args.kwargs["env"]["npm_config_audit"], "false")
+        report = project_generator.accelerator_reports["backend"]
+        self.assertEqual(report["ecosystems"], ["npm"])
+        self.assertIn("npm_config_fund", report["environment"])
+    
+    def test_accelerate_before_subcommand(self):
+        """Test that --accelerate does not take the subcommand following it as its value."""
+        from monostack.__main__ import accelerated_ecosystems, parse_arguments
+        
+        with mock.patch.object(sys, "argv", ["monostack", "--accelerate", "batch", "m.jsonl"]):
+            args = parse_arguments()
+        self.assertEqual((args.command, args.manifest), ("batch", "m.jsonl"))
+        self.assertEqual(accelerated_ecosystems(args), "all")
+        with mock.patch.object(sys, "argv", ["monostack", "--accelerate-ecosystems", "npm,maven", "stats"]):
+            args = parse_arguments()
+        self.assertEqual((args.command, accelerated_ecosystems(args)), ("stats", "npm,maven"))
+    
+    def test_ecosystem_caches(self):
+        """Test pointing package managers at shared caches and recording their hit rates."""
+        caches = EcosystemCaches(cache_root=os.path.join(self.base_dir, "ecosystems"))
+        npm_cache = os.path.join(caches.cache_root, "npm")
+        with mock.patch.dict(os.environ, {"MAVEN_OPTS": "-Xmx1g"}):
+            os.environ.pop("npm_config_cache", None)
+            self.assertEqual(caches.environment("cd web && npx --yes create-react-app web"),
+                             {"npm_config_cache": npm_cache})
+            self.assertEqual(caches.environment("mvn archetype:generate")["MAVEN_OPTS"],
+                             f"-Xmx1g -Dmaven.repo.local={caches.path('maven')} {MAVEN_LOCKING_OPTIONS}")
+            self.assertEqual(caches.environment("git init"), {})
+            
+            # A download into the cache is a miss, an installation downloading nothing a hit
+            with caches.use("npm install express", {"PATH": "/bin"}) as env:
+                self.assertEqual(env, {"PATH": "/bin", "npm_config_cache": npm_cache})
+                os.makedirs(os.path.join(npm_cache, "_cacache"))
+                with open(os.path.join(npm_cache, "_cacache", "express.tgz"), "w") as f:
+                    f.write("x" * 100)
+            from benchmarks import fake_toolchain
+            env = fake_toolchain.install(os.path.join(self.base_dir, "bin"), "fast", ["web"])
+            time.sleep(CLOCK_SLACK * 2)
+            with mock.patch.dict(os.environ, env):
+                CommandRunner(quiet=True, ecosystem_caches=caches).run("npm install express", cwd=self.base_dir)
+                
+            with mock.patch.dict(os.environ, {"npm_config_cache": os.path.join(self.base_dir, "store")}):
+                self.assertEqual(caches.used_ecosystems("npm install express"), [])
+                
+        stats = caches.stats()["ecosystems"]
+        self.assertEqual(list(stats), ["npm"])
+        self.assertEqual((stats["npm"]["installs"], stats["npm"]["hits"]), (2, 1))
+        self.assertEqual(stats["npm"]["hit_rate"], 0.5)
+        self.assertEqual(stats["npm"]["bytes_added"], 100)
+        
+        # Overlapping installations cannot tell which one downloaded the file
+        with mock.patch.dict(os.environ, {"PATH": "/bin"}, clear=True):
+            with caches.use("npm install koa", None), caches.use("npm install hapi", None):
+                with open(os.path.join(npm_cache, "_cacache", "koa.tgz"), "w") as f:
+                    f.write("x" * 10)
+        stats = caches.stats()["ecosystems"]
+        self.assertEqual((stats["npm"]["installs"], stats["npm"]["concurrent"]), (4, 2))
+        self.assertEqual(stats["npm"]["hit_rate"], 0.5)
+        self.assertFalse(os.path.exists(caches.installs_path))
+        
+        # An installation logged while the statistics are computed is kept for the next call
+        scan = caches._scan
+        def scan_during_install(ecosystem, since):
+            if ecosystem == "npm":
+                caches._log_installs(["npm"], time.time(), time.time())
+            return scan(ecosystem, since)
+        with mock.patch.object(caches, "_scan", side_effect=scan_during_install):
+            self.assertEqual(caches.stats()["ecosystems"]["npm"]["installs"], 4)
+        self.assertEqual(caches.stats()["ecosystems"]["npm"]["installs"], 5)
+        self.assertFalse(os.path.exists(caches.reading_path))
+    
+    def test_js_workspace(self):
+        """Test installing the JavaScript modules of a project once, in a workspace at its root."""
+        choices = {
+            "backend": {"language": "javascript", "framework": "hapi"},
+            "frontend-web": {"language": "javascript", "framework": "alpinejs"},
+            "frontend-mobile": {"language": "kotlin", "framework": "jetpack-compose"}
+        }
+        self.assertEqual(workspace_modules(choices), ["backend", "frontend-web"])
+        self.assertEqual(workspace_modules({"backend": choices["backend"]}), [])
+        self.assertEqual(defer_installs("cd web && npm install alpinejs && npm install -g @ionic/cli"),
+                         "cd web && npm install --package-lock-only alpinejs && npm install -g @ionic/cli")
+        self.assertEqual(defer_installs("npx --yes @angular/cli new web --defaults"),
+                         "npx --yes @angular/cli new web --defaults --skip-install")
+        
+        project_generator = ProjectGenerator(js_workspace=True)
+        graph = project_generator.build_task_graph(self.base_dir, choices)
+        self.assertEqual(graph.tasks["install-workspace"].dependencies, ["install:backend", "install:frontend-web"])
+        
+        from benchmarks import fake_toolchain
+        env = fake_toolchain.install(os.path.join(self.base_dir, "bin"), "fast", ["backend", "frontend-web"])
+        install_commands = self.config_manager.load_technologies()
+        with mock.patch.dict(os.environ, env), mock.patch("monostack.utils.js_workspace.shutil.which",
+                                                          return_value=None):
+            for module in ["backend", "frontend-web"]:
+                self.assertTrue(project_generator.initialize_project(self.base_dir, module, choices[module],
+                                                                     install_commands, workspace=True))
+                self.assertFalse(os.path.exists(os.path.join(self.base_dir, module, "node_modules")))
+            self.assertTrue(project_generator.install_workspace(self.base_dir, ["backend", "frontend-web"]))
+            
+        with open(os.path.join(self.base_dir, "package.json")) as f:
+            self.assertEqual(json.load(f)["workspaces"], ["backend", "frontend-web"])
+        self.assertTrue(os.path.isdir(os.path.join(self.base_dir, "node_modules")))
+        self.assertFalse(os.path.exists(os.path.join(self.base_dir, "backend", "package-lock.json")))
+        self.assertEqual(project_generator.workspace_report["package_manager"], "npm")
+        
+        gitignore_generator = project_generator.gitignore_generator
+        self.assertTrue(gitignore_generator.add_root_gitignore(self.base_dir, choices, workspace=True))
+        with open(os.path.join(self.base_dir, ".gitignore")) as f:
+            self.assertIn("!/package-lock.json", f.read().splitlines())
+        
+        # The images still build from their module, which keeps its own package.json
+        template = ("services:\n  backend-javascript-hapi:\n    build: ../backend\n"
+                    "  frontend-web-javascript-alpinejs:\n    build: ../frontend-web\n")
+        compose = yaml.safe_load(project_generator.template_manager.render_docker_compose(template, choices))
+        builds = [service["build"] for service in compose["services"].values()]
+        self.assertEqual(builds, ["../backend", "../frontend-web"])
+        for build in builds:
+            context = os.path.normpath(os.path.join(self.base_dir, "infra", build))
+            self.assertTrue(os.path.isfile(os.path.join(context, "package.json")))
+    
+    def test_batch_generation(self):
+        """Test generating several projects from a manifest with a process pool."""
+        manifest_path = os.path.join(self.base_dir, "manifest.jsonl")
+        with open(manifest_path, "w") as f:
+            for name in ["service-a", "service-b"]:
+                f.write(json.dumps({
+                    "name": name,
+                    "choices": {"frontend-mobile": {"language": "kotlin", "framework": "jetpack-compose"}},
+                    "options": {"jobs": 1}
+                }) + "\n")
+        
+        batch_runner = BatchRunner(concurrency=2, output_dir=os.path.join(self.base_dir, "projects"))
+        entries = batch_runner.load_manifest(manifest_path)
+        self.assertEqual([entry["name"] for entry in entries], ["service-a", "service-b"])
+        self.assertEqual(entries[0]["options"]["jobs"], 1)
+        
+        summary = batch_runner.run(entries)
+        self.assertEqual(summary["succeeded"], 2)
+        self.assertEqual(summary["projects"][1]["modules"]["frontend-mobile"]["status"], "ok")
+        self.assertTrue(os.path.exists(os.path.join(entries[1]["base_dir"], "frontend-mobile", "build.gradle.kts")))
+        
+        summary_path = os.path.join(self.base_dir, "summary.json")
+        batch_runner.write_summary(summary, summary_path)
+        with open(summary_path) as f:
+            self.assertEqual(json.load(f)["total"], 2)
+    
+    def test_batch_failed_installation(self):
+        """Test that a project whose module installation fails is reported as failed."""
+        bin_dir = os.path.join(self.base_dir, "bin")
+        os.makedirs(bin_dir)
+        with open(os.path.join(bin_dir, "npm"), "w") as f:
+            f.write("#!/bin/sh\nexit 1\n")
+        os.chmod(os.path.join(bin_dir, "npm"), 0o755)
+        
+        batch_runner = BatchRunner(concurrency=1, output_dir=os.path.join(self.base_dir, "projects"))
+        entries = [batch_runner.parse_entry({
+            "name": "service-a",
+            "choices": {"backend": {"language": "javascript", "framework": "express"}}
+        }, "line 1")]
+        with mock.patch.dict(os.environ, {"PATH": bin_dir + os.pathsep + os.environ["PATH"]}):
+            summary = batch_runner.run(entries)
+        self.assertEqual((summary["succeeded"], summary["failed"]), (0, 1))
+        self.assertEqual(summary["projects"][0]["status"], "failed")
+        self.assertEqual(summary["projects"][0]["modules"]["backend"]["status"], "failed")
+
+    def test_startup_imports_stay_lazy(self):
+        """Test that the CLI starts without importing its heavy modules."""
+        from monostack.utils.startup_profile import HEAVY_MODULES, run_import_time
+        
+        imports, _ = run_import_time(["--help"])
+        loaded = {name for name, _, _, _ in imports}
+        self.assertIn("monostack.utils.logger", loaded)
+        for module in HEAVY_MODULES:
+            self.assertNotIn(module, loaded)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file